@@ -1,57 +1,118 @@
+import time
+# Taken before the heavier imports: startup is measured from here to the first paint
+STARTED_AT = time.perf_counter()
+
+import argparse
 import customtkinter as tk
-import sqlite3
-from datetime import datetime
-import webbrowser
-import os
 import tkinter.messagebox
 import tkinter.filedialog
-import csv
+from application_form import ApplicationForm
+from db_worker import BackgroundJob, DatabaseWorker
+from profiling import enabled_by_env, log_file, profiler
+from reminders import ReminderScheduler
+from queries import PAGE_SIZE
+from repository import ConflictError, DuplicateError, ValidationError, default_db_path
+from salary import parse_salary
+from virtual_list import VirtualApplicationList
+
+# Delay after the last keystroke before the search runs
+SEARCH_DEBOUNCE_MS = 200
+
+# Rows fetched for the first paint, about a screenful; the rest of the first
+# page is loaded once the window is drawn
+FIRST_PAINT_ROWS = 30
+
+# Time to first paint that startup must stay under (see test_startup.py)
+FIRST_PAINT_TARGET_MS = 1500
+
+# How often the database is checked for changes made by other processes
+EXTERNAL_CHANGES_POLL_MS = 2000
 
 class JobTracker:
-    def __init__(self):
+    def __init__(self, db_path=None, started_at=None):
         # Set appearance mode and color theme
         tk.set_appearance_mode("light")
         tk.set_default_color_theme("blue")
         
-        # Initialize database
-        self.db = sqlite3.connect('job_tracker.db')
-        self.create_table()
+        # Text of the last search and the salary range applied with it; mutations
+        # keep the current view filtered by them
+        self.search_term = ""
+        self.salary_range = (None, None)
+        
+        self.search_job = None
+        self.busy_job = None
+        # The add/edit dialog is built on first use, then reused
+        self.application_form = None
+        # The last bulk action, until it is undone or replaced by the next one
+        self.bulk_change = None
+        
+        self.started_at = STARTED_AT if started_at is None else started_at
+        self.first_paint_ms = None
+        # Incremented on every refresh so that stale pages are discarded
+        self.view_generation = 0
         
         # Create main window
         self.root = tk.CTk()
         self.root.title("Job Application Tracker")
         self.root.geometry("1200x700")
         
+        # Initialize database: all queries run on a worker thread
+        self.worker = DatabaseWorker(self.root, db_path or default_db_path(), on_busy=self.set_busy)
+        self.data_version = None
+        
         # Create GUI
+        self.reminders = ReminderScheduler(self.root, self.show_reminders)
         self.create_widgets()
-        self.refresh_applications()
+        # Only a screenful of rows is queried before the window is first drawn;
+        # first_painted() then starts everything else
+        self.refresh_applications(limit=FIRST_PAINT_ROWS)
+    
+    def first_painted(self):
+        """Record the time to first paint and start the deferred startup work"""
+        if self.first_paint_ms is not None:
+            return
+        self.first_paint_ms = (time.perf_counter() - self.started_at) * 1000
+        profiler.record("startup first paint", self.first_paint_ms)
+        
+        # The rest of the first page
+        self.applications_list.request_more()
+        
+        # Reminders are loaded once, then kept current after every change
+        self.worker.submit(lambda repo: repo.load_reminders(), self.reminders.load, self.show_db_error)
         
-    def create_table(self):
-        """Create the applications table if it doesn't exist"""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS applications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_name TEXT NOT NULL,
-                url TEXT,
-                company TEXT NOT NULL,
-                date_applied TEXT NOT NULL,
-                salary TEXT,
-                status TEXT NOT NULL,
-                recruiter_dm TEXT,
-                team_member_dm TEXT,
-                hiring_manager_dm TEXT,
-                priority TEXT DEFAULT 'Medium',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        # Add priority column if it doesn't exist (for existing databases)
-        cursor.execute("PRAGMA table_info(applications)")
-        columns = [row[1] for row in cursor.fetchall()]
-        if 'priority' not in columns:
-            cursor.execute("ALTER TABLE applications ADD COLUMN priority TEXT DEFAULT 'Medium'")
-        self.db.commit()
+        # Check the trigger-maintained status counts once per session
+        self.worker.submit(lambda repo: repo.verify_status_counts(),
+                           lambda exact: exact or self.update_stats())
+        
+        self.root.after(EXTERNAL_CHANGES_POLL_MS, self.check_external_changes)
+    
+    def check_external_changes(self):
+        """Refresh the window when another process (a second window, the CLI...) wrote"""
+        def checked(version):
+            # The worker's own commits leave its data_version unchanged
+            if self.data_version is not None and version != self.data_version:
+                self.reload_after_external_change()
+            self.data_version = version
+            self.root.after(EXTERNAL_CHANGES_POLL_MS, self.check_external_changes)
+        
+        def failed(e):
+            self.root.after(EXTERNAL_CHANGES_POLL_MS, self.check_external_changes)
+        
+        self.worker.submit(lambda repo: repo.data_version(), checked, failed, key="data-version")
     
+    def reload_after_external_change(self):
+        """Re-read everything another process may have changed"""
+        self.refresh_applications(keep_position=True)
+        self.worker.submit(lambda repo: repo.load_reminders(), self.reminders.load, self.show_db_error)
+        app_id = getattr(self, 'selected_app_id', None)
+        if app_id is not None:
+            def loaded(current_status):
+                if current_status is not None and getattr(self, 'selected_app_id', None) == app_id:
+                    self.status_update_combo.set(current_status)
+            
+            self.worker.submit(lambda repo: repo.get_status(app_id), loaded, self.show_db_error,
+                               key="selected-status")
+        
     def create_widgets(self):
         """Create and arrange all GUI widgets"""
         # Main container
@@ -75,37 +136,74 @@ class JobTracker:
                                font=("Arial", 16, "bold"))
         list_title.pack(side=tk.LEFT, padx=10, pady=5)
         
+        # Profiling report, only offered when profiling is on
+        if profiler.enabled:
+            debug_btn = tk.CTkButton(list_header, text="Debug", width=60, fg_color="gray",
+                                     command=self.open_debug_panel)
+            debug_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # Busy indicator, shown while database requests are pending
+        self.busy_bar = tk.CTkProgressBar(list_header, mode="indeterminate", width=80)
+        
         # Add New Application button
         add_btn = tk.CTkButton(list_header, text="Add New Application", 
                               command=self.open_add_dialog)
         add_btn.pack(side=tk.RIGHT, padx=10, pady=5)
         
-        # Export to CSV button
-        export_btn = tk.CTkButton(list_header, text="Export CSV", 
+        # Export button (CSV or JSON Lines, optionally gzip-compressed)
+        export_btn = tk.CTkButton(list_header, text="Export", 
                                  command=self.export_to_csv)
         export_btn.pack(side=tk.RIGHT, padx=5, pady=5)
         
+        # Funnel analytics button
+        analytics_btn = tk.CTkButton(list_header, text="Analytics", 
+                                    command=self.open_analytics_dialog)
+        analytics_btn.pack(side=tk.RIGHT, padx=5, pady=5)
+        
+        # Import button (reads the export formats back in)
+        import_btn = tk.CTkButton(list_header, text="Import", 
+                                 command=self.import_from_file)
+        import_btn.pack(side=tk.RIGHT, padx=5, pady=5)
+        
+        # Ingest button (a folder of saved job posting pages)
+        ingest_btn = tk.CTkButton(list_header, text="Ingest Postings", 
+                                 command=self.ingest_postings)
+        ingest_btn.pack(side=tk.RIGHT, padx=5, pady=5)
+        
         # Search and filter controls
         controls_frame = tk.CTkFrame(list_header)
         controls_frame.pack(side=tk.RIGHT, padx=10, pady=5)
         
         self.search_entry = tk.CTkEntry(controls_frame, placeholder_text="Search...")
         self.search_entry.pack(side=tk.LEFT, padx=5)
+        # Search as you type, once typing pauses
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_entry.bind("<Return>", lambda event: self.search_applications())
         
         search_btn = tk.CTkButton(controls_frame, text="Search", 
                                 command=self.search_applications, width=80)
         search_btn.pack(side=tk.LEFT, padx=5)
         
-        status_filter = tk.CTkComboBox(controls_frame, values=["All", "Applied", 
-                                     "Interview Scheduled", "Interviewed", 
-                                     "Offer Received", "Rejected", "Withdrawn"])
-        status_filter.pack(side=tk.LEFT, padx=5)
-        status_filter.set("All")
+        self.status_filter = tk.CTkComboBox(controls_frame, values=["All", "Pending", "Applied", 
+                                          "Interview Scheduled", "Interviewed", 
+                                          "Offer Received", "Rejected", "Withdrawn"])
+        self.status_filter.pack(side=tk.LEFT, padx=5)
+        self.status_filter.set("All")
+        self.status_filter.configure(command=lambda value: self.refresh_applications())
+        
+        # Salary range filter, in yearly amounts ("100k", "$120,000", "60/hr")
+        self.salary_min_entry = tk.CTkEntry(controls_frame, placeholder_text="Min salary", width=90)
+        self.salary_min_entry.pack(side=tk.LEFT, padx=5)
+        self.salary_max_entry = tk.CTkEntry(controls_frame, placeholder_text="Max salary", width=90)
+        self.salary_max_entry.pack(side=tk.LEFT, padx=5)
+        for entry in (self.salary_min_entry, self.salary_max_entry):
+            entry.bind("<KeyRelease>", self.schedule_search)
+            entry.bind("<Return>", lambda event: self.search_applications())
         
         sort_label = tk.CTkLabel(controls_frame, text="Sort by:")
         sort_label.pack(side=tk.LEFT, padx=5)
         
-        self.sort_combo = tk.CTkComboBox(controls_frame, values=["Date Applied", "Priority"])
+        self.sort_combo = tk.CTkComboBox(controls_frame, values=["Date Applied", "Priority", "Salary", "Relevance"])
         self.sort_combo.pack(side=tk.LEFT, padx=5)
         self.sort_combo.set("Date Applied")
         self.sort_combo.configure(command=lambda value: self.refresh_applications())
@@ -120,164 +218,52 @@ class JobTracker:
         self.stats_label = tk.CTkLabel(self.list_frame, text="", font=("Arial", 12))
         self.stats_label.pack(pady=(5, 10))
     
+    def get_application_form(self):
+        """Return the add/edit dialog, building it on first use"""
+        if self.application_form is None:
+            self.application_form = ApplicationForm(self.root, on_open_url=self.open_job_url)
+        return self.application_form
+    
     def open_add_dialog(self):
         """Open dialog for adding new application"""
-        # Create dialog window
-        dialog = tk.CTkToplevel(self.root)
-        dialog.title("Add New Application")
-        dialog.geometry("400x600")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Form title
-        title_label = tk.CTkLabel(dialog, text="Add New Application", 
-                                font=("Arial", 16, "bold"))
-        title_label.pack(pady=10)
-        
-        # Scrollable frame for form
-        scroll_frame = tk.CTkScrollableFrame(dialog)
-        scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Job Name
-        tk.CTkLabel(scroll_frame, text="Job Title:").pack(anchor="w", pady=(10, 0))
-        job_name_entry = tk.CTkEntry(scroll_frame, width=350)
-        job_name_entry.pack(pady=(0, 10))
-        
-        # Company
-        tk.CTkLabel(scroll_frame, text="Company:").pack(anchor="w", pady=(10, 0))
-        company_entry = tk.CTkEntry(scroll_frame, width=350)
-        company_entry.pack(pady=(0, 10))
-        
-        # Job URL
-        tk.CTkLabel(scroll_frame, text="Job URL:").pack(anchor="w", pady=(10, 0))
-        url_frame = tk.CTkFrame(scroll_frame)
-        url_frame.pack(pady=(0, 10))
-        
-        url_entry = tk.CTkEntry(url_frame, width=300)
-        url_entry.pack(side=tk.LEFT, padx=(0, 5))
-        
-        open_url_btn = tk.CTkButton(url_frame, text="Open", width=40, 
-                                   command=lambda: self.open_job_url(url_entry.get()))
-        open_url_btn.pack(side=tk.RIGHT)
-        
-        # Date Applied
-        tk.CTkLabel(scroll_frame, text="Date Applied:").pack(anchor="w", pady=(10, 0))
-        date_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                placeholder_text="YYYY-MM-DD or 'today'")
-        date_entry.pack(pady=(0, 10))
-        date_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
-        
-        # Salary
-        tk.CTkLabel(scroll_frame, text="Salary:").pack(anchor="w", pady=(10, 0))
-        salary_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                  placeholder_text="e.g., $80,000 - $100,000")
-        salary_entry.pack(pady=(0, 10))
-        
-        # Status
-        tk.CTkLabel(scroll_frame, text="Status:").pack(anchor="w", pady=(10, 0))
-        status_combo = tk.CTkComboBox(scroll_frame, width=350,
-                                     values=["Pending","Applied", "Interview Scheduled", 
-                                           "Interviewed", "Offer Received", 
-                                           "Rejected", "Withdrawn"])
-        status_combo.pack(pady=(0, 10))
-        status_combo.set("Pending")
-        
-        # Recruiter DM
-        tk.CTkLabel(scroll_frame, text="Recruiter Contact:").pack(anchor="w", pady=(10, 0))
-        recruiter_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                     placeholder_text="Email, LinkedIn, phone...")
-        recruiter_entry.pack(pady=(0, 10))
-        
-        # Team Member DM
-        tk.CTkLabel(scroll_frame, text="Team Member Contact:").pack(anchor="w", pady=(10, 0))
-        team_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                placeholder_text="Email, LinkedIn, phone...")
-        team_entry.pack(pady=(0, 10))
-        
-        # Hiring Manager DM
-        tk.CTkLabel(scroll_frame, text="Hiring Manager Contact:").pack(anchor="w", pady=(10, 0))
-        hiring_manager_entry = tk.CTkEntry(scroll_frame, width=350,
-                                          placeholder_text="Email, LinkedIn, phone...")
-        hiring_manager_entry.pack(pady=(0, 10))
-        
-        # Priority
-        tk.CTkLabel(scroll_frame, text="Priority:").pack(anchor="w", pady=(10, 0))
-        priority_combo = tk.CTkComboBox(scroll_frame, width=350,
-                                       values=["Low", "Medium", "High"])
-        priority_combo.pack(pady=(0, 15))
-        priority_combo.set("Medium")
-        
-        # Buttons
-        button_frame = tk.CTkFrame(dialog)
-        button_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        def add_and_close():
-            self.add_application_from_dialog(dialog, job_name_entry.get().strip(), 
-                                           company_entry.get().strip(), url_entry.get().strip(),
-                                           date_entry.get().strip(), salary_entry.get().strip(),
-                                           status_combo.get(), recruiter_entry.get().strip(),
-                                           team_entry.get().strip(), hiring_manager_entry.get().strip(),
-                                           priority_combo.get())
-        
-        add_btn = tk.CTkButton(button_frame, text="Add Application", 
-                              command=add_and_close)
-        add_btn.pack(side=tk.LEFT, padx=5)
-        
-        cancel_btn = tk.CTkButton(button_frame, text="Cancel", 
-                                 command=dialog.destroy, fg_color="gray")
-        cancel_btn.pack(side=tk.RIGHT, padx=5)
+        self.get_application_form().open_add(self.add_application_from_dialog)
     
-    def add_application_from_dialog(self, dialog, job_name, company, url, date_text, salary, status, recruiter, team_member, hiring_manager, priority):
-        """Add application from dialog data"""
-        # Validate required fields
-        if not job_name or not company:
-            tkinter.messagebox.showerror("Error", "Job title and company are required!")
-            return
+    def add_application_from_dialog(self, fields, allow_duplicates=False):
+        """Add application from dialog data, asking first if it looks like a duplicate"""
+        def added(app_id):
+            self.applications_list.reveal(app_id)
+            self.application_form.done()
+            tkinter.messagebox.showinfo("Success", "Application added successfully!")
         
-        # Handle date
-        if date_text.lower() == "today":
-            date_applied = datetime.now().strftime("%Y-%m-%d")
-        else:
-            try:
-                datetime.strptime(date_text, "%Y-%m-%d")
-                date_applied = date_text
-            except ValueError:
-                tkinter.messagebox.showerror("Error", "Please use YYYY-MM-DD format for date!")
+        def failed(e):
+            if isinstance(e, DuplicateError):
+                matches = "\n".join(f"• {duplicate.describe()}" for duplicate in e.duplicates[:5])
+                if tkinter.messagebox.askyesno(
+                        "Possible Duplicate",
+                        f"This looks like an application you already track:\n\n{matches}\n\nAdd it anyway?",
+                        parent=self.application_form.window):
+                    self.add_application_from_dialog(fields, allow_duplicates=True)
+                    return
+                self.application_form.failed()
                 return
+            self.application_form.failed()
+            if isinstance(e, ValidationError):
+                tkinter.messagebox.showerror("Error", str(e))
+            else:
+                tkinter.messagebox.showerror("Error", f"Failed to add application: {str(e)}")
         
-        try:
-            cursor = self.db.cursor()
-            cursor.execute('''
-                INSERT INTO applications (job_name, url, company, date_applied, 
-                                       salary, status, recruiter_dm, team_member_dm, 
-                                       hiring_manager_dm, priority)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (job_name, url, company, date_applied, salary, status, 
-                  recruiter, team_member, hiring_manager, priority))
-            
-            self.db.commit()
-            self.refresh_applications()
-            tkinter.messagebox.showinfo("Success", "Application added successfully!")
-            dialog.destroy()
-            
-        except Exception as e:
-            tkinter.messagebox.showerror("Error", f"Failed to add application: {str(e)}")
+        self.write_application(lambda repo: repo.add(fields, allow_duplicates), added, failed)
     
     def create_applications_list(self):
         """Create the applications list display"""
-        # Create main container with explicit scrollbar
-        list_container = tk.CTkFrame(self.list_frame)
-        list_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Create scrollable frame with scrollbar
-        self.applications_frame = tk.CTkScrollableFrame(list_container)
-        self.applications_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Empty state label
-        self.empty_label = tk.CTkLabel(self.applications_frame, 
-                                    text="No applications yet. Add your first application!",
-                                    font=("Arial", 14))
-        self.empty_label.pack(pady=50)
+        # Virtualized list: a fixed pool of cards refilled as the user scrolls
+        self.applications_list = VirtualApplicationList(self.list_frame,
+                                                        on_open=self.open_job_url,
+                                                        on_edit=self.edit_application,
+                                                        on_attachments=self.open_attachments,
+                                                        on_selection_change=self.selection_changed,
+                                                        on_need_more=self.load_more_applications)
+        self.applications_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def create_status_panel(self):
         """Create status update panel"""
@@ -287,6 +273,17 @@ class JobTracker:
         self.selected_app_label = tk.CTkLabel(self.status_frame, text="No application selected")
         self.selected_app_label.pack(side=tk.LEFT, padx=10, pady=5)
         
+        # Select every application of the current view, loaded or not
+        select_all_btn = tk.CTkButton(self.status_frame, text="Select All", width=80,
+                                    command=self.select_all_applications)
+        select_all_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Outcome of the last bulk action, with its Undo button
+        self.bulk_label = tk.CTkLabel(self.status_frame, text="")
+        self.bulk_label.pack(side=tk.LEFT, padx=10)
+        self.undo_btn = tk.CTkButton(self.status_frame, text="Undo", width=60, fg_color="gray",
+                                   command=self.undo_bulk_action)
+        
         update_frame = tk.CTkFrame(self.status_frame)
         update_frame.pack(side=tk.RIGHT, padx=10, pady=5)
         
@@ -300,276 +297,201 @@ class JobTracker:
                                 command=self.update_status, width=100)
         update_btn.pack(side=tk.LEFT, padx=5)
         
+        self.priority_update_combo = tk.CTkComboBox(update_frame, width=100, values=["Low", "Medium", "High"])
+        self.priority_update_combo.set("Medium")
+        self.priority_update_combo.pack(side=tk.LEFT, padx=5)
+        
+        priority_btn = tk.CTkButton(update_frame, text="Set Priority", 
+                                  command=self.set_priority, width=100)
+        priority_btn.pack(side=tk.LEFT, padx=5)
+        
         delete_btn = tk.CTkButton(update_frame, text="Delete", fg_color="red",
                                 command=self.delete_application, width=80)
         delete_btn.pack(side=tk.LEFT, padx=5)
     
-    def open_job_url(self, url=None):
+    def open_job_url(self, url):
         """Open the job URL in default browser"""
-        if url is None:
-            url = self.url_entry.get()
         if url:
+            # Loaded on first use, like the other modules startup does not need
+            import webbrowser
             try:
                 webbrowser.open(url)
             except Exception as e:
                 print(f"Could not open URL: {e}")
     
-    def refresh_applications(self):
+    def set_busy(self, busy):
+        """Show the busy indicator while database requests are pending"""
+        # Only show it for requests that take longer than a blink
+        if busy and self.busy_job is None:
+            self.busy_job = self.root.after(150, self.show_busy)
+        elif not busy:
+            if self.busy_job is not None:
+                self.root.after_cancel(self.busy_job)
+                self.busy_job = None
+            self.busy_bar.stop()
+            self.busy_bar.pack_forget()
+    
+    def show_busy(self):
+        """Display the busy indicator"""
+        self.busy_job = None
+        self.busy_bar.pack(side=tk.LEFT, padx=10)
+        self.busy_bar.start()
+    
+    def get_view(self):
+        """Return the search term, sort option, status filter and salary range of the list"""
+        return self.search_term, self.sort_combo.get(), self.status_filter.get(), self.salary_range
+    
+    def read_salary_range(self):
+        """Return the (minimum, maximum) yearly salaries typed in the filter entries"""
+        # Typed ranges widen the filter: "100-120k" as a minimum means 100,000
+        return (parse_salary(self.salary_min_entry.get())[0],
+                parse_salary(self.salary_max_entry.get())[1])
+    
+    def refresh_applications(self, keep_position=False, limit=PAGE_SIZE):
         """Refresh the applications list display"""
-        # Clear existing applications
-        for widget in self.applications_frame.winfo_children():
-            widget.destroy()
-        
-        # Recreate empty_label
-        self.empty_label = tk.CTkLabel(self.applications_frame, 
-                                     text="No applications yet. Add your first application!",
-                                     font=("Arial", 14))
-        
-        # Get applications from database
-        cursor = self.db.cursor()
-        sort_by = self.sort_combo.get()
-        if sort_by == "Priority":
-            order_by = "CASE priority WHEN 'High' THEN 1 WHEN 'Medium' THEN 2 WHEN 'Low' THEN 3 END, date_applied DESC"
-        else:  # Date Applied
-            order_by = "date_applied DESC"
-        
-        cursor.execute(f'''
-            SELECT id, job_name, company, date_applied, status, url, priority
-            FROM applications ORDER BY {order_by}
-        ''')
-        
-        applications = cursor.fetchall()
-        
-        if not applications:
-            self.empty_label.pack(pady=50)
-            return
-        
-        # Create application cards
-        for app in applications:
-            self.create_application_card(app)
+        search, sort, status, salary_range = self.get_view()
+        self.view_generation += 1
+        generation = self.view_generation
+        # A pending page of the previous view is useless now
+        self.worker.cancel_key("more")
+        
+        def load(repo):
+            # Get the first page of applications from database
+            applications = repo.list_applications(search, sort, status, limit=limit,
+                                                  salary_range=salary_range)
+            return applications, repo.get_sort_key(search, sort)
+        
+        def loaded(result):
+            applications, sort_key = result
+            if generation != self.view_generation:
+                return
+            # Only the cards visible in the viewport are (re)filled
+            with profiler.span("ui refresh"):
+                self.applications_list.set_rows(applications, sort_key,
+                                                has_more=len(applications) == limit,
+                                                keep_position=keep_position)
+            if profiler.enabled:
+                profiler.mark_widgets("refresh")
+            if self.first_paint_ms is None:
+                # Idle callbacks run in order, so this one follows the redraw
+                self.root.after_idle(self.first_painted)
+        
+        # A newer refresh (e.g. the next search keystroke) supersedes this one
+        self.worker.submit(load, loaded, self.show_db_error, key="list")
         
         # Update stats
         self.update_stats()
     
-    def create_application_card(self, app_data):
-        """Create a card for a single application"""
-        app_id, job_name, company, date_applied, status, url, priority = app_data
-        
-        # Determine background color based on status
-        if status == "Applied":
-            bg_color = "#d4edda"  # Light green
-        elif status == "Rejected":
-            bg_color = "#f8d7da"  # Light red
-        elif status == "Pending":
-            bg_color = "#fff3cd"  # Light yellow
+    def load_more_applications(self):
+        """Fetch the page following the rows already in the list"""
+        applications_list = self.applications_list
+        after = applications_list.sort_key(applications_list.rows[-1]) if applications_list.rows else None
+        search, sort, status, salary_range = self.get_view()
+        generation = self.view_generation
+        
+        def loaded(applications):
+            if generation == self.view_generation:
+                applications_list.append_rows(applications, has_more=len(applications) == PAGE_SIZE)
+        
+        self.worker.submit(lambda repo: repo.list_applications(search, sort, status, after=after,
+                                                               limit=PAGE_SIZE, salary_range=salary_range),
+                           loaded, self.show_db_error, key="more")
+    
+    def write_application(self, write, on_done, on_error):
+        """Run a write returning an application id, then patch that row in the list"""
+        search, sort, status, salary_range = self.get_view()
+        generation = self.view_generation
+        
+        def run(repo):
+            app_id = write(repo)
+            # Re-read only this row, through the same filter as the current view,
+            # and its reminders, which may have moved with the change
+            return app_id, repo.get_list_row(app_id, search, status, salary_range), repo.load_reminders(app_id)
+        
+        def done(result):
+            app_id, app, reminders = result
+            if generation == self.view_generation:
+                self.sync_application(app_id, app)
+            self.reminders.replace(app_id, reminders)
+            on_done(app_id)
+        
+        self.worker.submit(run, done, on_error)
+    
+    def sync_application(self, app_id, app):
+        """Patch, insert or remove the card of a single application after a change"""
+        if app:
+            self.applications_list.upsert_row(app)
         else:
-            bg_color = None
-        
-        # Card frame
-        card = tk.CTkFrame(self.applications_frame, fg_color=bg_color)
-        card.pack(fill=tk.X, pady=5)
-        
-        # Left side - main info
-        info_frame = tk.CTkFrame(card, fg_color=bg_color)
-        info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Job title and company
-        title_label = tk.CTkLabel(info_frame, text=f"{job_name} at {company}", 
-                                font=("Arial", 14, "bold"), fg_color=bg_color)
-        title_label.pack(anchor="w")
-        
-        # Date, status and priority
-        date_status = tk.CTkLabel(info_frame, 
-                                text=f"Applied: {date_applied} | Status: {status} | Priority: {priority}",
-                                font=("Arial", 10), fg_color=bg_color)
-        date_status.pack(anchor="w")
-        
-        # Right side - actions
-        actions_frame = tk.CTkFrame(card, fg_color=bg_color)
-        actions_frame.pack(side=tk.RIGHT, padx=5, pady=5)
-        
-        # Customized CV checkbox
-        cv_checkbox = tk.CTkCheckBox(actions_frame, text="Customized CV", fg_color=bg_color)
-        cv_checkbox.pack(side=tk.LEFT, padx=2)
-        
-        if url:
-            open_btn = tk.CTkButton(actions_frame, text="Open", width=60,
-                                  command=lambda u=url: webbrowser.open(u))
-            open_btn.pack(side=tk.LEFT, padx=2)
-        
-        edit_btn = tk.CTkButton(actions_frame, text="Edit", width=60,
-                              command=lambda i=app_id: self.edit_application(i))
-        edit_btn.pack(side=tk.LEFT, padx=2)
-        
-        select_btn = tk.CTkButton(actions_frame, text="Select", width=60,
-                                command=lambda i=app_id, j=job_name, c=company: 
-                                self.select_application(i, j, c))
-        select_btn.pack(side=tk.LEFT, padx=2)
+            self.applications_list.remove_row(app_id)
+        self.update_stats()
+    
+    def show_db_error(self, error):
+        """Report a failed background database request"""
+        tkinter.messagebox.showerror("Error", f"Database error: {str(error)}")
     
     def edit_application(self, app_id):
         """Edit an existing application"""
-        # Get application data
-        cursor = self.db.cursor()
-        cursor.execute('SELECT * FROM applications WHERE id = ?', (app_id,))
-        app = cursor.fetchone()
-        
-        if not app:
-            tkinter.messagebox.showerror("Error", "Application not found!")
-            return
+        def loaded(app):
+            if not app:
+                tkinter.messagebox.showerror("Error", "Application not found!")
+                return
+            # Open edit dialog with pre-filled data
+            self.open_edit_dialog(app_id, app)
         
-        # Open edit dialog with pre-filled data
-        self.open_edit_dialog(app_id, app)
+        # Get application data
+        self.worker.submit(lambda repo: repo.get(app_id), loaded, self.show_db_error)
+    
+    def open_attachments(self, app_id):
+        """Show the files attached to an application"""
+        from attachments_dialog import AttachmentsDialog
+        row = self.applications_list.by_id.get(app_id)
+        title = f"{row[1]} at {row[2]}" if row else f"Application {app_id}"
+        AttachmentsDialog(self.root, self.worker, app_id, title, self.show_db_error)
     
     def open_edit_dialog(self, app_id, app_data):
         """Open dialog for editing application"""
-        # Create dialog window
-        dialog = tk.CTkToplevel(self.root)
-        dialog.title("Edit Application")
-        dialog.geometry("400x600")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Form title
-        title_label = tk.CTkLabel(dialog, text="Edit Application", 
-                                font=("Arial", 16, "bold"))
-        title_label.pack(pady=10)
-        
-        # Scrollable frame for form
-        scroll_frame = tk.CTkScrollableFrame(dialog)
-        scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Job Name
-        tk.CTkLabel(scroll_frame, text="Job Title:").pack(anchor="w", pady=(10, 0))
-        job_name_entry = tk.CTkEntry(scroll_frame, width=350)
-        job_name_entry.pack(pady=(0, 10))
-        job_name_entry.insert(0, app_data[1])  # job_name
-        
-        # Company
-        tk.CTkLabel(scroll_frame, text="Company:").pack(anchor="w", pady=(10, 0))
-        company_entry = tk.CTkEntry(scroll_frame, width=350)
-        company_entry.pack(pady=(0, 10))
-        company_entry.insert(0, app_data[3])  # company
-        
-        # Job URL
-        tk.CTkLabel(scroll_frame, text="Job URL:").pack(anchor="w", pady=(10, 0))
-        url_frame = tk.CTkFrame(scroll_frame)
-        url_frame.pack(pady=(0, 10))
-        
-        url_entry = tk.CTkEntry(url_frame, width=300)
-        url_entry.pack(side=tk.LEFT, padx=(0, 5))
-        url_entry.insert(0, app_data[2] or "")  # url
-        
-        open_url_btn = tk.CTkButton(url_frame, text="Open", width=40, 
-                                   command=lambda: self.open_job_url(url_entry.get()))
-        open_url_btn.pack(side=tk.RIGHT)
-        
-        # Date Applied
-        tk.CTkLabel(scroll_frame, text="Date Applied:").pack(anchor="w", pady=(10, 0))
-        date_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                placeholder_text="YYYY-MM-DD or 'today'")
-        date_entry.pack(pady=(0, 10))
-        date_entry.insert(0, app_data[4])  # date_applied
-        
-        # Salary
-        tk.CTkLabel(scroll_frame, text="Salary:").pack(anchor="w", pady=(10, 0))
-        salary_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                  placeholder_text="e.g., $80,000 - $100,000")
-        salary_entry.pack(pady=(0, 10))
-        salary_entry.insert(0, app_data[5] or "")  # salary
-        
-        # Status
-        tk.CTkLabel(scroll_frame, text="Status:").pack(anchor="w", pady=(10, 0))
-        status_combo = tk.CTkComboBox(scroll_frame, width=350,
-                                     values=["Applied", "Interview Scheduled", 
-                                           "Interviewed", "Offer Received", 
-                                           "Rejected", "Withdrawn"])
-        status_combo.pack(pady=(0, 10))
-        status_combo.set(app_data[6])  # status
-        
-        # Recruiter DM
-        tk.CTkLabel(scroll_frame, text="Recruiter Contact:").pack(anchor="w", pady=(10, 0))
-        recruiter_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                     placeholder_text="Email, LinkedIn, phone...")
-        recruiter_entry.pack(pady=(0, 10))
-        recruiter_entry.insert(0, app_data[7] or "")  # recruiter_dm
-        
-        # Team Member DM
-        tk.CTkLabel(scroll_frame, text="Team Member Contact:").pack(anchor="w", pady=(10, 0))
-        team_entry = tk.CTkEntry(scroll_frame, width=350, 
-                                placeholder_text="Email, LinkedIn, phone...")
-        team_entry.pack(pady=(0, 10))
-        team_entry.insert(0, app_data[8] or "")  # team_member_dm
-        
-        # Hiring Manager DM
-        tk.CTkLabel(scroll_frame, text="Hiring Manager Contact:").pack(anchor="w", pady=(10, 0))
-        hiring_manager_entry = tk.CTkEntry(scroll_frame, width=350,
-                                          placeholder_text="Email, LinkedIn, phone...")
-        hiring_manager_entry.pack(pady=(0, 10))
-        hiring_manager_entry.insert(0, app_data[9] or "")  # hiring_manager_dm
-        
-        # Priority
-        tk.CTkLabel(scroll_frame, text="Priority:").pack(anchor="w", pady=(10, 0))
-        priority_combo = tk.CTkComboBox(scroll_frame, width=350,
-                                       values=["Low", "Medium", "High"])
-        priority_combo.pack(pady=(0, 15))
-        priority_combo.set(app_data[10] or "Medium")  # priority
-        
-        # Buttons
-        button_frame = tk.CTkFrame(dialog)
-        button_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        def update_and_close():
-            self.update_application_from_dialog(dialog, app_id, job_name_entry.get().strip(), 
-                                             company_entry.get().strip(), url_entry.get().strip(),
-                                             date_entry.get().strip(), salary_entry.get().strip(),
-                                             status_combo.get(), recruiter_entry.get().strip(),
-                                             team_entry.get().strip(), hiring_manager_entry.get().strip(),
-                                             priority_combo.get())
-        
-        update_btn = tk.CTkButton(button_frame, text="Update Application", 
-                                 command=update_and_close)
-        update_btn.pack(side=tk.LEFT, padx=5)
+        self.get_application_form().open_edit(
+            app_data, lambda fields: self.update_application_from_dialog(app_id, fields, app_data.version))
+    
+    def update_application_from_dialog(self, app_id, fields, version=None):
+        """Update application from dialog data, unless it changed since the dialog opened"""
+        def updated(result):
+            self.application_form.done()
+            tkinter.messagebox.showinfo("Success", "Application updated successfully!")
         
-        cancel_btn = tk.CTkButton(button_frame, text="Cancel", 
-                                 command=dialog.destroy, fg_color="gray")
-        cancel_btn.pack(side=tk.RIGHT, padx=5)
+        def failed(e):
+            self.application_form.failed()
+            if isinstance(e, ConflictError):
+                overwrite = tkinter.messagebox.askyesno(
+                    "Application Changed",
+                    f"{e}\n\nYes: save your values over the other change\n"
+                    "No: discard your edits and reload the application")
+                if overwrite:
+                    self.update_application_from_dialog(app_id, fields)
+                else:
+                    self.application_form.hide()
+                    self.edit_application(app_id)
+            elif isinstance(e, ValidationError):
+                tkinter.messagebox.showerror("Error", str(e))
+            else:
+                tkinter.messagebox.showerror("Error", f"Failed to update application: {str(e)}")
+        
+        self.write_application(lambda repo: repo.update(app_id, fields, version) or app_id, updated, failed)
     
-    def update_application_from_dialog(self, dialog, app_id, job_name, company, url, date_text, salary, status, recruiter, team_member, hiring_manager, priority):
-        """Update application from dialog data"""
-        # Validate required fields
-        if not job_name or not company:
-            tkinter.messagebox.showerror("Error", "Job title and company are required!")
+    def selection_changed(self):
+        """Show what the list selection holds, and the status of a single selected application"""
+        selected = self.applications_list.selected
+        row = self.applications_list.by_id.get(next(iter(selected))) if len(selected) == 1 else None
+        if row:
+            self.select_application(row[0], row[1], row[2])
             return
-        
-        # Handle date
-        if date_text.lower() == "today":
-            date_applied = datetime.now().strftime("%Y-%m-%d")
+        if hasattr(self, 'selected_app_id'):
+            del self.selected_app_id
+        if selected:
+            self.selected_app_label.configure(
+                text=f"{len(selected):,} application{'s' if len(selected) > 1 else ''} selected")
         else:
-            try:
-                datetime.strptime(date_text, "%Y-%m-%d")
-                date_applied = date_text
-            except ValueError:
-                tkinter.messagebox.showerror("Error", "Please use YYYY-MM-DD format for date!")
-                return
-        
-        try:
-            cursor = self.db.cursor()
-            cursor.execute('''
-                UPDATE applications 
-                SET job_name = ?, url = ?, company = ?, date_applied = ?,
-                    salary = ?, status = ?, recruiter_dm = ?, 
-                    team_member_dm = ?, hiring_manager_dm = ?, priority = ?
-                WHERE id = ?
-            ''', (job_name, url, company, date_applied, salary, status,
-                  recruiter, team_member, hiring_manager, priority, app_id))
-            
-            self.db.commit()
-            self.refresh_applications()
-            tkinter.messagebox.showinfo("Success", "Application updated successfully!")
-            dialog.destroy()
-            
-        except Exception as e:
-            tkinter.messagebox.showerror("Error", f"Failed to update application: {str(e)}")
+            self.selected_app_label.configure(text="No application selected")
     
     def select_application(self, app_id, job_name, company):
         """Select an application for status update"""
@@ -577,153 +499,362 @@ class JobTracker:
         self.selected_app_label.configure(text=f"Selected: {job_name} at {company}")
         
         # Get current status
-        cursor = self.db.cursor()
-        cursor.execute('SELECT status FROM applications WHERE id = ?', (app_id,))
-        current_status = cursor.fetchone()[0]
-        self.status_update_combo.set(current_status)
+        def loaded(current_status):
+            if current_status is not None and getattr(self, 'selected_app_id', None) == app_id:
+                self.status_update_combo.set(current_status)
+        
+        self.worker.submit(lambda repo: repo.get_status(app_id), loaded, self.show_db_error,
+                           key="selected-status")
     
-    def update_status(self):
-        """Update status of selected application"""
-        if not hasattr(self, 'selected_app_id'):
+    def select_all_applications(self):
+        """Select every application of the current view, including pages not loaded yet"""
+        search, _, status, salary_range = self.get_view()
+        generation = self.view_generation
+        
+        def loaded(app_ids):
+            if generation == self.view_generation:
+                self.applications_list.select_ids(app_ids)
+        
+        self.worker.submit(lambda repo: repo.list_application_ids(search, status, salary_range),
+                           loaded, self.show_db_error)
+    
+    def get_selected_ids(self):
+        """Return the selected application ids, or None after telling the user to select some"""
+        app_ids = list(self.applications_list.selected)
+        if not app_ids:
             tkinter.messagebox.showerror("Error", "Please select an application first!")
+            return None
+        return app_ids
+    
+    def update_status(self):
+        """Update status of the selected applications"""
+        app_ids = self.get_selected_ids()
+        if not app_ids:
             return
-        
         new_status = self.status_update_combo.get()
+        if len(app_ids) > 1:
+            self.run_bulk_action(lambda repo: repo.set_status_many(app_ids, new_status),
+                                 f"Set {{count:,}} applications to {new_status}.")
+            return
+        app_id = app_ids[0]
         
-        try:
-            cursor = self.db.cursor()
-            cursor.execute('UPDATE applications SET status = ? WHERE id = ?',
-                         (new_status, self.selected_app_id))
-            self.db.commit()
-            self.refresh_applications()
-            tkinter.messagebox.showinfo("Success", "Status updated successfully!")
-            
-        except Exception as e:
-            tkinter.messagebox.showerror("Error", f"Failed to update status: {str(e)}")
+        def set_status(repo):
+            repo.set_status(app_id, new_status)
+            return app_id
+        
+        self.write_application(
+            set_status,
+            lambda app_id: tkinter.messagebox.showinfo("Success", "Status updated successfully!"),
+            lambda e: tkinter.messagebox.showerror("Error", f"Failed to update status: {str(e)}"))
+    
+    def set_priority(self):
+        """Set the priority of the selected applications"""
+        app_ids = self.get_selected_ids()
+        if not app_ids:
+            return
+        priority = self.priority_update_combo.get()
+        self.run_bulk_action(lambda repo: repo.set_priority_many(app_ids, priority),
+                             f"Set {{count:,}} applications to {priority} priority.")
     
     def delete_application(self):
-        """Delete selected application"""
-        if not hasattr(self, 'selected_app_id'):
-            tkinter.messagebox.showerror("Error", "Please select an application first!")
+        """Delete the selected applications, which can be undone"""
+        app_ids = self.get_selected_ids()
+        if not app_ids:
+            return
+        question = ("Are you sure you want to delete this application?" if len(app_ids) == 1
+                    else f"Are you sure you want to delete these {len(app_ids):,} applications?")
+        if tkinter.messagebox.askyesno("Confirm Delete", question):
+            self.run_bulk_action(lambda repo: repo.delete_many(app_ids), "Deleted {count:,} applications.")
+    
+    def run_bulk_action(self, action, message):
+        """Run a bulk action in one transaction, then update the list once and offer to undo it
+
+        `message` is formatted with the number of applications changed.
+        """
+        def done(change):
+            if change.action == "delete":
+                self.applications_list.select_ids(self.applications_list.selected - {row[0] for row in change.rows})
+                # Deleting applications only takes their own reminders away
+                for row in change.rows:
+                    self.reminders.remove(row[0])
+            self.bulk_change = change
+            self.bulk_label.configure(text=message.format(count=len(change.rows)))
+            self.undo_btn.pack(side=tk.LEFT, padx=5, after=self.bulk_label)
+            self.reload_after_bulk_change(reload_reminders=change.action != "delete")
+        
+        self.worker.submit(action, done,
+                           lambda e: tkinter.messagebox.showerror("Error", f"Failed to update applications: {str(e)}"))
+    
+    def undo_bulk_action(self):
+        """Revert the last bulk action"""
+        change = self.bulk_change
+        if change is None:
             return
         
-        if tkinter.messagebox.askyesno("Confirm Delete", 
-                                 "Are you sure you want to delete this application?"):
-            try:
-                cursor = self.db.cursor()
-                cursor.execute('DELETE FROM applications WHERE id = ?',
-                             (self.selected_app_id,))
-                self.db.commit()
-                self.refresh_applications()
-                self.selected_app_label.configure(text="No application selected")
-                tkinter.messagebox.showinfo("Success", "Application deleted successfully!")
-                
-            except Exception as e:
-                tkinter.messagebox.showerror("Error", f"Failed to delete application: {str(e)}")
+        def undone(result):
+            self.bulk_change = None
+            self.bulk_label.configure(text="Undone.")
+            self.undo_btn.pack_forget()
+            self.reload_after_bulk_change()
+        
+        self.worker.submit(lambda repo: repo.undo(change), undone,
+                           lambda e: tkinter.messagebox.showerror("Error", f"Failed to undo: {str(e)}"))
+    
+    def reload_after_bulk_change(self, reload_reminders=True):
+        """Redraw the list and counts, and reload the reminders, once after many applications changed"""
+        self.refresh_applications(keep_position=True)
+        if reload_reminders:
+            self.worker.submit(lambda repo: repo.load_reminders(), self.reminders.load, self.show_db_error)
+    
+    def schedule_search(self, event=None):
+        """Debounce search-as-you-type: search once typing pauses"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.search_if_changed)
+    
+    def search_if_changed(self):
+        """Run the search only if the search text or salary range actually changed"""
+        self.search_job = None
+        if (self.search_entry.get().strip() != self.search_term
+                or self.read_salary_range() != self.salary_range):
+            self.search_applications()
     
     def search_applications(self):
         """Search applications by text"""
-        search_term = self.search_entry.get().strip()
-        
-        # Clear existing applications
-        for widget in self.applications_frame.winfo_children():
-            widget.destroy()
-        
-        # Recreate empty_label
-        self.empty_label = tk.CTkLabel(self.applications_frame, 
-                                     text="No applications yet. Add your first application!",
-                                     font=("Arial", 14))
-        
-        cursor = self.db.cursor()
-        sort_by = self.sort_combo.get()
-        if sort_by == "Priority":
-            order_by = "CASE priority WHEN 'High' THEN 1 WHEN 'Medium' THEN 2 WHEN 'Low' THEN 3 END, date_applied DESC"
-        else:  # Date Applied
-            order_by = "date_applied DESC"
-        
-        if search_term:
-            cursor.execute(f'''
-                SELECT id, job_name, company, date_applied, status, url, priority
-                FROM applications 
-                WHERE job_name LIKE ? OR company LIKE ? OR status LIKE ?
-                ORDER BY {order_by}
-            ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-        else:
-            cursor.execute(f'''
-                SELECT id, job_name, company, date_applied, status, url, priority
-                FROM applications ORDER BY {order_by}
-            ''')
-        
-        applications = cursor.fetchall()
-        
-        if not applications:
-            self.empty_label.pack(pady=50)
-        else:
-            for app in applications:
-                self.create_application_card(app)
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        self.search_term = self.search_entry.get().strip()
+        self.salary_range = self.read_salary_range()
+        self.refresh_applications()
     
     def update_stats(self):
         """Update statistics display"""
-        cursor = self.db.cursor()
-        cursor.execute('SELECT COUNT(*) FROM applications')
-        total = cursor.fetchone()[0]
+        def loaded(counts):
+            with profiler.span("ui stats"):
+                stats_text = " | ".join(f"{status}: {count}" for status, count in counts.items())
+                self.stats_label.configure(text=stats_text)
         
-        cursor.execute("SELECT COUNT(*) FROM applications WHERE status = 'Applied'")
-        applied = cursor.fetchone()[0]
+        # Only the latest counts matter when several changes happen in a row
+        self.worker.submit(lambda repo: repo.stats(), loaded, self.show_db_error, key="stats")
+    
+    def show_reminders(self, reminders):
+        """Show reminders that just became due"""
+        dialog = tk.CTkToplevel(self.root)
+        dialog.title("Reminders")
+        dialog.geometry("520x360")
         
-        cursor.execute("SELECT COUNT(*) FROM applications WHERE status = 'Pending'")
-        pending = cursor.fetchone()[0]
+        title_label = tk.CTkLabel(dialog, text="Reminders", font=("Arial", 16, "bold"))
+        title_label.pack(pady=10)
         
-        cursor.execute("SELECT COUNT(*) FROM applications WHERE status = 'Offer Received'")
-        offers = cursor.fetchone()[0]
+        reminders_frame = tk.CTkScrollableFrame(dialog)
+        reminders_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        for reminder in reminders:
+            reminder_label = tk.CTkLabel(reminders_frame, text=reminder.message(), 
+                                         wraplength=440, justify="left")
+            reminder_label.pack(anchor="w", pady=3)
         
-        cursor.execute("SELECT COUNT(*) FROM applications WHERE status = 'Rejected'")
-        rejected = cursor.fetchone()[0]
+        def dismiss():
+            # Dismissed reminders are not shown again, even after a restart
+            self.worker.submit(lambda repo: repo.dismiss_reminders(reminders), on_error=self.show_db_error)
+            dialog.destroy()
         
-        stats_text = f"Total: {total} | Applied: {applied} | Pending: {pending} | Offers: {offers} | Rejected: {rejected}"
-        self.stats_label.configure(text=stats_text)
+        button_frame = tk.CTkFrame(dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+        dismiss_btn = tk.CTkButton(button_frame, text="Dismiss", command=dismiss)
+        dismiss_btn.pack(side=tk.LEFT, padx=5)
+        later_btn = tk.CTkButton(button_frame, text="Remind Me Next Time", 
+                                 command=dialog.destroy, fg_color="gray")
+        later_btn.pack(side=tk.RIGHT, padx=5)
+    
+    def open_analytics_dialog(self):
+        """Show funnel conversion rates and time spent in each status"""
+        def loaded(report):
+            dialog = tk.CTkToplevel(self.root)
+            dialog.title("Application Analytics")
+            dialog.geometry("520x420")
+            
+            title_label = tk.CTkLabel(dialog, text="Application Funnel", font=("Arial", 16, "bold"))
+            title_label.pack(pady=10)
+            
+            lines = [f"Applications tracked: {report.applications}", ""]
+            for stage in report.stages:
+                line = f"{stage.status}: {stage.reached}"
+                if stage.conversion is not None:
+                    line += f" ({stage.conversion:.0%} of previous stage)"
+                lines.append(line)
+            
+            lines.append("")
+            if report.median_response_days is not None:
+                lines.append(f"Median time to first response: {report.median_response_days:g} days")
+            lines.append("Median days in each status before moving on:")
+            for status, days in report.median_days.items():
+                lines.append(f"    {status}: {days:g}")
+            
+            tk.CTkLabel(dialog, text="\n".join(lines), justify="left", 
+                        font=("Arial", 13)).pack(padx=20, pady=10, anchor="w")
+            tk.CTkButton(dialog, text="Close", command=dialog.destroy).pack(pady=10)
+        
+        # Only status changes since the last report are read
+        self.worker.submit(lambda repo: repo.funnel(), loaded, self.show_db_error, key="funnel")
     
     def export_to_csv(self):
-        """Export applications to CSV file"""
+        """Export applications to a CSV or JSON Lines file in the background"""
+        from exporter import export_applications
+        from progress_dialog import ProgressDialog
         # Ask for file location
         file_path = tkinter.filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-            title="Export Applications to CSV"
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz"),
+                       ("JSON Lines files", "*.jsonl"), ("Compressed JSON Lines files", "*.jsonl.gz"),
+                       ("All files", "*.*")],
+            title="Export Applications"
         )
         if not file_path:
             return
         
-        try:
-            cursor = self.db.cursor()
-            cursor.execute('''
-                SELECT job_name, company, date_applied, status, priority, url, salary, 
-                       recruiter_dm, team_member_dm, hiring_manager_dm, created_at
-                FROM applications ORDER BY date_applied DESC
-            ''')
-            applications = cursor.fetchall()
-            
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                # Write header
-                writer.writerow(['Job Name', 'Company', 'Date Applied', 'Status', 'Priority', 
-                               'URL', 'Salary', 'Recruiter Contact', 'Team Member Contact', 
-                               'Hiring Manager Contact', 'Created At'])
-                # Write data
-                for app in applications:
-                    writer.writerow(app)
-            
-            tkinter.messagebox.showinfo("Success", f"Exported {len(applications)} applications to {file_path}")
-            
-        except Exception as e:
-            tkinter.messagebox.showerror("Error", f"Failed to export CSV: {str(e)}")
+        def cancel():
+            job.cancel()
+            progress.cancelling()
+        
+        def exported(count):
+            progress.close()
+            tkinter.messagebox.showinfo("Success", f"Exported {count} applications to {file_path}")
+        
+        def cancelled():
+            progress.close()
+            tkinter.messagebox.showinfo("Export Cancelled", "The export was cancelled; no file was written.")
+        
+        def failed(e):
+            progress.close()
+            tkinter.messagebox.showerror("Error", f"Failed to export: {str(e)}")
+        
+        progress = ProgressDialog(self.root, "Exporting Applications", cancel)
+        job = BackgroundJob(self.root, self.worker.path,
+                            lambda repo, report, cancel_event: export_applications(
+                                repo, file_path, progress=report, cancel=cancel_event),
+                            on_progress=progress.update, on_done=exported,
+                            on_error=failed, on_cancel=cancelled)
+    
+    def import_from_file(self):
+        """Import applications from a CSV or JSON Lines file in the background"""
+        from importer import import_applications
+        from progress_dialog import ProgressDialog
+        file_path = tkinter.filedialog.askopenfilename(
+            filetypes=[("Exported applications", "*.csv *.csv.gz *.jsonl *.jsonl.gz *.ndjson"),
+                       ("All files", "*.*")],
+            title="Import Applications"
+        )
+        if not file_path:
+            return
+        
+        upsert = tkinter.messagebox.askyesnocancel(
+            "Import Applications",
+            "Update existing applications that have the same job URL?\n\n"
+            "Yes: update them\nNo: add every row as a new application")
+        if upsert is None:
+            return
+        
+        def cancel():
+            job.cancel()
+            progress.cancelling()
+        
+        def imported(result):
+            progress.close()
+            self.refresh_applications(keep_position=True)
+            self.worker.submit(lambda repo: repo.load_reminders(), self.reminders.load, self.show_db_error)
+            message = f"Added {result.inserted} and updated {result.updated} applications."
+            if result.skipped:
+                details = "\n".join(f"Line {line}: {error}" for line, error in result.errors[:10])
+                message += f"\n\nSkipped {result.skipped} invalid rows:\n{details}"
+            if result.duplicates:
+                message += (f"\n\n{result.duplicates} added applications look like ones already tracked "
+                            f"(same job URL, or company and title).")
+            tkinter.messagebox.showinfo("Import Complete", message)
+        
+        def cancelled():
+            progress.close()
+            tkinter.messagebox.showinfo("Import Cancelled", "The import was cancelled; nothing was imported.")
+        
+        def failed(e):
+            progress.close()
+            tkinter.messagebox.showerror("Error", f"Failed to import: {str(e)}")
+        
+        progress = ProgressDialog(self.root, "Importing Applications", cancel)
+        job = BackgroundJob(self.root, self.worker.path,
+                            lambda repo, report, cancel_event: import_applications(
+                                repo, file_path, upsert=upsert, progress=report, cancel=cancel_event),
+                            on_progress=progress.update_fraction, on_done=imported,
+                            on_error=failed, on_cancel=cancelled)
+    
+    def ingest_postings(self):
+        """Add the job postings saved in a folder as Pending applications, in the background"""
+        from ingest import ingest_postings
+        from progress_dialog import ProgressDialog
+        directory = tkinter.filedialog.askdirectory(title="Folder of Saved Job Postings (HTML or JSON)")
+        if not directory:
+            return
+        
+        def cancel():
+            job.cancel()
+            progress.cancelling()
+        
+        def refresh():
+            self.refresh_applications(keep_position=True)
+            self.worker.submit(lambda repo: repo.load_reminders(), self.reminders.load, self.show_db_error)
+        
+        def ingested(result):
+            progress.close()
+            refresh()
+            message = (f"Added {result.inserted} postings as Pending applications; "
+                       f"{result.already_ingested} files were already ingested.")
+            if result.failed:
+                details = "\n".join(f"{path}: {error}" for path, error in result.errors[:10])
+                message += f"\n\n{result.failed} files could not be read:\n{details}"
+            if result.duplicates:
+                message += (f"\n\n{result.duplicates} added postings look like applications already tracked "
+                            f"(same job URL, or company and title).")
+            tkinter.messagebox.showinfo("Ingestion Complete", message)
+        
+        def cancelled():
+            progress.close()
+            refresh()
+            tkinter.messagebox.showinfo("Ingestion Stopped",
+                                        "Postings added so far were kept; ingesting the folder again continues "
+                                        "with the rest.")
+        
+        def failed(e):
+            progress.close()
+            refresh()
+            tkinter.messagebox.showerror("Error", f"Failed to ingest postings: {str(e)}")
+        
+        progress = ProgressDialog(self.root, "Ingesting Job Postings", cancel)
+        job = BackgroundJob(self.root, self.worker.path,
+                            lambda repo, report, cancel_event: ingest_postings(
+                                repo, directory, progress=report, cancel=cancel_event),
+                            on_progress=progress.update, on_done=ingested,
+                            on_error=failed, on_cancel=cancelled)
+    
+    def open_debug_panel(self):
+        """Show the profiling report"""
+        from debug_panel import DebugPanel
+        DebugPanel(self.root)
     
     def run(self):
         """Start the application"""
         self.root.mainloop()
-        self.db.close()
+        self.worker.close()
 
 # Run the application
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Job Application Tracker")
+    parser.add_argument("--profile", action="store_true",
+                        help="time database calls and list updates, logging slow queries")
+    parser.add_argument("--slow-query-ms", type=float,
+                        help="log queries slower than this when profiling (default: 50)")
+    args = parser.parse_args()
+    if args.profile or enabled_by_env():
+        profiler.enable(log_file(default_db_path()), slow_query_ms=args.slow_query_ms)
+    
     app = JobTracker()
     app.run()
@@ -0,0 +1,163 @@
+from itertools import groupby
+from typing import Dict, List, NamedTuple, Optional
+
+# Funnel stages in order; an application reaching a stage has passed the earlier ones
+FUNNEL = ["Applied", "Interview Scheduled", "Interviewed", "Offer Received"]
+
+# Furthest funnel stage implied by each status; Rejected and Withdrawn only imply
+# the application was sent, history tells whether it got further
+STAGE_RANKS = {"Pending": 0, "Applied": 1, "Rejected": 1, "Withdrawn": 1,
+               "Interview Scheduled": 2, "Interviewed": 3, "Offer Received": 4}
+
+# Statuses that mean the employer answered
+RESPONSE_STATUSES = {"Interview Scheduled", "Interviewed", "Offer Received", "Rejected"}
+
+# Applications looked up per query when catching up on new events
+LOOKUP_CHUNK = 500
+
+
+class FunnelStage(NamedTuple):
+    """One stage of the application funnel"""
+    status: str
+    reached: int
+    conversion: Optional[float]
+    median_days: Optional[float]
+
+
+class FunnelReport(NamedTuple):
+    """Funnel conversion and timing metrics computed from status_events"""
+    stages: List[FunnelStage]
+    median_days: Dict[str, float]
+    median_response_days: Optional[float]
+    applications: int
+    events: int
+
+
+def median(values):
+    """Return the median of a sorted list, or None if it is empty"""
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class ApplicationHistory:
+    """What the funnel needs to know about one application's past events"""
+
+    def __init__(self, first):
+        # Julian days: when the application was applied for (its first event)
+        # and when it entered its current status
+        self.first = first
+        self.since = first
+        self.status = None
+        self.rank = -1
+        self.responded = False
+
+
+class FunnelAnalytics:
+    """Funnel metrics kept up to date incrementally from the status_events log
+
+    Events are append-only, so update() only reads events added since the
+    previous call. The history of the applications they belong to is
+    replayed to know where each one stood, and the new transitions are
+    folded into running stage counts and sorted duration lists. The first
+    call reads the whole log in a single ordered pass.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything, so that the next update() reads the whole log"""
+        self.last_event_id = 0
+        self.events = 0
+        # reached[rank] = applications whose furthest stage is at least rank
+        self.reached = [0] * (max(STAGE_RANKS.values()) + 1)
+        self.durations = {}
+        self.response_days = []
+
+    def update(self, db):
+        """Fold events added since the last call into the metrics and return the report"""
+        last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM status_events").fetchone()[0]
+        if last_id < self.last_event_id:
+            # The log is not the one we summarized (e.g. the database was replaced)
+            self.reset()
+        if last_id > self.last_event_id:
+            self.fold(db, self.last_event_id, last_id)
+            self.last_event_id = last_id
+        return self.report()
+
+    def fold(self, db, after_id, last_id):
+        """Apply the events with an id above `after_id`, up to `last_id`"""
+        events = db.execute('''
+            SELECT application_id, status, julianday(at) FROM status_events
+            WHERE id > ? AND id <= ? ORDER BY application_id, id
+        ''', (after_id, last_id))
+        if after_id:
+            events = events.fetchall()
+            histories = self.load_histories(db, sorted({app_id for app_id, _, _ in events}), after_id)
+        else:
+            histories = {}
+
+        for app_id, app_events in groupby(events, key=lambda event: event[0]):
+            history = histories.get(app_id)
+            for _, status, at in app_events:
+                if history is None:
+                    history = ApplicationHistory(at)
+                self.apply(history, status, at, record=True)
+                self.events += 1
+
+        # New durations were appended; sorting keeps medians a lookup (and is
+        # linear when only a few values were added to an already sorted list)
+        for days in self.durations.values():
+            days.sort()
+        self.response_days.sort()
+
+    def load_histories(self, db, app_ids, after_id):
+        """Replay the already counted events of some applications, without recounting them"""
+        histories = {}
+        for start in range(0, len(app_ids), LOOKUP_CHUNK):
+            chunk = app_ids[start:start + LOOKUP_CHUNK]
+            rows = db.execute(f'''
+                SELECT application_id, status, julianday(at) FROM status_events
+                WHERE application_id IN ({", ".join("?" * len(chunk))}) AND id <= ?
+                ORDER BY application_id, id
+            ''', chunk + [after_id])
+            for app_id, status, at in rows:
+                history = histories.get(app_id)
+                if history is None:
+                    history = histories[app_id] = ApplicationHistory(at)
+                self.apply(history, status, at, record=False)
+        return histories
+
+    def apply(self, history, status, at, record):
+        """Move an application to `status` at Julian day `at`, counting it if `record`"""
+        rank = STAGE_RANKS.get(status, 1)
+        if record:
+            if history.status is not None:
+                self.durations.setdefault(history.status, []).append(max(0.0, at - history.since))
+            for reached_rank in range(history.rank + 1, rank + 1):
+                self.reached[reached_rank] += 1
+            if status in RESPONSE_STATUSES and not history.responded:
+                self.response_days.append(max(0.0, at - history.first))
+
+        history.since = at
+        history.status = status
+        history.rank = max(history.rank, rank)
+        history.responded = history.responded or status in RESPONSE_STATUSES
+
+    def report(self):
+        """Return the current metrics"""
+        median_days = {status: round(median(days), 1) for status, days in self.durations.items()}
+        stages = []
+        previous = None
+        for status in FUNNEL:
+            reached = self.reached[STAGE_RANKS[status]]
+            conversion = reached / previous if previous else None
+            stages.append(FunnelStage(status, reached, conversion, median_days.get(status)))
+            previous = reached
+        response = median(self.response_days)
+        return FunnelReport(stages, median_days, round(response, 1) if response is not None else None,
+                            self.reached[0], self.events)
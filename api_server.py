@@ -0,0 +1,415 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from queries import PAGE_SIZE, SORT_OPTIONS, get_keyset_columns, is_ranked
+from repository import (FIELDS, STATUSES, ApplicationRepository, ConflictError, DuplicateError,
+                        ValidationError, default_db_path)
+from salary import parse_salary
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Threads, each with its own read connection; WAL lets them all read while
+# the single writer commits
+READERS = 4
+
+# Largest page a client may ask for
+MAX_PAGE_SIZE = 1000
+
+MAX_BODY_BYTES = 1024 * 1024
+
+# Headers a request may send; each line is also bounded by the stream's
+# 64 KiB line limit
+MAX_HEADERS = 100
+
+# Responses smaller than this are sent uncompressed; gzip would barely help
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+
+class HTTPError(Exception):
+    """An error response, with the message sent back as JSON"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """A parsed HTTP request"""
+
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        url = urlsplit(target)
+        self.parts = [part for part in url.path.split("/") if part]
+        self.query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+        connection = headers.get("connection", "").lower()
+        self.keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+    def json(self):
+        """Return the body decoded as a JSON object"""
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Expected a JSON object, not {type(data).__name__}")
+        return data
+
+
+async def read_line(reader, status, message):
+    """Read one line, answering with `status` if it is longer than the stream's limit"""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(status, message)
+
+
+async def read_request(reader):
+    """Read one request from a connection, or return None once the client is done"""
+    line = await read_line(reader, HTTPStatus.BAD_REQUEST, "Request line too long")
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await read_line(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Header line too long")
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target, version, headers, body)
+
+
+def encode_cursor(key):
+    """Turn the sort key of a page's last row into an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor, columns):
+    """Return the sort key of a cursor, checking it fits the keyset `columns`"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        key = None
+    if not isinstance(key, list) or len(key) != columns.count(",") + 1:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid cursor")
+    return key
+
+
+def application_fields(data):
+    """Return the application fields of a request body; clean_fields() validates them"""
+    return {name: data.get(name) for name in FIELDS}
+
+
+class ApiServer:
+    """Local HTTP/JSON API over the tracker database
+
+    Requests are parsed on the asyncio loop; queries run on a small pool of
+    reader threads, each with its own connection, and every write goes
+    through a single writer thread, so writes are serialized exactly as
+    SQLite requires while reads proceed in parallel. GET responses carry an
+    ETag built from PRAGMA data_version, which changes whenever any
+    connection (the GUI, the CLI or this server's writer) commits, so an
+    If-None-Match revalidation is answered with 304 without running the
+    query. Larger responses are gzip-compressed for clients accepting it.
+    """
+
+    def __init__(self, path=None, readers=READERS):
+        self.path = path or default_db_path()
+        # Migrate before readers open, so that they never race a migration
+        ApplicationRepository(path).close()
+
+        self.local = threading.local()
+        self.repos = []
+        self.repos_lock = threading.Lock()
+        self.readers = ThreadPoolExecutor(readers, thread_name_prefix="api-reader")
+        self.writer = ThreadPoolExecutor(1, thread_name_prefix="api-writer")
+        # Opened on the loop thread by start(); only reads PRAGMA data_version
+        self.watch = None
+        # Distinguishes ETags of this run from those of earlier ones
+        self.instance = os.urandom(4).hex()
+        self.server = None
+        self.connections = set()
+
+    def repository(self):
+        """Return the calling pool thread's own repository"""
+        repo = getattr(self.local, "repo", None)
+        if repo is None:
+            # Only this thread uses it, but close() runs on the loop thread
+            repo = self.local.repo = ApplicationRepository(self.path, check_same_thread=False)
+            with self.repos_lock:
+                self.repos.append(repo)
+        return repo
+
+    async def read(self, fn):
+        """Run `fn(repo)` on a reader thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.readers, lambda: fn(self.repository()))
+
+    async def write(self, fn):
+        """Run `fn(repo)` on the writer thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.writer, lambda: fn(self.repository()))
+
+    def etag(self):
+        """Return the ETag of the current database contents"""
+        version = self.watch.execute("PRAGMA data_version").fetchone()[0]
+        return f'"{self.instance}-{version}"'
+
+    async def start(self, host=HOST, port=PORT):
+        """Start listening; returns the bound (host, port)"""
+        self.watch = sqlite3.connect(self.path, check_same_thread=False)
+        self.server = await asyncio.start_server(self.serve_connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        """Stop listening and end the open client connections"""
+        self.server.close()
+        for task in self.connections:
+            task.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+
+    def close(self):
+        """Close the database connections, once stopped"""
+        self.readers.shutdown()
+        self.writer.shutdown()
+        for repo in self.repos:
+            repo.close()
+        if self.watch is not None:
+            self.watch.close()
+
+    async def serve_connection(self, reader, writer):
+        """Answer the requests of one (keep-alive) connection"""
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    self.send(writer, None, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                status, headers, data = await self.respond(request)
+                self.send(writer, request, status, data, headers, request.keep_alive)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    def send(self, writer, request, status, data, headers=None, keep_alive=True):
+        """Write a JSON response, compressed if the client accepts gzip"""
+        headers = dict(headers or {})
+        body = b""
+        if data is not None:
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+            headers["Content-Type"] = "application/json; charset=utf-8"
+            headers["Vary"] = "Accept-Encoding"
+            accepts = request.headers.get("accept-encoding", "") if request is not None else ""
+            if len(body) >= COMPRESS_MIN_BYTES and "gzip" in accepts:
+                body = gzip.compress(body, GZIP_LEVEL)
+                headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def respond(self, request):
+        """Return (status, headers, JSON data) for a request"""
+        try:
+            if request.method == "GET":
+                # The ETag is taken before the query: if data changes meanwhile the
+                # client just revalidates again next time
+                etag = self.etag()
+                if request.headers.get("if-none-match") == etag:
+                    return HTTPStatus.NOT_MODIFIED, {"ETag": etag}, None
+                status, data = await self.route(request)
+                return status, {"ETag": etag, "Cache-Control": "no-cache"}, data
+            status, data = await self.route(request)
+            return status, {}, data
+        except HTTPError as e:
+            return e.status, {}, {"error": str(e)}
+        except ValidationError as e:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {}, {"error": str(e)}
+        except ConflictError as e:
+            return HTTPStatus.CONFLICT, {}, {"error": str(e)}
+        except DuplicateError as e:
+            return HTTPStatus.CONFLICT, {}, {"error": str(e),
+                                             "duplicates": [duplicate._asdict() for duplicate in e.duplicates]}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, {"error": f"{type(e).__name__}: {e}"}
+
+    async def route(self, request):
+        """Dispatch a request to its handler, returning (status, JSON data)"""
+        parts = request.parts
+        if parts == ["stats"]:
+            self.allow(request, "GET")
+            return HTTPStatus.OK, await self.read(lambda repo: repo.stats())
+        if parts == ["applications"]:
+            self.allow(request, "GET", "POST")
+            if request.method == "GET":
+                return HTTPStatus.OK, await self.list_applications(request.query)
+            fields = application_fields(request.json())
+            # Like the add dialog and the CLI, new applications default to today
+            fields["date_applied"] = fields["date_applied"] or "today"
+            # Like the add dialog and the CLI, likely duplicates are refused
+            # unless asked for with ?allow_duplicates=true
+            allow_duplicates = request.query.get("allow_duplicates", "").lower() in ("1", "true", "yes")
+            app_id = await self.write(lambda repo: repo.add(fields, allow_duplicates))
+            return HTTPStatus.CREATED, {"id": app_id}
+        if len(parts) in (2, 3) and parts[0] == "applications" and parts[1].isdigit():
+            app_id = int(parts[1])
+            if len(parts) == 3:
+                if parts[2] != "status":
+                    raise HTTPError(HTTPStatus.NOT_FOUND, "Not found")
+                self.allow(request, "PUT")
+                return HTTPStatus.OK, await self.set_status(app_id, request.json())
+            self.allow(request, "GET", "PUT", "DELETE")
+            if request.method == "GET":
+                app = await self.read(lambda repo: repo.get(app_id))
+            elif request.method == "PUT":
+                data = request.json()
+                version = data.get("version")
+                if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+                    raise ValidationError("version must be an integer or null")
+                app = await self.update_application(app_id, application_fields(data), version)
+            else:
+                await self.delete_application(app_id)
+                return HTTPStatus.NO_CONTENT, None
+            if app is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"No application with id {app_id}")
+            return HTTPStatus.OK, app._asdict()
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Not found")
+
+    def allow(self, request, *methods):
+        """Reject a request whose method the resource does not support"""
+        if request.method not in methods:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Allowed: {', '.join(methods)}")
+
+    async def list_applications(self, query):
+        """One page of the applications list, with the cursor of the next page"""
+        search = query.get("search", "")
+        sort = SORT_OPTIONS.get(query.get("sort", "date"))
+        if sort is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"sort must be one of {', '.join(SORT_OPTIONS)}")
+        try:
+            limit = min(int(query.get("limit", PAGE_SIZE)), MAX_PAGE_SIZE)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "limit must be a positive number")
+        salary_range = (parse_salary(query["min_salary"])[0] if query.get("min_salary") else None,
+                        parse_salary(query["max_salary"])[1] if query.get("max_salary") else None)
+
+        def load(repo):
+            after = None
+            if query.get("after"):
+                after = decode_cursor(query["after"], get_keyset_columns(sort, is_ranked(search, repo.use_fts)))
+            rows = repo.list_applications(search, sort, query.get("status"), after=after,
+                                          limit=limit, salary_range=salary_range)
+            more = len(rows) == limit
+            return {"items": [row._asdict() for row in rows],
+                    "next": encode_cursor(repo.get_sort_key(search, sort)(rows[-1])) if more else None}
+
+        return await self.read(load)
+
+    async def update_application(self, app_id, fields, expected_version=None):
+        """Save every field of an application and return the updated record
+
+        A `version` sent with the fields must match the stored one, or the
+        request fails with 409 Conflict instead of overwriting a newer write.
+        """
+        def write(repo):
+            if repo.get_status(app_id) is None:
+                return None
+            repo.update(app_id, fields, expected_version)
+            return repo.get(app_id)
+
+        return await self.write(write)
+
+    async def delete_application(self, app_id):
+        """Delete an application"""
+        def write(repo):
+            if repo.get_status(app_id) is None:
+                return False
+            repo.delete(app_id)
+            return True
+
+        if not await self.write(write):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No application with id {app_id}")
+
+    async def set_status(self, app_id, data):
+        """Change the status of an application"""
+        status = data.get("status")
+        if not isinstance(status, str) or not status.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "status is required")
+        # Like the CLI: the stats bar and the funnel only know these
+        if status.strip() not in STATUSES:
+            raise ValidationError(f"status must be one of {', '.join(STATUSES)}")
+
+        def write(repo):
+            if repo.get_status(app_id) is None:
+                return False
+            repo.set_status(app_id, status.strip())
+            return True
+
+        if not await self.write(write):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No application with id {app_id}")
+        return {"id": app_id, "status": status.strip()}
+
+
+async def serve(path, host, port, readers):
+    """Run the API server until interrupted"""
+    server = ApiServer(path, readers)
+    host, port = await server.start(host, port)
+    print(f"Serving the tracker API on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+        server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local JSON API for the Job Application Tracker")
+    parser.add_argument("--db", help="database file (default: $JOBS_TRACKER_DB, or job_tracker.db next to the program)")
+    parser.add_argument("--host", default=HOST, help=f"address to bind (default: {HOST}, local only)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"port (default: {PORT})")
+    parser.add_argument("--readers", type=int, default=READERS, help=f"read connections (default: {READERS})")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.db, args.host, args.port, args.readers))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,159 @@
+import tkinter.messagebox
+from datetime import datetime
+
+import customtkinter as tk
+
+from profiling import profiler
+from repository import PRIORITIES, STATUSES, ValidationError, clean_fields
+
+# Text entries of the form: (field, label, placeholder)
+ENTRIES = [
+    ("job_name", "Job Title:", None),
+    ("company", "Company:", None),
+    ("url", "Job URL:", None),
+    ("date_applied", "Date Applied:", "YYYY-MM-DD or 'today'"),
+    ("salary", "Salary:", "e.g., $80,000 - $100,000"),
+    ("interview_date", "Interview Date:", "YYYY-MM-DD (optional)"),
+    ("recruiter_dm", "Recruiter Contact:", "Email, LinkedIn, phone..."),
+    ("team_member_dm", "Team Member Contact:", "Email, LinkedIn, phone..."),
+    ("hiring_manager_dm", "Hiring Manager Contact:", "Email, LinkedIn, phone..."),
+]
+
+
+class ApplicationForm:
+    """The add / edit application dialog, built once and reused
+
+    The window and its widgets are created on first use; closing the
+    dialog only hides it, and each open refills the same widgets, either
+    with defaults for a new application or from an existing record.
+    Fields are checked with the repository's clean_fields() before
+    `on_submit(fields)` is called, so both modes validate the same way;
+    the caller then reports the outcome with done() or failed().
+    """
+
+    def __init__(self, master, on_open_url):
+        self.master = master
+        self.on_open_url = on_open_url
+        self.window = None
+        self.entries = {}
+        self.on_submit = None
+
+    def build(self):
+        """Create the window and its widgets"""
+        self.window = tk.CTkToplevel(self.master)
+        self.window.geometry("400x600")
+        self.window.transient(self.master)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        # Form title
+        self.title_label = tk.CTkLabel(self.window, text="", font=("Arial", 16, "bold"))
+        self.title_label.pack(pady=10)
+
+        # Scrollable frame for form
+        self.scroll_frame = tk.CTkScrollableFrame(self.window)
+        self.scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        for field, label, placeholder in ENTRIES:
+            tk.CTkLabel(self.scroll_frame, text=label).pack(anchor="w", pady=(10, 0))
+            if field == "url":
+                # The URL entry has an Open button next to it
+                url_frame = tk.CTkFrame(self.scroll_frame)
+                url_frame.pack(pady=(0, 10))
+                entry = tk.CTkEntry(url_frame, width=300)
+                entry.pack(side=tk.LEFT, padx=(0, 5))
+                open_url_btn = tk.CTkButton(url_frame, text="Open", width=40,
+                                            command=lambda: self.on_open_url(self.entries["url"].get()))
+                open_url_btn.pack(side=tk.RIGHT)
+            else:
+                entry = tk.CTkEntry(self.scroll_frame, width=350, placeholder_text=placeholder)
+                entry.pack(pady=(0, 10))
+            self.entries[field] = entry
+
+            # Status follows the date applied
+            if field == "salary":
+                tk.CTkLabel(self.scroll_frame, text="Status:").pack(anchor="w", pady=(10, 0))
+                self.status_combo = tk.CTkComboBox(self.scroll_frame, width=350, values=STATUSES)
+                self.status_combo.pack(pady=(0, 10))
+
+        # Priority
+        tk.CTkLabel(self.scroll_frame, text="Priority:").pack(anchor="w", pady=(10, 0))
+        self.priority_combo = tk.CTkComboBox(self.scroll_frame, width=350, values=PRIORITIES)
+        self.priority_combo.pack(pady=(0, 15))
+
+        # Buttons
+        button_frame = tk.CTkFrame(self.window)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        self.submit_btn = tk.CTkButton(button_frame, text="", command=self.submit)
+        self.submit_btn.pack(side=tk.LEFT, padx=5)
+
+        cancel_btn = tk.CTkButton(button_frame, text="Cancel", command=self.hide, fg_color="gray")
+        cancel_btn.pack(side=tk.RIGHT, padx=5)
+
+    def open_add(self, on_submit):
+        """Show the form empty, for a new application"""
+        self.open("Add New Application", "Add Application", {
+            "date_applied": datetime.now().strftime("%Y-%m-%d"),
+            "status": "Pending",
+            "priority": "Medium",
+        }, on_submit)
+
+    def open_edit(self, app, on_submit):
+        """Show the form filled from an existing application"""
+        self.open("Edit Application", "Update Application", app._asdict(), on_submit)
+
+    def open(self, title, submit_text, values, on_submit):
+        """Fill the form with `values` and show it"""
+        with profiler.span("form open"):
+            if self.window is None:
+                self.build()
+            self.on_submit = on_submit
+            self.window.title(title)
+            self.title_label.configure(text=title)
+            self.submit_btn.configure(text=submit_text, state="normal")
+
+            for field, entry in self.entries.items():
+                entry.delete(0, "end")
+                if values.get(field):
+                    entry.insert(0, values[field])
+            self.status_combo.set(values.get("status") or "Pending")
+            self.priority_combo.set(values.get("priority") or "Medium")
+            self.scroll_frame._parent_canvas.yview_moveto(0)
+
+            self.window.deiconify()
+            self.window.lift()
+            self.window.grab_set()
+            self.entries["job_name"].focus_set()
+
+    def values(self):
+        """Return the fields as typed in the form"""
+        fields = {field: entry.get().strip() for field, entry in self.entries.items()}
+        fields["status"] = self.status_combo.get()
+        fields["priority"] = self.priority_combo.get()
+        return fields
+
+    def submit(self):
+        """Validate the form and hand its fields to the caller"""
+        fields = self.values()
+        try:
+            clean_fields(fields)
+        except ValidationError as e:
+            tkinter.messagebox.showerror("Error", str(e), parent=self.window)
+            return
+        # Until the write finishes, a second click must not submit again
+        self.submit_btn.configure(state="disabled")
+        self.on_submit(fields)
+
+    def done(self):
+        """The submitted fields were saved: close the form"""
+        self.hide()
+
+    def failed(self):
+        """The submitted fields could not be saved: let the user fix them"""
+        self.submit_btn.configure(state="normal")
+
+    def hide(self):
+        """Hide the form, keeping its widgets for the next open"""
+        self.on_submit = None
+        self.window.grab_release()
+        self.window.withdraw()
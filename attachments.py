@@ -0,0 +1,172 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from typing import NamedTuple
+
+# Bytes read at a time when hashing and copying a file
+CHUNK_SIZE = 1024 * 1024
+
+# Files a store copy is written to before it gets its final name
+INCOMING_PREFIX = ".incoming-"
+
+# Blobs stored or dereferenced less than this ago are never collected:
+# another process may have stored one and not committed the attachment that
+# refers to it yet, and a deleted application may still be undone
+GC_GRACE_SECONDS = 3600
+
+
+class Attachment(NamedTuple):
+    """A file attached to an application; its content is in the blob store"""
+    id: int
+    application_id: int
+    sha256: str
+    name: str
+    size: int
+    added_at: str
+
+
+class CollectResult(NamedTuple):
+    """Outcome of a garbage collection of the blob store"""
+    removed: int
+    freed_bytes: int
+
+
+def store_dir(db_path):
+    """Return the blob store directory of a database: job_tracker.db keeps its files in job_tracker.attachments"""
+    return os.path.splitext(os.path.abspath(db_path))[0] + ".attachments"
+
+
+def copy_chunks(source, target=None):
+    """Stream a file object through SHA-256, copying it to `target` if given; return (sha256, size)"""
+    digest = hashlib.sha256()
+    size = 0
+    # One buffer is reused for every chunk, so that large files cost no more memory than small ones
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        count = source.readinto(buffer)
+        if not count:
+            break
+        digest.update(view[:count])
+        if target is not None:
+            target.write(view[:count])
+        size += count
+    return digest.hexdigest(), size
+
+
+def file_digest(path):
+    """Return the SHA-256 and size of a file, read in chunks"""
+    with open(path, "rb") as file:
+        return copy_chunks(file)
+
+
+class BlobStore:
+    """Files stored once per content, named by the SHA-256 of their bytes
+
+    The same CV attached to fifty applications is one file here and fifty
+    rows in the attachments table. Blobs are spread over subdirectories by
+    the first two hex digits of their hash, and are only ever added whole:
+    a copy is written under a temporary name and renamed into place.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, digest):
+        """Return the file holding the blob with this hash"""
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def add(self, source_path):
+        """Copy a file into the store, hashing it on the way; return (sha256, size)"""
+        os.makedirs(self.root, exist_ok=True)
+        descriptor, incoming = tempfile.mkstemp(prefix=INCOMING_PREFIX, dir=self.root)
+        try:
+            with open(source_path, "rb") as source, os.fdopen(descriptor, "wb") as target:
+                digest, size = copy_chunks(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+            path = self.path(digest)
+            try:
+                # Stored before: only make it young again, so a collection
+                # running meanwhile keeps it
+                os.utime(path)
+                os.remove(incoming)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(incoming, path)
+        except BaseException:
+            if os.path.exists(incoming):
+                os.remove(incoming)
+            raise
+        return digest, size
+
+    def touch(self, digests):
+        """Make blobs young again, so that a collection keeps them for the grace period"""
+        for digest in digests:
+            try:
+                os.utime(self.path(digest))
+            except FileNotFoundError:
+                pass
+
+    def open(self, digest):
+        """Open a blob for reading in binary mode"""
+        return open(self.path(digest), "rb")
+
+    def named_copy(self, digest, name, directory=None):
+        """Return a copy of a blob under its original file name, for opening in another program
+
+        Blobs have no extension for the system to pick a program by. The
+        copy goes to a per-hash folder in the temporary directory and is
+        reused while it is there.
+        """
+        folder = os.path.join(directory or tempfile.gettempdir(), "jobs_tracker_attachments", digest[:16])
+        path = os.path.join(folder, os.path.basename(name))
+        if not os.path.exists(path):
+            os.makedirs(folder, exist_ok=True)
+            shutil.copyfile(self.path(digest), path)
+        return path
+
+    def verify(self, digest):
+        """Return True if a blob is present and its content still has its hash"""
+        try:
+            return file_digest(self.path(digest))[0] == digest
+        except FileNotFoundError:
+            return False
+
+    def collect(self, referenced, grace_seconds=GC_GRACE_SECONDS):
+        """Delete the blobs whose hash is not in `referenced`, and abandoned incoming copies
+
+        Files modified in the last `grace_seconds` are kept whatever they
+        are, so a collection never races an attachment being added, nor
+        removes the blob of one detached recently (see touch()).
+        """
+        removed = freed = 0
+        cutoff = time.time() - grace_seconds
+        if not os.path.isdir(self.root):
+            return CollectResult(0, 0)
+        for folder, _, names in os.walk(self.root):
+            prefix = os.path.relpath(folder, self.root)
+            for name in names:
+                if prefix + name in referenced:
+                    continue
+                if folder == self.root and not name.startswith(INCOMING_PREFIX):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    status = os.stat(path)
+                    if status.st_mtime >= cutoff:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += status.st_size
+            if folder != self.root and not os.listdir(folder):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    # Another process stored a blob here just now
+                    pass
+        return CollectResult(removed, freed)
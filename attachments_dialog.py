@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import tkinter.filedialog
+import tkinter.messagebox
+
+import customtkinter as tk
+
+
+def format_size(size):
+    """Return a file size for display, in bytes, KB or MB"""
+    if size < 1024:
+        return f"{size} bytes"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def open_file(path):
+    """Open a file with the program the system associates with its type"""
+    if sys.platform.startswith("win"):
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+
+class AttachmentsDialog:
+    """Window listing the files attached to one application, to add, open or remove them
+
+    The attachments are read when the window opens, not with the list;
+    files are copied into the blob store on the database worker.
+    """
+
+    def __init__(self, master, worker, app_id, title, on_error):
+        self.worker = worker
+        self.app_id = app_id
+        self.on_error = on_error
+        self.window = tk.CTkToplevel(master)
+        self.window.title(f"Attachments - {title}")
+        self.window.geometry("560x360")
+
+        self.rows_frame = tk.CTkScrollableFrame(self.window)
+        self.rows_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        button_frame = tk.CTkFrame(self.window)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        tk.CTkButton(button_frame, text="Attach File...", command=self.attach).pack(side=tk.LEFT, padx=5)
+        tk.CTkButton(button_frame, text="Close", fg_color="gray",
+                     command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+
+        self.reload()
+
+    def reload(self):
+        """Read the attachments again and redraw them"""
+        self.worker.submit(lambda repo: repo.list_attachments(self.app_id), self.show, self.on_error)
+
+    def show(self, attachments):
+        """Draw one row per attachment"""
+        if not self.window.winfo_exists():
+            return
+        for widget in self.rows_frame.winfo_children():
+            widget.destroy()
+        if not attachments:
+            tk.CTkLabel(self.rows_frame, text="No files attached yet. Attach a customized CV or cover letter.",
+                        font=("Arial", 13)).pack(pady=30)
+        for attachment in attachments:
+            row = tk.CTkFrame(self.rows_frame)
+            row.pack(fill=tk.X, pady=2)
+            tk.CTkLabel(row, text=f"{attachment.name} ({format_size(attachment.size)})",
+                        anchor="w").pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+            tk.CTkButton(row, text="Remove", width=70, fg_color="red",
+                         command=lambda attachment=attachment: self.remove(attachment)).pack(side=tk.RIGHT, padx=2)
+            tk.CTkButton(row, text="Open", width=60,
+                         command=lambda attachment=attachment: self.open(attachment)).pack(side=tk.RIGHT, padx=2)
+
+    def attach(self):
+        """Ask for a file and attach it"""
+        path = tkinter.filedialog.askopenfilename(parent=self.window, title="Attach a File",
+                                                  filetypes=[("Documents", "*.pdf *.doc *.docx *.odt *.txt *.md"),
+                                                             ("All files", "*.*")])
+        if path:
+            self.worker.submit(lambda repo: repo.add_attachment(self.app_id, path),
+                               lambda attachment: self.reload(), self.on_error)
+
+    def open(self, attachment):
+        """Open an attachment in the program for its type"""
+        def copied(path):
+            try:
+                open_file(path)
+            except OSError as e:
+                tkinter.messagebox.showerror("Error", f"Could not open {attachment.name}: {e}")
+
+        self.worker.submit(lambda repo: repo.blobs.named_copy(attachment.sha256, attachment.name),
+                           copied, self.on_error)
+
+    def remove(self, attachment):
+        """Detach a file after confirming"""
+        if tkinter.messagebox.askyesno("Remove Attachment", f"Remove {attachment.name} from this application?",
+                                       parent=self.window):
+            self.worker.submit(lambda repo: repo.remove_attachment(attachment.id),
+                               lambda result: self.reload(), self.on_error)
@@ -0,0 +1,396 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from cli import list_rows
+from exporter import export_applications
+from query_cache import MAX_CACHE_BYTES
+from repository import STATUSES, STORED_COLUMNS, ApplicationRepository
+from salary import parse_salary
+
+# Database sizes benchmarked by default
+SIZES = [1000, 10000, 100000, 1000000]
+
+# Generated databases are kept here and reused by later runs
+DB_DIR = ".benchmark_dbs"
+
+# Seed of the synthetic data; change it to get a different but equally shaped dataset
+SEED = 42
+
+# Status and priority distributions, roughly those of a real job search
+STATUS_WEIGHTS = {"Applied": 45, "Rejected": 25, "Pending": 10, "Interview Scheduled": 7,
+                  "Interviewed": 6, "Withdrawn": 4, "Offer Received": 3}
+PRIORITY_WEIGHTS = {"High": 20, "Medium": 55, "Low": 25}
+
+# Vocabulary of the generated job titles and company names
+SENIORITY = ["", "", "Junior ", "Senior ", "Staff ", "Lead ", "Principal "]
+FIELDS_OF_WORK = ["Data", "Software", "Backend", "Frontend", "Machine Learning", "Platform",
+                  "Analytics", "Cloud", "Security", "Mobile", "DevOps", "Product"]
+ROLES = ["Engineer", "Developer", "Analyst", "Scientist", "Architect", "Manager", "Consultant"]
+COMPANY_WORDS = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay",
+                 "Soylent", "Tyrell", "Cyberdyne", "Aperture", "Gringotts", "Oscorp", "Wonka"]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Technologies", "Group", "Analytics", "Health", "Bank"]
+
+# Searches typed in the search box: a prefix, a common word, a rare company, two words
+SEARCHES = ["en", "engineer", "tyrell", "data scien"]
+
+
+def weighted(rng, weights, count):
+    """Draw `count` values from a {value: weight} distribution"""
+    return rng.choices(list(weights), weights=list(weights.values()), k=count)
+
+
+def generate_rows(rows, seed=SEED):
+    """Yield synthetic applications as STORED_COLUMNS values followed by created_at"""
+    rng = random.Random(seed)
+    # A few companies receive most applications (Zipf-like), most receive one or two
+    companies = [f"{a} {b} {i}" for i, (a, b) in enumerate(
+        (rng.choice(COMPANY_WORDS), rng.choice(COMPANY_SUFFIXES)) for _ in range(max(10, rows // 20)))]
+    company_weights = [1 / (rank + 1) for rank in range(len(companies))]
+    today = date(2026, 1, 1)
+
+    statuses = weighted(rng, STATUS_WEIGHTS, rows)
+    priorities = weighted(rng, PRIORITY_WEIGHTS, rows)
+    for i in range(rows):
+        company = rng.choices(companies, weights=company_weights)[0] if i % 10 else rng.choice(companies)
+        title = f"{rng.choice(SENIORITY)}{rng.choice(FIELDS_OF_WORK)} {rng.choice(ROLES)}"
+        # Recent dates are more frequent than old ones, over about three years
+        applied = today - timedelta(days=int(rng.expovariate(1 / 180)) % 1100)
+        low = rng.randrange(60, 200)
+        salary = rng.choice([f"${low},000", f"${low}k - ${low + 30}k", f"${low // 2}/hr"]) if rng.random() < 0.4 else ""
+        recruiter = f"recruiter{rng.randrange(rows)}@{company.split()[0].lower()}.com" if rng.random() < 0.3 else ""
+        values = {
+            "job_name": title,
+            "url": f"https://jobs.example.com/{company.split()[0].lower()}/{i}",
+            "company": company,
+            "date_applied": applied.isoformat(),
+            "salary": salary,
+            "status": statuses[i],
+            "recruiter_dm": recruiter,
+            "team_member_dm": "",
+            "hiring_manager_dm": "",
+            "priority": priorities[i],
+            "interview_date": (applied + timedelta(days=14)).isoformat()
+            if statuses[i] == "Interview Scheduled" else None,
+        }
+        values["salary_min"], values["salary_max"], values["currency"] = parse_salary(salary)
+        yield [values[name] for name in STORED_COLUMNS] + [f"{applied.isoformat()} 12:00:00"]
+
+
+def generate_database(path, rows, seed=SEED):
+    """Create a tracker database filled with `rows` synthetic applications"""
+    repo = ApplicationRepository(path)
+    try:
+        with repo.bulk_writes():
+            batch = []
+            for row in generate_rows(rows, seed):
+                batch.append(row)
+                if len(batch) == 10000:
+                    repo.write_batch(batch)
+                    batch = []
+            if batch:
+                repo.write_batch(batch)
+        repo.db.execute("ANALYZE")
+        repo.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        repo.close()
+
+
+def get_database(rows, db_dir=DB_DIR, seed=SEED):
+    """Return the path of a pristine benchmark database, generating it if needed"""
+    os.makedirs(db_dir, exist_ok=True)
+    path = os.path.join(db_dir, f"jobs_{rows}_{seed}.db")
+    if not os.path.exists(path):
+        print(f"Generating {rows:,} applications...", flush=True)
+        temp_path = path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        generate_database(temp_path, rows, seed)
+        os.replace(temp_path, path)
+    return path
+
+
+def working_copy(path, directory):
+    """Copy a pristine database so that write benchmarks never change it"""
+    copy = os.path.join(directory, os.path.basename(path))
+    shutil.copyfile(path, copy)
+    return copy
+
+
+def measure(fn, repeat, setup=None):
+    """Time `fn` `repeat` times and return summary statistics in milliseconds"""
+    timings = []
+    for i in range(repeat):
+        arguments = [setup(i)] if setup is not None else []
+        start = time.perf_counter()
+        fn(*arguments)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "runs": repeat,
+    }
+
+
+def benchmark_repository(path, repeat):
+    """Time the data paths behind the GUI actions, without Tk"""
+    repo = ApplicationRepository(path)
+    results = {}
+    # Repeated views would come from the query cache; the queries are timed
+    # without it, and the cache on its own below
+    repo.cache.max_bytes = 0
+    try:
+        # refresh_applications: first page of each sort, unfiltered and filtered
+        for sort in ["Date Applied", "Priority", "Salary"]:
+            results[f"refresh/{sort}"] = measure(lambda: repo.list_applications(sort=sort), repeat)
+            results[f"refresh/{sort}/Rejected"] = measure(
+                lambda: repo.list_applications(sort=sort, status="Rejected"), repeat)
+
+        # Scrolling: a page deep into the list through the keyset
+        page = repo.list_applications()
+        sort_key = repo.get_sort_key()
+        middle = repo.db.execute("SELECT date_applied, id FROM applications "
+                                 "ORDER BY date_applied DESC, id DESC LIMIT 1 OFFSET ?",
+                                 (repo.stats()["Total"] // 2,)).fetchone()
+        if page and middle:
+            results["scroll/next page"] = measure(
+                lambda: repo.list_applications(after=sort_key(page[-1])), repeat)
+            results["scroll/middle page"] = measure(
+                lambda: repo.list_applications(after=tuple(middle)), repeat)
+
+        # search_applications: typed searches, by date and by relevance
+        for term in SEARCHES:
+            results[f"search/{term}"] = measure(lambda: repo.list_applications(term), repeat)
+            results[f"search/{term}/Relevance"] = measure(
+                lambda: repo.list_applications(term, "Relevance"), repeat)
+        results["search/engineer/Applied"] = measure(
+            lambda: repo.list_applications("engineer", status="Applied"), repeat)
+        results["filter/salary >= 150k"] = measure(
+            lambda: repo.list_applications(salary_range=(150000, None)), repeat)
+
+        # Views served by the query cache: the same view again, and a sort
+        # toggle of a view read to the end
+        repo.cache.max_bytes = MAX_CACHE_BYTES
+        repo.list_applications()
+        results["cache/same view"] = measure(repo.list_applications, repeat)
+        term = SEARCHES[2]
+        toggled = (term, None, None, "Priority")
+        list(list_rows(repo, term, "Date Applied", None, None, None))
+
+        def forget_toggled(i):
+            # Each run re-sorts the view read to the end instead of finding the previous result
+            if toggled in repo.cache.views:
+                repo.cache.discard(toggled)
+
+        results[f"cache/{term}/sort toggle"] = measure(
+            lambda _: repo.list_applications(term, "Priority"), repeat, setup=forget_toggled)
+        repo.cache.max_bytes = 0
+
+        # update_stats
+        results["stats"] = measure(repo.stats, repeat)
+        results["stats/GROUP BY"] = measure(repo.count_statuses, repeat)
+
+        # Funnel analytics: the first full pass, then catching up on nothing new
+        results["funnel/first"] = measure(lambda: (repo.analytics.reset(), repo.funnel()), 1)
+        results["funnel/cached"] = measure(repo.funnel, repeat)
+
+        # export_to_csv: the full streaming export, uncompressed and gzip
+        with tempfile.TemporaryDirectory() as directory:
+            export_repeat = max(1, min(repeat, 3))
+            for name in ["export.csv", "export.jsonl.gz"]:
+                target = os.path.join(directory, name)
+                results[f"export/{name}"] = measure(lambda: export_applications(repo, target),
+                                                    export_repeat)
+
+        # Add and edit paths, each followed by the single-row re-read the GUI does
+        ids = [row[0] for row in repo.db.execute("SELECT id FROM applications ORDER BY random() LIMIT ?",
+                                                 (repeat,))]
+        fields = {"job_name": "Benchmark Engineer", "company": "Benchmark Co",
+                  "date_applied": "2026-01-01", "status": "Applied", "priority": "High"}
+        results["add"] = measure(lambda: repo.get_list_row(repo.add(fields)), repeat)
+        if ids:
+            def edit(app_id):
+                app = repo.get(app_id)
+                repo.update(app_id, dict(app._asdict(), status="Interviewed", salary="$1"))
+                repo.get_list_row(app_id)
+
+            results["edit"] = measure(edit, len(ids), setup=lambda i: ids[i])
+            results["set status"] = measure(lambda app_id: repo.set_status(app_id, STATUSES[3]),
+                                            len(ids), setup=lambda i: ids[i])
+    finally:
+        repo.close()
+    return results
+
+
+def start_virtual_display():
+    """Start Xvfb if there is no display; return (process, error)"""
+    if os.environ.get("DISPLAY"):
+        return None, None
+    if shutil.which("Xvfb") is None:
+        return None, "no display and Xvfb is not installed"
+    display = ":99"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x800x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    if process.poll() is not None:
+        return None, "Xvfb failed to start"
+    os.environ["DISPLAY"] = display
+    return process, None
+
+
+def wait_idle(app):
+    """Pump Tk events until the database worker has delivered every result"""
+    app.root.update()
+    while app.worker.pending:
+        app.root.update()
+        time.sleep(0.001)
+    app.root.update_idletasks()
+
+
+def benchmark_gui(path, repeat):
+    """Time GUI actions end to end, from the call until the list is drawn"""
+    from Jobs_tracker import JobTracker
+
+    app = JobTracker(path, started_at=time.perf_counter())
+    results = {}
+    try:
+        # From construction to the first screenful drawn (imports are already done)
+        while app.first_paint_ms is None:
+            app.root.update()
+            time.sleep(0.001)
+        first_paint_ms = round(app.first_paint_ms, 3)
+        results["gui/first_paint"] = {"median_ms": first_paint_ms, "min_ms": first_paint_ms,
+                                      "max_ms": first_paint_ms, "runs": 1}
+        wait_idle(app)
+
+        def refresh():
+            app.refresh_applications()
+            wait_idle(app)
+
+        def search(term):
+            app.search_entry.delete(0, "end")
+            app.search_entry.insert(0, term)
+            app.search_applications()
+            wait_idle(app)
+
+        def update_stats():
+            app.update_stats()
+            wait_idle(app)
+
+        def open_add_dialog():
+            app.open_add_dialog()
+            app.root.update_idletasks()
+            app.application_form.hide()
+
+        results["gui/refresh_applications"] = measure(refresh, repeat)
+        for term in SEARCHES:
+            results[f"gui/search_applications/{term}"] = measure(lambda: search(term), repeat)
+        search("")
+        results["gui/update_stats"] = measure(update_stats, repeat)
+        # The first open builds the dialog; later ones only refill it
+        results["gui/open_add_dialog/first"] = measure(open_add_dialog, 1)
+        results["gui/open_add_dialog"] = measure(open_add_dialog, repeat)
+    finally:
+        app.worker.close()
+        app.root.destroy()
+    return results
+
+
+def git_commit():
+    """Return the current commit hash and whether the tree has local changes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def run(sizes, repeat, gui, db_dir):
+    """Run the benchmarks and return the results document"""
+    commit, dirty = git_commit()
+    document = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": SEED,
+        "results": {},
+    }
+
+    display, display_error = start_virtual_display() if gui else (None, "disabled")
+    try:
+        for rows in sizes:
+            pristine = get_database(rows, db_dir)
+            print(f"Benchmarking {rows:,} applications...", flush=True)
+            with tempfile.TemporaryDirectory() as directory:
+                results = benchmark_repository(working_copy(pristine, directory), repeat)
+                if display_error is None:
+                    results.update(benchmark_gui(working_copy(pristine, directory), repeat))
+            document["results"][str(rows)] = results
+    finally:
+        if display is not None:
+            display.terminate()
+    if display_error is not None:
+        document["gui_skipped"] = display_error
+    return document
+
+
+def compare(baseline, current):
+    """Print the median of each benchmark in two result files side by side"""
+    print(f"{'benchmark':<45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for rows, results in current["results"].items():
+        base_results = baseline["results"].get(rows, {})
+        for name, stats in results.items():
+            base = base_results.get(name)
+            if base is None:
+                print(f"{rows + ' ' + name:<45} {'-':>12} {stats['median_ms']:>10.2f}ms")
+                continue
+            change = (stats["median_ms"] / base["median_ms"] - 1) * 100 if base["median_ms"] else 0
+            print(f"{rows + ' ' + name:<45} {base['median_ms']:>10.2f}ms "
+                  f"{stats['median_ms']:>10.2f}ms {change:>+7.0f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the job tracker on synthetic databases")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="numbers of applications to benchmark (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per benchmark (default: %(default)s)")
+    parser.add_argument("--no-gui", action="store_true", help="skip the GUI benchmarks")
+    parser.add_argument("--db-dir", default=DB_DIR, help="where generated databases are kept")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare the results with an earlier JSON file")
+    args = parser.parse_args(argv)
+
+    document = run(args.sizes, args.repeat, not args.no_gui, args.db_dir)
+    output = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), document)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
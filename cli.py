@@ -0,0 +1,283 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+from queries import SORT_OPTIONS
+from repository import PRIORITIES, STATUSES, ApplicationRepository, DuplicateError, ValidationError
+from salary import parse_salary
+
+# Columns of listed applications, with their width in the table format
+LIST_COLUMNS = [("id", 6), ("job_name", 32), ("company", 20), ("date_applied", 13),
+                ("status", 20), ("priority", 9), ("url", 0)]
+
+OUTPUT_FORMATS = ["table", "csv", "json"]
+
+
+class RowWriter:
+    """Writes rows to a stream as they come, as an aligned table, CSV or JSON Lines
+
+    The table format uses fixed column widths (0 means unbounded) and
+    truncates longer values, so that nothing has to be buffered.
+    """
+
+    def __init__(self, stream, fmt, columns):
+        self.stream = stream
+        self.fmt = fmt
+        self.columns = columns
+        self.csv_writer = csv.writer(stream) if fmt == "csv" else None
+        if fmt == "csv":
+            self.csv_writer.writerow(name for name, _ in columns)
+        elif fmt == "table":
+            self.write_table_row([name for name, _ in columns])
+
+    def write(self, values):
+        """Write one row, given its values in column order"""
+        if self.fmt == "csv":
+            self.csv_writer.writerow(values)
+        elif self.fmt == "json":
+            self.stream.write(json.dumps(dict(zip((name for name, _ in self.columns), values)),
+                                         ensure_ascii=False) + "\n")
+        else:
+            self.write_table_row(values)
+
+    def write_table_row(self, values):
+        """Write values padded or truncated to the column widths"""
+        cells = []
+        for (_, width), value in zip(self.columns, values):
+            text = "" if value is None else str(value)
+            if width:
+                text = text if len(text) < width else text[:width - 2] + "…"
+                text = text.ljust(width - 1)
+            cells.append(text)
+        self.stream.write(" ".join(cells).rstrip() + "\n")
+
+
+def list_rows(repo, search, sort, status, salary_range, limit):
+    """Yield list rows page by page, stopping after `limit` rows if given"""
+    sort_key = repo.get_sort_key(search, sort)
+    after = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page_size = 1000 if remaining is None else min(1000, remaining)
+        page = repo.list_applications(search, sort, status, after=after, limit=page_size,
+                                      salary_range=salary_range)
+        yield from page
+        if len(page) < page_size:
+            break
+        after = sort_key(page[-1])
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def command_list(repo, args):
+    """List (or search) applications"""
+    search = getattr(args, "term", "")
+    salary_range = (parse_salary(args.min_salary)[0] if args.min_salary else None,
+                    parse_salary(args.max_salary)[1] if args.max_salary else None)
+    columns = LIST_COLUMNS + ([("match", 0)] if search else [])
+    writer = RowWriter(sys.stdout, args.format, columns)
+    for app in list_rows(repo, search, SORT_OPTIONS[args.sort], args.status, salary_range, args.limit):
+        writer.write([getattr(app, name) for name, _ in columns])
+    return 0
+
+
+def command_add(repo, args):
+    """Add an application and print its id"""
+    fields = {"job_name": args.job_name, "company": args.company, "url": args.url,
+              "date_applied": args.date, "salary": args.salary, "status": args.status,
+              "recruiter_dm": args.recruiter, "team_member_dm": args.team_member,
+              "hiring_manager_dm": args.hiring_manager, "priority": args.priority,
+              "interview_date": args.interview_date}
+    try:
+        print(repo.add(fields, allow_duplicates=args.allow_duplicates))
+    except DuplicateError as e:
+        print("Not added, this looks like an application already tracked:", file=sys.stderr)
+        for duplicate in e.duplicates:
+            print(f"  {duplicate.id}: {duplicate.describe()}", file=sys.stderr)
+        print("Use --allow-duplicates to add it anyway.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_set_status(repo, args):
+    """Change the status of an application"""
+    if repo.get_status(args.id) is None:
+        print(f"No application with id {args.id}", file=sys.stderr)
+        return 1
+    repo.set_status(args.id, args.status)
+    return 0
+
+
+def command_attach(repo, args):
+    """Attach files to an application, or list its attachments"""
+    if repo.get_status(args.id) is None:
+        print(f"No application with id {args.id}", file=sys.stderr)
+        return 1
+    for path in args.paths:
+        try:
+            repo.add_attachment(args.id, path)
+        except OSError as e:
+            print(f"Could not attach {path}: {e}", file=sys.stderr)
+            return 1
+    writer = RowWriter(sys.stdout, args.format, [("id", 6), ("name", 40), ("size", 12), ("sha256", 0)])
+    for attachment in repo.list_attachments(args.id):
+        writer.write([attachment.id, attachment.name, attachment.size, attachment.sha256])
+    return 0
+
+
+def command_gc(repo, args):
+    """Delete stored attachment files no application refers to any more"""
+    result = repo.collect_garbage()
+    print(f"Removed {result.removed} unused files, freeing {result.freed_bytes} bytes.")
+    return 0
+
+
+def command_stats(repo, args):
+    """Print the number of applications per status"""
+    writer = RowWriter(sys.stdout, args.format, [("status", 20), ("count", 0)])
+    for status, count in repo.stats().items():
+        writer.write([status, count])
+    return 0
+
+
+def command_import(repo, args):
+    """Import a CSV or JSON Lines file"""
+    from importer import import_applications
+
+    result = import_applications(repo, args.path, upsert=args.upsert)
+    print(f"Added {result.inserted} and updated {result.updated} applications.")
+    if result.duplicates:
+        print(f"{result.duplicates} added applications look like ones already tracked.", file=sys.stderr)
+    for line, error in result.errors:
+        print(f"Line {line}: {error}", file=sys.stderr)
+    if result.skipped:
+        print(f"Skipped {result.skipped} invalid rows.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_ingest(repo, args):
+    """Add a directory of saved job postings as Pending applications"""
+    from ingest import ingest_postings
+
+    result = ingest_postings(repo, args.directory, workers=args.workers)
+    print(f"Added {result.inserted} postings; {result.already_ingested} files were already ingested.")
+    if result.duplicates:
+        print(f"{result.duplicates} added postings look like applications already tracked.", file=sys.stderr)
+    for path, error in result.errors:
+        print(f"{path}: {error}", file=sys.stderr)
+    if result.failed:
+        print(f"Could not read {result.failed} files.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_export(repo, args):
+    """Export every application to a CSV or JSON Lines file"""
+    from exporter import export_applications
+
+    count = export_applications(repo, args.path)
+    print(f"Exported {count} applications to {args.path}")
+    return 0
+
+
+def add_list_options(parser):
+    """Options shared by list and search"""
+    parser.add_argument("--status", choices=STATUSES, help="only applications with this status")
+    parser.add_argument("--sort", choices=list(SORT_OPTIONS), default="date",
+                        help="sort order, newest or highest first (default: date)")
+    parser.add_argument("--min-salary", help="minimum yearly salary, e.g. 80k")
+    parser.add_argument("--max-salary", help="maximum yearly salary, e.g. 120k")
+    parser.add_argument("--limit", type=int, help="print at most this many applications")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="table",
+                        help="output format; json writes one object per line (default: table)")
+
+
+def build_parser():
+    """Return the argument parser of every subcommand"""
+    parser = argparse.ArgumentParser(prog="jobs-tracker", description="Job Application Tracker from the command line")
+    parser.add_argument("--db", help="database file (default: $JOBS_TRACKER_DB, or job_tracker.db next to the program)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list applications")
+    add_list_options(list_parser)
+    list_parser.set_defaults(handler=command_list)
+
+    search_parser = commands.add_parser("search", help="search applications")
+    search_parser.add_argument("term", help="words to search for, matched as prefixes")
+    add_list_options(search_parser)
+    search_parser.set_defaults(handler=command_list)
+
+    add_parser = commands.add_parser("add", help="add an application and print its id")
+    add_parser.add_argument("--job-name", required=True)
+    add_parser.add_argument("--company", required=True)
+    add_parser.add_argument("--url")
+    add_parser.add_argument("--date", default="today", help="date applied, YYYY-MM-DD or 'today'")
+    add_parser.add_argument("--salary")
+    add_parser.add_argument("--status", choices=STATUSES, default="Pending")
+    add_parser.add_argument("--priority", choices=PRIORITIES, default="Medium")
+    add_parser.add_argument("--interview-date")
+    add_parser.add_argument("--recruiter")
+    add_parser.add_argument("--team-member")
+    add_parser.add_argument("--hiring-manager")
+    add_parser.add_argument("--allow-duplicates", action="store_true",
+                            help="add it even if it looks like an application already tracked")
+    add_parser.set_defaults(handler=command_add)
+
+    status_parser = commands.add_parser("set-status", help="change the status of an application")
+    status_parser.add_argument("id", type=int)
+    status_parser.add_argument("status", choices=STATUSES)
+    status_parser.set_defaults(handler=command_set_status)
+
+    attach_parser = commands.add_parser("attach", help="attach files (e.g. a customized CV) and list the attachments")
+    attach_parser.add_argument("id", type=int)
+    attach_parser.add_argument("paths", nargs="*", help="files to attach; without any, only list")
+    attach_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="table")
+    attach_parser.set_defaults(handler=command_attach)
+
+    gc_parser = commands.add_parser("gc", help="delete stored attachment files no application uses any more")
+    gc_parser.set_defaults(handler=command_gc)
+
+    stats_parser = commands.add_parser("stats", help="count applications per status")
+    stats_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="table")
+    stats_parser.set_defaults(handler=command_stats)
+
+    import_parser = commands.add_parser("import", help="import a CSV or JSON Lines file (optionally .gz)")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--upsert", action="store_true",
+                               help="update applications with the same job URL instead of adding them")
+    import_parser.set_defaults(handler=command_import)
+
+    ingest_parser = commands.add_parser("ingest", help="add saved job posting pages (HTML or JSON) as Pending")
+    ingest_parser.add_argument("directory")
+    ingest_parser.add_argument("--workers", type=int, help="parsing processes (default: one per CPU)")
+    ingest_parser.set_defaults(handler=command_ingest)
+
+    export_parser = commands.add_parser("export", help="export to a CSV or JSON Lines file (optionally .gz)")
+    export_parser.add_argument("path")
+    export_parser.set_defaults(handler=command_export)
+    return parser
+
+
+def main(argv=None):
+    """Run one command and return the exit status"""
+    args = build_parser().parse_args(argv)
+    repo = ApplicationRepository(args.db)
+    try:
+        return args.handler(repo, args)
+    except ValidationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); that is not an error, but
+        # flushing stdout at exit would fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        repo.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# conftest.py
+import os
+import tkinter
+
+import pytest
+
+from benchmark import start_virtual_display
+
+# Set to make GUI tests fail instead of skipping when no display can be had,
+# so that CI enforces them
+REQUIRE_GUI_ENV_VAR = "JOBS_TRACKER_REQUIRE_GUI_TESTS"
+
+
+def has_display():
+    """Return True if Tk can open a window here"""
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        return False
+    return True
+
+
+@pytest.fixture(scope="session")
+def display():
+    """Provide a display for Tk, starting Xvfb like the benchmark does when there is none"""
+    if has_display():
+        yield
+        return
+    previous = os.environ.get("DISPLAY")
+
+    def restore():
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if previous is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = previous
+
+    process, error = start_virtual_display()
+    if error is not None or not has_display():
+        restore()
+        message = error or "Tk could not open a window on the virtual display"
+        if os.environ.get(REQUIRE_GUI_ENV_VAR):
+            pytest.fail(f"{message}, and {REQUIRE_GUI_ENV_VAR} is set")
+        pytest.skip(message)
+    yield
+    restore()
@@ -0,0 +1,228 @@
+import queue
+import threading
+
+from profiling import profiler
+from repository import ApplicationRepository
+
+# How often the Tk thread checks for finished requests while any are pending
+POLL_MS = 15
+
+
+def span_name(prefix, fn):
+    """Name a profiling span after the function it times, e.g. db JobTracker.update_stats.<lambda>"""
+    return f"{prefix} {getattr(fn, '__qualname__', repr(fn)).replace('.<locals>', '')}"
+
+
+class DatabaseRequest:
+    """A unit of database work submitted to the DatabaseWorker"""
+
+    def __init__(self, fn, on_done=None, on_error=None, key=None):
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.key = key
+        self.cancelled = False
+
+
+class DatabaseWorker:
+    """Runs repository calls on a dedicated thread with its own connection
+
+    Requests are functions taking the worker's ApplicationRepository. They
+    run one at a time, in submission order, and their results are handed
+    back to callbacks on the Tk thread by polling with root.after, so the
+    mainloop never waits on SQLite. Submitting a request with the same `key`
+    as an earlier one supersedes it: a queued request is dropped and a
+    running query is interrupted.
+    """
+
+    def __init__(self, root, path, on_busy=None):
+        self.root = root
+        self.path = path
+        self.on_busy = on_busy
+
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.latest = {}
+        self.pending = 0
+        self.poll_job = None
+
+        # The request being executed, guarded so that cancel() never
+        # interrupts a query belonging to a different request
+        self.lock = threading.Lock()
+        self.current = None
+        self.repo = None
+        self.startup_error = None
+
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="db-worker", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.startup_error is not None:
+            raise self.startup_error
+
+    def run(self):
+        """Worker thread: open the connection and execute requests until closed"""
+        try:
+            self.repo = ApplicationRepository(self.path)
+        except Exception as e:
+            self.startup_error = e
+            self.ready.set()
+            return
+        self.ready.set()
+
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            if request.cancelled:
+                self.results.put((request, None, None))
+                continue
+
+            with self.lock:
+                self.current = request
+            try:
+                with profiler.span(span_name("db", request.fn)):
+                    result, error = request.fn(self.repo), None
+            except Exception as e:
+                result, error = None, e
+                # Roll back whatever a failed or interrupted request left open
+                if self.repo.db.in_transaction:
+                    self.repo.db.rollback()
+            with self.lock:
+                self.current = None
+            self.results.put((request, result, error))
+
+        self.repo.close()
+
+    def submit(self, fn, on_done=None, on_error=None, key=None):
+        """Queue `fn(repo)`; its result goes to `on_done` and errors to `on_error`"""
+        request = DatabaseRequest(fn, on_done, on_error, key)
+        if key is not None:
+            self.cancel_key(key)
+            self.latest[key] = request
+
+        self.pending += 1
+        if self.pending == 1 and self.on_busy is not None:
+            self.on_busy(True)
+        self.requests.put(request)
+        if self.poll_job is None:
+            self.poll_job = self.root.after(POLL_MS, self.poll)
+        return request
+
+    def cancel(self, request):
+        """Drop a request, interrupting its query if it is already running"""
+        request.cancelled = True
+        with self.lock:
+            if self.current is request:
+                self.repo.db.interrupt()
+
+    def cancel_key(self, key):
+        """Cancel the latest request submitted with `key`, if still pending"""
+        request = self.latest.pop(key, None)
+        if request is not None:
+            self.cancel(request)
+
+    def poll(self):
+        """Tk thread: deliver finished requests to their callbacks"""
+        self.poll_job = None
+        while True:
+            try:
+                request, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if request.key is not None and self.latest.get(request.key) is request:
+                del self.latest[request.key]
+            if request.cancelled:
+                continue
+            if error is None:
+                if request.on_done is not None:
+                    request.on_done(result)
+            elif request.on_error is not None:
+                request.on_error(error)
+            else:
+                print(f"Database request failed: {error}")
+
+        # Callbacks may have submitted new requests and scheduled a poll already
+        if self.pending:
+            if self.poll_job is None:
+                self.poll_job = self.root.after(POLL_MS, self.poll)
+        elif self.on_busy is not None:
+            self.on_busy(False)
+
+    def close(self):
+        """Stop the worker thread after the queued requests and close its connection"""
+        self.requests.put(None)
+        self.thread.join(timeout=5)
+
+
+class BackgroundJob:
+    """Runs a long operation (export, import...) on its own thread and connection
+
+    `fn(repo, progress, cancel)` receives a fresh ApplicationRepository, a
+    `progress(done, total)` callback and a threading.Event set on cancel().
+    Progress is sampled on the Tk thread every PROGRESS_POLL_MS, so the job
+    can report as often as it likes; the result goes to `on_done`, and an
+    exception to `on_cancel` if the job was cancelled or `on_error` otherwise.
+    Running apart from the DatabaseWorker keeps the list responsive while
+    the job runs.
+    """
+
+    PROGRESS_POLL_MS = 100
+
+    def __init__(self, root, path, fn, on_progress=None, on_done=None, on_error=None,
+                 on_cancel=None):
+        self.root = root
+        self.path = path
+        self.fn = fn
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+
+        self.cancel_event = threading.Event()
+        self.progress = None
+        self.outcome = None
+        self.thread = threading.Thread(target=self.run, name="background-job", daemon=True)
+        self.thread.start()
+        self.root.after(self.PROGRESS_POLL_MS, self.poll)
+
+    def run(self):
+        """Job thread: run the operation with its own repository"""
+        try:
+            repo = ApplicationRepository(self.path)
+            try:
+                with profiler.span(span_name("job", self.fn)):
+                    self.outcome = (self.fn(repo, self.report, self.cancel_event), None)
+            finally:
+                repo.close()
+        except Exception as e:
+            self.outcome = (None, e)
+
+    def report(self, done, total):
+        """Job thread: record the latest progress"""
+        self.progress = (done, total)
+
+    def cancel(self):
+        """Ask the job to stop at its next checkpoint"""
+        self.cancel_event.set()
+
+    def poll(self):
+        """Tk thread: forward progress and, once finished, the outcome"""
+        if self.progress is not None and self.on_progress is not None:
+            self.on_progress(*self.progress)
+        if self.outcome is None:
+            self.root.after(self.PROGRESS_POLL_MS, self.poll)
+            return
+
+        result, error = self.outcome
+        if error is None:
+            if self.on_done is not None:
+                self.on_done(result)
+        elif self.cancel_event.is_set():
+            if self.on_cancel is not None:
+                self.on_cancel()
+        elif self.on_error is not None:
+            self.on_error(error)
+        else:
+            print(f"Background job failed: {error}")
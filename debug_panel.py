@@ -0,0 +1,65 @@
+import customtkinter as tk
+
+from profiling import profiler
+
+# How often the open panel re-reads the profiler
+REFRESH_MS = 1000
+
+
+class DebugPanel:
+    """Window showing profiler spans, slow queries and widget counts"""
+
+    def __init__(self, master):
+        self.refresh_job = None
+        self.window = tk.CTkToplevel(master)
+        self.window.title("Debug - Profiling")
+        self.window.geometry("900x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.text = tk.CTkTextbox(self.window, font=("Courier", 12), wrap="none")
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        button_frame = tk.CTkFrame(self.window)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        tk.CTkButton(button_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        tk.CTkButton(button_frame, text="Close", fg_color="gray",
+                     command=self.close).pack(side=tk.RIGHT, padx=5)
+
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the report and schedule the next update"""
+        spans, slow_queries = profiler.snapshot()
+        lines = [f"{'span':<55} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'last ms':>9}"]
+        for name, count, total_ms, max_ms, last_ms in spans:
+            lines.append(f"{name[:55]:<55} {count:>7} {total_ms:>10.1f} {total_ms / count:>9.2f} "
+                         f"{max_ms:>9.2f} {last_ms:>9.2f}")
+
+        lines.append("")
+        lines.append(f"Widgets created: {profiler.widgets_created}, destroyed: {profiler.widgets_destroyed}, "
+                     f"alive: {profiler.widgets_created - profiler.widgets_destroyed}")
+        if profiler.last_refresh_widgets is not None:
+            created, destroyed = profiler.last_refresh_widgets
+            lines.append(f"Last refresh: {created} widgets created, {destroyed} destroyed")
+
+        lines.append("")
+        lines.append(f"Slow queries (over {profiler.slow_query_ms:g} ms), newest first:")
+        for elapsed_ms, sql, plan in reversed(slow_queries):
+            lines.append(f"{elapsed_ms:.1f} ms  {sql}")
+            lines.extend("    " + line for line in plan.splitlines())
+
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+        self.refresh_job = self.window.after(REFRESH_MS, self.refresh)
+
+    def reset(self):
+        """Clear the accumulated timings"""
+        profiler.reset()
+
+    def close(self):
+        """Stop refreshing and close the window"""
+        if self.refresh_job is not None:
+            self.window.after_cancel(self.refresh_job)
+        self.window.destroy()
@@ -0,0 +1,95 @@
+import re
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from; dropping them
+# makes every shared copy of a posting's link compare equal
+TRACKING_PARAMETERS = {"gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid", "ref",
+                       "referrer", "source", "src", "trk", "trackingid", "refid", "gh_src",
+                       "lever-source", "lever-origin", "_hsenc", "_hsmi", "embed", "iis",
+                       "iisn", "from", "share"}
+TRACKING_PREFIXES = ("utm_", "trk_", "li_")
+
+# Legal-form words that do not distinguish companies ("Acme Inc." is "Acme")
+COMPANY_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+                    "company", "gmbh", "ag", "sa", "plc", "bv", "nv", "srl", "pty", "lp", "llp"}
+
+# Abbreviations spelled out in titles, so that "Sr. Data Eng" matches "Senior Data Engineer"
+TITLE_WORDS = {"sr": "senior", "snr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer",
+               "mgr": "manager", "dev": "developer", "swe": "software engineer", "ml": "machine learning",
+               "ai": "artificial intelligence", "assoc": "associate", "dir": "director",
+               "assc": "associate", "mgmt": "management", "ii": "2", "iii": "3", "iv": "4"}
+
+# Title similarity, from 0 to 1, at which two applications to the same
+# company are reported as likely duplicates
+FUZZY_THRESHOLD = 0.8
+
+# Applications of the same company compared with a new one, newest first;
+# bounds the cost of a check even for companies with many applications
+MAX_CANDIDATES = 500
+
+WORD = re.compile(r"\w+")
+
+
+class Duplicate(NamedTuple):
+    """An existing application that a new one seems to duplicate"""
+    id: int
+    job_name: str
+    company: str
+    date_applied: str
+    status: str
+    reason: str
+    score: float
+
+    def describe(self):
+        """Return a one-line description for warnings"""
+        return f"{self.job_name} at {self.company}, applied {self.date_applied} ({self.status}): {self.reason}"
+
+
+def canonical_url(url):
+    """Return a posting URL normalized for comparison, or None if there is none
+
+    The scheme, "www." and fragment are dropped, the host is lowercased,
+    tracking parameters are removed and the remaining ones sorted, so
+    "https://www.Acme.com/jobs/1/?utm_source=x#apply" and
+    "http://acme.com/jobs/1" give the same key.
+    """
+    url = (url or "").strip()
+    if not url:
+        return None
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in TRACKING_PARAMETERS
+                   and not name.lower().startswith(TRACKING_PREFIXES))
+    return urlunsplit(("", host, parts.path.rstrip("/"), urlencode(query), "")).lstrip("/")
+
+
+def company_key(company):
+    """Return a company name casefolded, without punctuation or legal-form words"""
+    words = WORD.findall((company or "").casefold())
+    significant = [word for word in words if word not in COMPANY_SUFFIXES]
+    return " ".join(significant or words) or None
+
+
+def title_key(title):
+    """Return a job title casefolded, without punctuation and with abbreviations spelled out"""
+    words = [TITLE_WORDS.get(word, word) for word in WORD.findall((title or "").casefold())]
+    return " ".join(words) or None
+
+
+def application_keys(url, company, title):
+    """Return the (url_key, company_key, title_key) stored with an application"""
+    return canonical_url(url), company_key(company), title_key(title)
+
+
+def title_similarity(a, b):
+    """Score how alike two title keys are, from 0 to 1, by the words they share"""
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
@@ -0,0 +1,96 @@
+import csv
+import gzip
+import io
+import json
+import os
+import secrets
+from contextlib import nullcontext
+
+# Exported columns, in file order, with the CSV header of each
+EXPORT_COLUMNS = ["job_name", "company", "date_applied", "status", "priority", "url", "salary",
+                  "recruiter_dm", "team_member_dm", "hiring_manager_dm", "created_at", "interview_date"]
+CSV_HEADER = ['Job Name', 'Company', 'Date Applied', 'Status', 'Priority',
+              'URL', 'Salary', 'Recruiter Contact', 'Team Member Contact',
+              'Hiring Manager Contact', 'Created At', 'Interview Date']
+
+# Export formats by file extension; a trailing .gz adds gzip compression
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Rows fetched from SQLite and written per batch
+BATCH_SIZE = 1000
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before it finishes"""
+
+
+def detect_format(path):
+    """Return (format, compressed) for an export path, based on its extension"""
+    name = path.lower()
+    compressed = name.endswith(".gz")
+    if compressed:
+        name = name[:-3]
+    fmt = FORMATS.get(os.path.splitext(name)[1], "csv")
+    return fmt, compressed
+
+
+def open_compressor(raw, compressed):
+    """Return a context writing to a binary file through gzip if requested, leaving the file open"""
+    return gzip.GzipFile(fileobj=raw, mode="wb") if compressed else nullcontext(raw)
+
+
+def export_applications(repo, path, fmt=None, compressed=None, progress=None, cancel=None):
+    """Stream every application to a CSV or JSON Lines file, returning the row count
+
+    Rows are read in batches from the cursor, so memory use does not grow
+    with the table. The file is written to a temporary name next to `path`,
+    synced to disk and only then renamed over it; a failed or cancelled
+    export (`cancel` is a threading.Event) leaves any existing file
+    untouched, and a crash never leaves a truncated one.
+    `progress(done, total)` is called after every batch.
+    """
+    detected_fmt, detected_compressed = detect_format(path)
+    fmt = fmt or detected_fmt
+    compressed = detected_compressed if compressed is None else compressed
+    total = repo.stats()["Total"]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(4)}.tmp")
+    exported = 0
+    try:
+        # Created like any new file, so the user's umask decides its permissions
+        with open(temp_path, "xb") as raw:
+            with open_compressor(raw, compressed) as binary:
+                output = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+                if fmt == "jsonl":
+                    def write_batch(batch):
+                        output.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n"
+                                          for row in batch)
+                else:
+                    writer = csv.writer(output)
+                    writer.writerow(CSV_HEADER)
+                    write_batch = writer.writerows
+
+                for batch in repo.iter_export_batches(BATCH_SIZE):
+                    if cancel is not None and cancel.is_set():
+                        raise ExportCancelled()
+                    write_batch(batch)
+                    exported += len(batch)
+                    if progress is not None:
+                        progress(exported, total)
+                output.flush()
+                # Closing the text layer would close the file before it is synced
+                output.detach()
+            # The data must be on disk before the rename makes it the export
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        # Overwriting an earlier export keeps its permissions
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return exported
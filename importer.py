@@ -0,0 +1,144 @@
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Tuple
+
+from exporter import CSV_HEADER, EXPORT_COLUMNS, detect_format
+from repository import STORED_COLUMNS, ValidationError, clean_fields
+
+# Column names accepted in CSV headers: the exported labels and the raw names
+HEADER_COLUMNS = dict(zip(CSV_HEADER, EXPORT_COLUMNS))
+HEADER_COLUMNS.update((column, column) for column in EXPORT_COLUMNS)
+
+# Rows validated and written per executemany call
+BATCH_SIZE = 5000
+
+# Invalid rows reported back in detail; the rest are only counted
+MAX_ERRORS = 100
+
+
+class ImportCancelled(Exception):
+    """Raised when an import is cancelled; nothing has been written"""
+
+
+class ImportResult(NamedTuple):
+    """Outcome of an import"""
+    inserted: int
+    updated: int
+    skipped: int
+    errors: List[Tuple[int, str]]
+    duplicates: int = 0
+
+
+def read_records(stream, fmt):
+    """Yield (line number, dict or None, error or None) for every record of a CSV or JSON Lines text stream
+
+    A JSON Lines record that is not valid JSON, or not an object, comes
+    back as an error for its line instead of stopping the import.
+    """
+    if fmt == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield line_number, record, None
+            else:
+                yield line_number, None, f"Expected a JSON object, not {type(record).__name__}"
+        return
+
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [HEADER_COLUMNS.get(name.strip()) for name in header]
+    for row in reader:
+        if any(row):
+            yield reader.line_num, {column: value for column, value in zip(columns, row) if column}, None
+
+
+def parse_created_at(value):
+    """Return an exported created_at in SQLite's UTC timestamp format, or None to stamp it now"""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        raise ValidationError(f"Created at must be text, not {type(value).__name__}")
+    try:
+        created_at = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValidationError("Please use YYYY-MM-DD HH:MM:SS format for created at!") from None
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def import_applications(repo, path, upsert=False, fmt=None, compressed=None,
+                        progress=None, cancel=None):
+    """Stream applications from a CSV or JSON Lines file into the database
+
+    Accepts the files written by exporter.export_applications. Every record
+    is validated like a new application from the GUI; invalid ones are
+    skipped and reported in the result. With `upsert`, a record whose URL
+    matches an existing application updates it instead of adding a
+    duplicate; added records that look like existing applications (same
+    posting URL, or company and title) are counted in the result. All rows
+    go in with batched executemany calls inside a single transaction, so a
+    failed or cancelled import (`cancel` is a threading.Event) writes
+    nothing. `progress(done, total)` reports bytes read from the file.
+    """
+    detected_fmt, detected_compressed = detect_format(path)
+    fmt = fmt or detected_fmt
+    compressed = detected_compressed if compressed is None else compressed
+    total = os.path.getsize(path)
+
+    inserted = updated = skipped = duplicates = 0
+    errors = []
+    with open(path, "rb") as raw:
+        binary = gzip.GzipFile(fileobj=raw) if compressed else raw
+        stream = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+        with repo.bulk_writes():
+            batch = []
+            for line_number, record, error in read_records(stream, fmt):
+                if error is None:
+                    try:
+                        fields = clean_fields(record)
+                        created_at = parse_created_at(record.get("created_at"))
+                    except ValidationError as e:
+                        error = str(e)
+                if error is not None:
+                    skipped += 1
+                    if len(errors) < MAX_ERRORS:
+                        errors.append((line_number, error))
+                    continue
+                batch.append([fields[name] for name in STORED_COLUMNS] + [created_at])
+
+                if len(batch) >= BATCH_SIZE:
+                    if cancel is not None and cancel.is_set():
+                        raise ImportCancelled()
+                    added, changed, repeated = repo.write_batch(batch, upsert)
+                    inserted += added
+                    updated += changed
+                    duplicates += repeated
+                    batch = []
+                    if progress is not None:
+                        progress(raw.tell(), total)
+
+            if batch:
+                added, changed, repeated = repo.write_batch(batch, upsert)
+                inserted += added
+                updated += changed
+                duplicates += repeated
+            if cancel is not None and cancel.is_set():
+                raise ImportCancelled()
+
+    if progress is not None:
+        progress(total, total)
+    return ImportResult(inserted, updated, skipped, errors, duplicates)
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import statistics
+import time
+from urllib.parse import urlsplit
+
+# Share of each kind of request in the mix; the rest are plain list pages
+SEARCH_SHARE = 0.2
+STATS_SHARE = 0.1
+GET_SHARE = 0.1
+WRITE_SHARE = 0.05
+
+SEARCHES = ["engineer", "data", "acme", "senior"]
+SORTS = ["date", "priority", "salary"]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection sending requests one at a time"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.etags = {}
+
+    async def request(self, method, path, body=None, revalidate=True):
+        """Send a request and return (status, JSON data or None)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", "Accept-Encoding: gzip",
+                   f"Content-Length: {len(payload)}"]
+        if revalidate and method == "GET" and path in self.etags:
+            headers.append(f"If-None-Match: {self.etags[path]}")
+        self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + payload)
+
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        data = await self.reader.readexactly(int(response_headers.get("content-length", 0)))
+        if "etag" in response_headers:
+            self.etags[path] = response_headers["etag"]
+        if response_headers.get("content-encoding") == "gzip":
+            data = gzip.decompress(data)
+        return status, json.loads(data) if data else None
+
+    def close(self):
+        """Close the connection"""
+        if self.writer is not None:
+            self.writer.close()
+
+
+def pick_request(app_ids):
+    """Return (method, path, body) of a random request from the mix"""
+    roll = random.random()
+    if roll < WRITE_SHARE and app_ids:
+        status = random.choice(["Applied", "Interview Scheduled", "Rejected"])
+        return "PUT", f"/applications/{random.choice(app_ids)}/status", {"status": status}
+    roll -= WRITE_SHARE
+    if roll < GET_SHARE and app_ids:
+        return "GET", f"/applications/{random.choice(app_ids)}", None
+    roll -= GET_SHARE
+    if roll < STATS_SHARE:
+        return "GET", "/stats", None
+    roll -= STATS_SHARE
+    if roll < SEARCH_SHARE:
+        return "GET", f"/applications?search={random.choice(SEARCHES)}&limit=50", None
+    return "GET", f"/applications?sort={random.choice(SORTS)}&limit=50", None
+
+
+async def worker(host, port, deadline, app_ids, latencies, statuses, revalidate):
+    """Send requests back to back on one connection until the deadline"""
+    client = Client(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = pick_request(app_ids)
+            start = time.perf_counter()
+            status, _ = await client.request(method, path, body, revalidate)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        client.close()
+
+
+async def run(url, concurrency, duration, revalidate):
+    """Run the load test and print throughput and latency percentiles"""
+    address = urlsplit(url)
+    host, port = address.hostname, address.port or 80
+
+    # Ids to read and update, from the first page
+    client = Client(host, port)
+    _, page = await client.request("GET", "/applications?limit=200", revalidate=False)
+    client.close()
+    app_ids = [item["id"] for item in page["items"]] if page else []
+
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(host, port, deadline, app_ids, latencies, statuses, revalidate)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+    print(f"{len(latencies):,} requests in {elapsed:.1f} s: {len(latencies) / elapsed:,.0f} requests/s "
+          f"with {concurrency} connections")
+    print(f"Latency ms: median {statistics.median(latencies):.1f}, p90 {percentile(0.9):.1f}, "
+          f"p99 {percentile(0.99):.1f}, max {latencies[-1]:.1f}")
+    print("Responses: " + ", ".join(f"{status}: {count:,}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for api_server.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="server address")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run")
+    parser.add_argument("--no-revalidate", action="store_true",
+                        help="never send If-None-Match, so every GET runs its query")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.duration, not args.no_revalidate))
@@ -0,0 +1,259 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Set to any value but "" or "0" to enable profiling without the --profile flag
+ENV_VAR = "JOBS_TRACKER_PROFILE"
+SLOW_QUERY_ENV_VAR = "JOBS_TRACKER_SLOW_QUERY_MS"
+
+# Statements taking longer than this are logged with their query plan
+SLOW_QUERY_MS = 50
+
+# The log is written beside the database: job_tracker.db logs to job_tracker_profile.log
+LOG_SUFFIX = "_profile.log"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+# Slow queries kept for the debug panel
+RECENT_SLOW_QUERIES = 20
+
+logger = logging.getLogger("jobs_tracker.profile")
+
+
+def log_file(db_path):
+    """Return the profiling log of a database, in the same directory whatever the working directory"""
+    return os.path.splitext(os.path.abspath(db_path))[0] + LOG_SUFFIX
+
+
+def enabled_by_env():
+    """Return True if the environment asks for profiling"""
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+class SpanStats:
+    """Accumulated timings of one kind of span"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def add(self, elapsed_ms):
+        """Account one more span"""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.last_ms = elapsed_ms
+
+
+class Profiler:
+    """Opt-in timing spans, slow-query log and widget counters
+
+    Disabled by default, in which case span() returns a shared no-op context
+    and connections are left untouched, so instrumented code costs nothing.
+    Spans may be recorded from any thread.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = SLOW_QUERY_MS
+        self.lock = threading.Lock()
+        self.spans = {}
+        self.slow_queries = deque(maxlen=RECENT_SLOW_QUERIES)
+        self.widgets_created = 0
+        self.widgets_destroyed = 0
+        self.widget_mark = (0, 0)
+        self.last_refresh_widgets = None
+
+    def enable(self, log_path, slow_query_ms=None):
+        """Turn profiling on, logging to a rotating file at `log_path`"""
+        if self.enabled:
+            return
+        self.enabled = True
+        if slow_query_ms is None:
+            slow_query_ms = float(os.environ.get(SLOW_QUERY_ENV_VAR, SLOW_QUERY_MS))
+        self.slow_query_ms = slow_query_ms
+
+        # Only loaded when profiling, as it pulls in socket and pickle
+        import logging.handlers
+        handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES,
+                                                       backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        count_widgets(self)
+        logger.info("Profiling enabled (slow queries over %s ms)", slow_query_ms)
+
+    def span(self, name):
+        """Return a context manager timing the enclosed block under `name`"""
+        if not self.enabled:
+            return nullcontext()
+        return self.timed(name)
+
+    @contextmanager
+    def timed(self, name):
+        """Time the enclosed block and record it under `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, elapsed_ms, log=True):
+        """Add one timing to the stats of `name`"""
+        with self.lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.add(elapsed_ms)
+        if log:
+            logger.debug("%s %.2f ms", name, elapsed_ms)
+
+    def record_query(self, db, sql, params, elapsed_ms):
+        """Account a SQL statement, logging it with its plan if it was slow"""
+        # Statements are too many to log one by one; their spans are enough
+        self.record("sql statement", elapsed_ms, log=False)
+        if elapsed_ms < self.slow_query_ms:
+            return
+        plan = explain(db, sql, params)
+        with self.lock:
+            self.slow_queries.append((elapsed_ms, " ".join(sql.split()), plan))
+        logger.warning("Slow query %.1f ms: %s\nParameters: %r\nPlan:\n%s",
+                       elapsed_ms, " ".join(sql.split()), params, plan)
+
+    def mark_widgets(self, label):
+        """Log the widgets created and destroyed since the previous mark"""
+        created = self.widgets_created - self.widget_mark[0]
+        destroyed = self.widgets_destroyed - self.widget_mark[1]
+        self.widget_mark = (self.widgets_created, self.widgets_destroyed)
+        if label == "refresh":
+            self.last_refresh_widgets = (created, destroyed)
+        logger.debug("%s: %d widgets created, %d destroyed", label, created, destroyed)
+
+    def snapshot(self):
+        """Return (span stats sorted by total time, recent slow queries) for display"""
+        with self.lock:
+            spans = sorted(((name, stats.count, stats.total_ms, stats.max_ms, stats.last_ms)
+                            for name, stats in self.spans.items()), key=lambda item: -item[2])
+            return spans, list(self.slow_queries)
+
+    def reset(self):
+        """Forget the accumulated timings"""
+        with self.lock:
+            self.spans.clear()
+            self.slow_queries.clear()
+
+
+def explain(db, sql, params):
+    """Return the EXPLAIN QUERY PLAN of a statement as indented text"""
+    if sql.lstrip().split(None, 1)[0].upper() not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+        return "(no plan)"
+    try:
+        rows = sqlite3.Connection.execute(db, f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    except sqlite3.Error as e:
+        return f"(plan unavailable: {e})"
+    depth = {0: 0}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, 0) + 1
+        lines.append("  " * depth[node] + detail)
+    return "\n".join(lines)
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor timing each statement from execute() until its rows are consumed"""
+
+    def execute(self, sql, params=()):
+        self.statement = (sql, params)
+        start = time.perf_counter()
+        super().execute(sql, params)
+        self.elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.description is None:
+            self.finish()
+        return self
+
+    def executemany(self, sql, rows):
+        start = time.perf_counter()
+        super().executemany(sql, rows)
+        profiler.record_query(self.connection, sql, (), (time.perf_counter() - start) * 1000)
+        self.statement = None
+        return self
+
+    def finish(self):
+        """Report the statement once, when its last row has been read"""
+        if getattr(self, "statement", None) is not None:
+            sql, params = self.statement
+            self.statement = None
+            profiler.record_query(self.connection, sql, params, self.elapsed_ms)
+
+    def fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        self.elapsed_ms += (time.perf_counter() - start) * 1000
+        return result
+
+    def __next__(self):
+        try:
+            return self.fetch(super().__next__)
+        except StopIteration:
+            self.finish()
+            raise
+
+    def fetchone(self):
+        row = self.fetch(super().fetchone)
+        self.finish()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self.fetch(super().fetchmany, size or self.arraysize)
+        if not rows:
+            self.finish()
+        return rows
+
+    def fetchall(self):
+        rows = self.fetch(super().fetchall)
+        self.finish()
+        return rows
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose statements go through ProfiledCursor"""
+
+    def execute(self, sql, params=()):
+        return self.cursor(ProfiledCursor).execute(sql, params)
+
+    def executemany(self, sql, rows):
+        return self.cursor(ProfiledCursor).executemany(sql, rows)
+
+
+def count_widgets(profiler):
+    """Count every Tk widget created and destroyed, including those inside CTk widgets"""
+    import tkinter
+
+    original_setup = tkinter.BaseWidget._setup
+    original_destroy = tkinter.BaseWidget.destroy
+
+    def setup(widget, *args, **kwargs):
+        profiler.widgets_created += 1
+        return original_setup(widget, *args, **kwargs)
+
+    def destroy(widget):
+        profiler.widgets_destroyed += 1
+        return original_destroy(widget)
+
+    tkinter.BaseWidget._setup = setup
+    tkinter.BaseWidget.destroy = destroy
+
+
+def connection_factory():
+    """Return the sqlite3 connection class to use: profiled when enabled"""
+    return ProfiledConnection if profiler.enabled else sqlite3.Connection
+
+
+# The process-wide profiler
+profiler = Profiler()
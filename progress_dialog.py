@@ -0,0 +1,52 @@
+import customtkinter as tk
+
+
+class ProgressDialog:
+    """Small window showing the progress of a background job, with a Cancel button"""
+
+    def __init__(self, master, title, on_cancel):
+        self.window = tk.CTkToplevel(master)
+        self.window.title(title)
+        self.window.geometry("400x160")
+        self.window.transient(master)
+        self.window.protocol("WM_DELETE_WINDOW", on_cancel)
+
+        # Title
+        title_label = tk.CTkLabel(self.window, text=title, font=("Arial", 16, "bold"))
+        title_label.pack(pady=10)
+
+        # Progress bar and counter
+        self.progress_bar = tk.CTkProgressBar(self.window, width=350)
+        self.progress_bar.pack(pady=5)
+        self.progress_bar.set(0)
+
+        self.progress_label = tk.CTkLabel(self.window, text="Starting...")
+        self.progress_label.pack(pady=5)
+
+        # Buttons
+        self.cancel_btn = tk.CTkButton(self.window, text="Cancel", fg_color="gray",
+                                       command=on_cancel)
+        self.cancel_btn.pack(pady=5)
+
+    def update(self, done, total):
+        """Show `done` out of `total` items processed"""
+        self.progress_bar.set(min(1, done / total) if total else 0)
+        if total:
+            self.progress_label.configure(text=f"{done:,} of {total:,}")
+        else:
+            self.progress_label.configure(text=f"{done:,}")
+
+    def update_fraction(self, done, total):
+        """Show progress as a percentage, for totals that are not item counts"""
+        fraction = min(1, done / total) if total else 0
+        self.progress_bar.set(fraction)
+        self.progress_label.configure(text=f"{fraction:.0%}")
+
+    def cancelling(self):
+        """Show that a cancel was requested and is being honored"""
+        self.progress_label.configure(text="Cancelling...")
+        self.cancel_btn.configure(state="disabled")
+
+    def close(self):
+        """Close the dialog"""
+        self.window.destroy()
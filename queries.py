@@ -0,0 +1,140 @@
+import re
+
+from schema import FTS_COLUMNS, ORDER_BY, PRIORITY_RANKS
+
+# Columns of a list row, in card order. `match` is the highlighted snippet of
+# the best matching field and `relevance` the negated bm25 score; both are
+# only meaningful while searching.
+LIST_COLUMNS = ("a.id, a.job_name, a.company, a.date_applied, a.status, a.url, a.priority, "
+                "NULL AS match, 0 AS relevance, a.salary_rank")
+SEARCH_COLUMNS = ("a.id, a.job_name, a.company, a.date_applied, a.status, a.url, a.priority, "
+                  "snippet(applications_fts, -1, '[', ']', '…', 8) AS match, "
+                  "-bm25(applications_fts, 10.0, 5.0, 1.0, 1.0, 1.0, 1.0, 1.0) AS relevance, "
+                  "a.salary_rank")
+
+# Search results can additionally be ordered by bm25 relevance
+RELEVANCE_ORDER_BY = "relevance DESC, id DESC"
+
+# Columns compared against the last row of a page for keyset pagination; they
+# match both the ORDER BY of each sort option and get_sort_key()
+KEYSET_COLUMNS = {
+    "Date Applied": "a.date_applied, a.id",
+    "Priority": "a.priority_rank, a.date_applied, a.id",
+    "Salary": "a.salary_rank, a.date_applied, a.id",
+    "Relevance": "relevance, a.id",
+}
+
+# Number of rows fetched per page
+PAGE_SIZE = 200
+
+# Sort options by the short names used on the command line and in the API
+SORT_OPTIONS = {"date": "Date Applied", "priority": "Priority", "salary": "Salary",
+                "relevance": "Relevance"}
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def has_fts(db):
+    """Return True if the database has the applications_fts search index"""
+    return db.execute("SELECT 1 FROM sqlite_master WHERE name = 'applications_fts'").fetchone() is not None
+
+
+def is_ranked(search, use_fts=True):
+    """Return True if a search produces bm25 relevance scores"""
+    return use_fts and bool(fts_query(search))
+
+
+def get_order_by(sort, ranked=False):
+    """Return the ORDER BY clause for a sort option"""
+    if sort == "Relevance":
+        return RELEVANCE_ORDER_BY if ranked else ORDER_BY["Date Applied"]
+    return ORDER_BY.get(sort, ORDER_BY["Date Applied"])
+
+
+def get_keyset_columns(sort, ranked=False):
+    """Return the columns of the keyset used to page through a sort option"""
+    if sort == "Relevance" and not ranked:
+        sort = "Date Applied"
+    return KEYSET_COLUMNS.get(sort, KEYSET_COLUMNS["Date Applied"])
+
+
+def get_sort_key(sort, ranked=False):
+    """Return a function giving the descending sort key of a list row"""
+    if sort == "Relevance" and ranked:
+        return lambda app: (app[8], app[0])
+    if sort == "Priority":
+        return lambda app: (PRIORITY_RANKS.get(app[6], 0), app[3], app[0])
+    if sort == "Salary":
+        return lambda app: (app[9], app[3], app[0])
+    return lambda app: (app[3], app[0])
+
+
+def build_list_query(search="", sort="Date Applied", use_fts=True, status=None,
+                     after=None, limit=None, app_id=None, salary_range=None):
+    """Return the SQL and parameters listing applications for a view
+
+    A view combines a search term, a status filter ("All" or None for every
+    status), a salary range and a sort option. `salary_range` is a (minimum,
+    maximum) pair of yearly amounts, either of which may be None; it keeps
+    applications whose salary range overlaps it, so ones without a parsed
+    salary are left out. Pages are fetched with keyset pagination:
+    `after` is the sort key (see get_sort_key) of the last row already
+    loaded, and only rows sorting after it are returned, so every page is an
+    index seek no matter how deep into the list it is.
+
+    With `app_id`, the query only returns that application, and only if it
+    belongs to the view; this is how single rows are re-read after a change.
+    """
+    query = fts_query(search) if use_fts else search.strip()
+    ranked = is_ranked(search, use_fts)
+    params = []
+
+    if not query:
+        sql = f"SELECT {LIST_COLUMNS} FROM applications AS a WHERE 1"
+    elif use_fts:
+        # CROSS JOIN keeps the full-text match as the outer loop, even when a
+        # status filter or keyset bound could otherwise drive the join
+        sql = (f"SELECT {SEARCH_COLUMNS} FROM applications_fts "
+               f"CROSS JOIN applications AS a ON a.id = applications_fts.rowid "
+               f"WHERE applications_fts MATCH ?")
+        params.append(query)
+    else:
+        # Without FTS5 fall back to substring matching on the same fields
+        pattern = f"%{query}%"
+        sql = (f"SELECT {LIST_COLUMNS} FROM applications AS a WHERE ("
+               + " OR ".join(f"a.{field} LIKE ?" for field in FTS_COLUMNS) + ")")
+        params.extend([pattern] * len(FTS_COLUMNS))
+
+    if status and status != "All":
+        sql += " AND a.status = ?"
+        params.append(status)
+
+    salary_min, salary_max = salary_range or (None, None)
+    if salary_min is not None:
+        # salary_rank is the indexed top of each range
+        sql += " AND a.salary_rank >= ?"
+        params.append(salary_min)
+    if salary_max is not None:
+        sql += " AND a.salary_min <= ?"
+        params.append(salary_max)
+
+    if app_id is not None:
+        sql += " AND applications_fts.rowid = ?" if ranked else " AND a.id = ?"
+        params.append(app_id)
+        return sql, params
+
+    if after is not None:
+        columns = get_keyset_columns(sort, ranked)
+        placeholders = ", ".join("?" * len(after))
+        sql += f" AND ({columns}) < ({placeholders})"
+        params.extend(after)
+
+    sql += f" ORDER BY {get_order_by(sort, ranked)}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
@@ -0,0 +1,126 @@
+import sys
+from collections import OrderedDict
+
+# Approximate memory the cached rows may take before the least recently used
+# views are dropped
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+# Rows measured to estimate the memory taken by a page
+SAMPLE_ROWS = 20
+
+
+def row_size(row):
+    """Return the approximate memory taken by a list row and its values"""
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+def rows_size(rows):
+    """Estimate the memory taken by list rows from an even sample of them"""
+    if not rows:
+        return 0
+    sample = rows[::max(1, len(rows) // SAMPLE_ROWS)]
+    return len(rows) * sum(map(row_size, sample)) // len(sample)
+
+
+class CachedView:
+    """The rows of one view read so far, in its order"""
+
+    def __init__(self, rows, complete, size=None):
+        self.rows = rows
+        # True when `rows` is every row of the view, not only its first pages
+        self.complete = complete
+        self.size = rows_size(rows) if size is None else size
+
+
+class QueryCache:
+    """In-memory LRU cache of list rows per view, valid for one database version
+
+    Views are keyed on (search, status, salary_range, sort). Each keeps the
+    rows read from its first page on, so the pages that follow are served
+    from memory too, and a view read to the end can be re-sorted in memory
+    for any other sort of the same filter. The whole cache is dropped as
+    soon as the version it was filled at changes.
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.views = OrderedDict()
+        self.size = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop every cached view"""
+        self.views.clear()
+        self.size = 0
+
+    def validate(self, version):
+        """Drop the cached views if the data changed since they were read"""
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def get(self, view, sort, sort_key, after, limit):
+        """Return the page of a view after the sort key `after`, or None if it is not cached"""
+        cached = self.views.get(view + (sort,)) or self.resort(view, sort, sort_key)
+        if cached is None:
+            self.misses += 1
+            return None
+        start = 0 if after is None else self.position(cached.rows, sort_key, after)
+        if start + limit > len(cached.rows) and not cached.complete:
+            self.misses += 1
+            return None
+        self.views.move_to_end(view + (sort,))
+        self.hits += 1
+        return cached.rows[start:start + limit]
+
+    def put(self, view, sort, sort_key, after, limit, rows):
+        """Remember a page just read from the database"""
+        key = view + (sort,)
+        cached = self.views.get(key)
+        if after is None:
+            if cached is not None:
+                self.discard(key)
+            self.store(key, CachedView(list(rows), len(rows) < limit))
+        elif cached is not None and cached.rows and sort_key(cached.rows[-1]) == after:
+            # Only a page following the rows cached so far extends them
+            self.discard(key)
+            cached.rows.extend(rows)
+            cached.complete = len(rows) < limit
+            cached.size += rows_size(rows)
+            self.store(key, cached)
+
+    def resort(self, view, sort, sort_key):
+        """Build a view from another sort of the same filter that was read to the end"""
+        for key, cached in self.views.items():
+            if key[:-1] == view and cached.complete:
+                # The rows are shared, but counting them again keeps the cap conservative
+                resorted = CachedView(sorted(cached.rows, key=sort_key, reverse=True), True, cached.size)
+                self.store(view + (sort,), resorted)
+                return resorted
+        return None
+
+    def position(self, rows, sort_key, after):
+        """Return the index of the first row sorting after the key `after`"""
+        low, high = 0, len(rows)
+        while low < high:
+            middle = (low + high) // 2
+            if sort_key(rows[middle]) < after:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def store(self, key, cached):
+        """Add a view as the most recently used, evicting the least recently used ones over the cap"""
+        if cached.size > self.max_bytes:
+            return
+        self.views[key] = cached
+        self.size += cached.size
+        while self.size > self.max_bytes:
+            self.discard(next(iter(self.views)))
+
+    def discard(self, key):
+        """Drop one view"""
+        self.size -= self.views.pop(key).size
@@ -0,0 +1,153 @@
+import heapq
+from datetime import date, datetime
+from typing import NamedTuple
+
+# Longest single wait of the scheduler, so that Tk timers stay small and
+# sleeps or clock changes are caught up on within this delay
+MAX_WAIT_MS = 6 * 60 * 60 * 1000
+
+
+class ReminderRule(NamedTuple):
+    """When to remind about applications in a given status
+
+    `due_sql` is a SQL expression over the applications table giving the
+    local Julian day the reminder is due; rows where it is NULL get none.
+    """
+    name: str
+    status: str
+    due_sql: str
+    message: str
+
+
+RULES = [
+    ReminderRule("follow-up", "Applied", "status_since + 14",
+                 "No news for {days} days about {job_name} at {company}. Follow up?"),
+    ReminderRule("pending", "Pending", "status_since + 7",
+                 "{job_name} at {company} has been pending for {days} days. Apply or withdraw?"),
+    ReminderRule("interview", "Interview Scheduled", "julianday(interview_date, '-1 day', '+9 hours')",
+                 "Interview for {job_name} at {company} tomorrow."),
+    ReminderRule("thank-you", "Interviewed", "status_since + 1",
+                 "Send a thank-you note for the {job_name} interview at {company}."),
+]
+RULES_BY_NAME = {rule.name: rule for rule in RULES}
+
+
+class Reminder(NamedTuple):
+    """A reminder about one application, ordered by due time"""
+    due: float
+    app_id: int
+    rule: str
+    job_name: str
+    company: str
+    since: float
+
+    def message(self):
+        """Return the text shown to the user"""
+        days = max(0, int(julian_now() - self.since))
+        return RULES_BY_NAME[self.rule].message.format(days=days, job_name=self.job_name,
+                                                       company=self.company)
+
+
+def julian_now():
+    """Return the current local time as a Julian day, like SQLite's julianday()"""
+    now = datetime.now()
+    seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+    return now.toordinal() + 1721424.5 + seconds / 86400
+
+
+def days_since(date_text):
+    """Return the number of days since a YYYY-MM-DD date, or None if it is not one"""
+    try:
+        return (date.today() - date.fromisoformat(date_text)).days
+    except (TypeError, ValueError):
+        return None
+
+
+def reminder_query(rule, app_id=None):
+    """Return the SQL and parameters listing the pending reminders of a rule"""
+    sql = f'''
+        SELECT {rule.due_sql}, id, ?, job_name, company, status_since
+        FROM applications AS a
+        WHERE status = ? AND {rule.due_sql} IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM dismissed_reminders AS d
+                          WHERE d.application_id = a.id AND d.rule = ? AND d.due = {rule.due_sql})
+    '''
+    params = [rule.name, rule.status, rule.name]
+    if app_id is not None:
+        sql += " AND id = ?"
+        params.append(app_id)
+    return sql, params
+
+
+class ReminderScheduler:
+    """Keeps upcoming reminders in a heap and wakes Tk only when the next is due
+
+    The heap is loaded once, then kept current by replace() and remove()
+    after each change to an application. Entries made obsolete by a change
+    stay in the heap and are skipped when they reach the top, so updates
+    never search the heap. Due reminders go to `on_due` in batches.
+    """
+
+    def __init__(self, root, on_due):
+        self.root = root
+        self.on_due = on_due
+        self.heap = []
+        # Reminders still valid per application, as (rule, due) pairs
+        self.current = {}
+        self.job = None
+        self.armed_for = None
+
+    def load(self, reminders):
+        """Replace every scheduled reminder"""
+        self.heap = list(reminders)
+        heapq.heapify(self.heap)
+        self.current = {}
+        for reminder in reminders:
+            self.current.setdefault(reminder.app_id, set()).add((reminder.rule, reminder.due))
+        self.arm()
+
+    def replace(self, app_id, reminders):
+        """Schedule the new reminders of one application, dropping its old ones"""
+        self.current[app_id] = {(reminder.rule, reminder.due) for reminder in reminders}
+        for reminder in reminders:
+            heapq.heappush(self.heap, reminder)
+        self.arm()
+
+    def remove(self, app_id):
+        """Drop the reminders of a deleted application"""
+        self.current.pop(app_id, None)
+        self.arm()
+
+    def is_current(self, reminder):
+        """Return True if a heap entry has not been made obsolete by a change"""
+        return (reminder.rule, reminder.due) in self.current.get(reminder.app_id, ())
+
+    def arm(self):
+        """Set the Tk timer for the earliest valid reminder"""
+        while self.heap and not self.is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+        due = self.heap[0].due if self.heap else None
+        if due == self.armed_for and self.job is not None:
+            return
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.armed_for = due
+        if due is not None:
+            delay = int((due - julian_now()) * 86400 * 1000)
+            self.job = self.root.after(min(max(delay, 0), MAX_WAIT_MS), self.fire)
+
+    def fire(self):
+        """Deliver every reminder that is due, then wait for the next one"""
+        self.job = None
+        self.armed_for = None
+        now = julian_now()
+        due = []
+        while self.heap and self.heap[0].due <= now:
+            reminder = heapq.heappop(self.heap)
+            if self.is_current(reminder):
+                self.current[reminder.app_id].discard((reminder.rule, reminder.due))
+                due.append(reminder)
+        if due:
+            self.on_due(due)
+        self.arm()
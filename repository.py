@@ -0,0 +1,727 @@
+import functools
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional
+
+from analytics import FunnelAnalytics
+from attachments import GC_GRACE_SECONDS, Attachment, BlobStore, store_dir
+from dedup import FUZZY_THRESHOLD, MAX_CANDIDATES, Duplicate, application_keys, title_similarity
+from profiling import connection_factory
+from queries import PAGE_SIZE, build_list_query, get_sort_key, has_fts, is_ranked
+from query_cache import QueryCache
+from reminders import RULES, Reminder, reminder_query
+from salary import parse_salary
+from schema import migrate, rebuild_status_counts, restore_insert_triggers, suspend_insert_triggers
+
+# Status and priority choices offered by the GUI
+STATUSES = ["Pending", "Applied", "Interview Scheduled", "Interviewed",
+            "Offer Received", "Rejected", "Withdrawn"]
+PRIORITIES = ["Low", "Medium", "High"]
+
+# Editable fields of an application, in the order used by INSERT and UPDATE
+FIELDS = ["job_name", "url", "company", "date_applied", "salary", "status",
+          "recruiter_dm", "team_member_dm", "hiring_manager_dm", "priority", "interview_date"]
+
+# Columns derived from the salary text when an application is written
+SALARY_COLUMNS = ["salary_min", "salary_max", "currency"]
+
+# Columns written by add, update and imports
+STORED_COLUMNS = FIELDS + SALARY_COLUMNS
+
+# Positions in STORED_COLUMNS of the fields duplicate postings are detected by
+URL_INDEX = STORED_COLUMNS.index("url")
+COMPANY_INDEX = STORED_COLUMNS.index("company")
+JOB_NAME_INDEX = STORED_COLUMNS.index("job_name")
+
+# Columns of a full Application record
+APPLICATION_COLUMNS = "id, " + ", ".join(FIELDS) + ", created_at, " + ", ".join(SALARY_COLUMNS) + ", version"
+
+# Columns of an Attachment record
+ATTACHMENT_COLUMNS = "id, application_id, sha256, name, size, added_at"
+
+# The database file is named by this environment variable or, by default,
+# lives next to the program rather than in the working directory
+DB_PATH_ENV_VAR = "JOBS_TRACKER_DB"
+DB_FILE_NAME = "job_tracker.db"
+
+# How long a connection waits for another process to release the database
+# lock, and how often a write that still finds it locked is retried
+BUSY_TIMEOUT_ENV_VAR = "JOBS_TRACKER_BUSY_TIMEOUT_MS"
+BUSY_TIMEOUT_MS = 5000
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.1
+
+# Number of prepared statements kept by each connection
+STATEMENT_CACHE_SIZE = 256
+
+# Zero-padded YYYY-MM-DD, the usual shape of stored and imported dates
+ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# Bound parameters per IN (...) lookup, well under SQLite's variable limit
+LOOKUP_CHUNK = 500
+
+
+class ValidationError(ValueError):
+    """Raised when application fields are missing or malformed"""
+
+
+class ConflictError(Exception):
+    """Raised when saving an application that was changed elsewhere since it was read"""
+
+
+class DuplicateError(Exception):
+    """Raised when adding an application that looks like one already tracked"""
+
+    def __init__(self, duplicates):
+        super().__init__("This application looks like one already tracked.")
+        self.duplicates = duplicates
+
+
+class ApplicationSummary(NamedTuple):
+    """One row of the applications list"""
+    id: int
+    job_name: str
+    company: str
+    date_applied: str
+    status: str
+    url: Optional[str]
+    priority: Optional[str]
+    match: Optional[str] = None
+    relevance: float = 0
+    salary_rank: int = 0
+
+
+class Application(NamedTuple):
+    """A complete application record"""
+    id: int
+    job_name: str
+    url: Optional[str]
+    company: str
+    date_applied: str
+    salary: Optional[str]
+    status: str
+    recruiter_dm: Optional[str]
+    team_member_dm: Optional[str]
+    hiring_manager_dm: Optional[str]
+    priority: Optional[str]
+    interview_date: Optional[str]
+    created_at: Optional[str]
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    currency: Optional[str] = None
+    version: int = 0
+
+
+class BulkChange(NamedTuple):
+    """What a bulk action changed, as needed to undo it
+
+    `rows` hold the previous values of `columns` (id first) of every
+    application touched; a "delete" keeps whole rows to insert back, and
+    the attachment rows deleted with them.
+    """
+    action: str
+    columns: List[str]
+    rows: List[tuple]
+    attachments: List[tuple] = []
+
+
+def default_db_path():
+    """Return the database path from the environment, or the one next to the program"""
+    return os.environ.get(DB_PATH_ENV_VAR) or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           DB_FILE_NAME)
+
+
+def busy_timeout_ms():
+    """Return the lock wait configured in the environment, or the default"""
+    return float(os.environ.get(BUSY_TIMEOUT_ENV_VAR, BUSY_TIMEOUT_MS))
+
+
+def is_locked(error):
+    """Return True if a SQLite error means another connection holds a lock"""
+    return (getattr(error, "sqlite_errorcode", 0) & 0xff) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def retry_when_locked(write):
+    """Retry a write transaction that failed because the database stayed locked
+
+    The busy timeout already waits for the lock; this covers what it cannot,
+    such as a timeout under heavy contention. The failed transaction has been
+    rolled back, so it is simply run again after a growing delay.
+    """
+    @functools.wraps(write)
+    def retrying(self, *args, **kwargs):
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                return write(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not is_locked(e) or attempt == WRITE_ATTEMPTS - 1 or self.db.in_transaction:
+                    raise
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+    return retrying
+
+
+def parse_date(date_text):
+    """Return a YYYY-MM-DD date from user input, accepting 'today'"""
+    date_text = (date_text or "").strip()
+    if date_text.lower() == "today":
+        return datetime.now().strftime("%Y-%m-%d")
+    try:
+        # Fast path for well-formed dates, which bulk imports parse by the thousand
+        if ISO_DATE.fullmatch(date_text):
+            date.fromisoformat(date_text)
+        else:
+            datetime.strptime(date_text, "%Y-%m-%d")
+    except ValueError:
+        raise ValidationError("Please use YYYY-MM-DD format for date!") from None
+    return date_text
+
+
+def clean_fields(fields):
+    """Validate application fields and return them normalized"""
+    cleaned = {name: fields.get(name) for name in FIELDS}
+    for name, value in cleaned.items():
+        # Imported and API records may hold numbers, e.g. a salary of 90000
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if isinstance(value, str):
+            cleaned[name] = value.strip()
+        elif value is not None:
+            raise ValidationError(f"{name.replace('_', ' ').capitalize()} must be text, not {type(value).__name__}")
+
+    if not cleaned["job_name"] or not cleaned["company"]:
+        raise ValidationError("Job title and company are required!")
+    cleaned["date_applied"] = parse_date(cleaned["date_applied"])
+    # The interview date is optional
+    if cleaned["interview_date"]:
+        cleaned["interview_date"] = parse_date(cleaned["interview_date"])
+    else:
+        cleaned["interview_date"] = None
+    cleaned["status"] = cleaned["status"] or "Pending"
+    cleaned["priority"] = cleaned["priority"] or "Medium"
+    cleaned["salary_min"], cleaned["salary_max"], cleaned["currency"] = parse_salary(cleaned["salary"])
+    return cleaned
+
+
+def connect(path, check_same_thread=True):
+    """Open a tuned connection to a tracker database and migrate its schema"""
+    db = sqlite3.connect(path, timeout=busy_timeout_ms() / 1000, cached_statements=STATEMENT_CACHE_SIZE,
+                         factory=connection_factory(), check_same_thread=check_same_thread)
+    # WAL lets readers run alongside a writer; NORMAL sync is durable in WAL mode
+    # except for the very last transactions on power loss
+    for attempt in range(WRITE_ATTEMPTS):
+        try:
+            db.execute("PRAGMA journal_mode = WAL")
+            break
+        except sqlite3.OperationalError as e:
+            # Switching a new database to WAL fails at once, without the busy
+            # timeout, while another process opening it switches it too
+            if not is_locked(e) or attempt == WRITE_ATTEMPTS - 1:
+                raise
+            time.sleep(RETRY_DELAY * 2 ** attempt)
+    db.execute("PRAGMA synchronous = NORMAL")
+    db.execute("PRAGMA foreign_keys = ON")
+    migrate(db)
+    return db
+
+
+class ApplicationRepository:
+    """Data access for job applications, independent of the GUI"""
+
+    def __init__(self, path=None, check_same_thread=True):
+        self.path = path or default_db_path()
+        # Pass check_same_thread=False only if the caller serializes all use
+        # of the repository and may close it from another thread
+        self.db = connect(self.path, check_same_thread)
+        self.use_fts = has_fts(self.db)
+        self.analytics = FunnelAnalytics()
+        self.cache = QueryCache()
+        self.blobs = BlobStore(store_dir(self.path))
+        # Insert triggers suspended by bulk_writes(), caught up after each write_batch()
+        self.suspended = None
+
+    def close(self):
+        """Close the database connection"""
+        self.db.close()
+
+    # Reads
+
+    def get_sort_key(self, search="", sort="Date Applied"):
+        """Return the function giving the sort key of list rows for a view"""
+        return get_sort_key(sort, is_ranked(search, self.use_fts))
+
+    def list_applications(self, search="", sort="Date Applied", status=None,
+                          after=None, limit=PAGE_SIZE, salary_range=None):
+        """Return one page of list rows for a view, after the sort key `after`
+
+        Pages come from the query cache while the data is unchanged, so
+        going back to a view, or toggling its sort, does not query again.
+        """
+        view = (search, status, salary_range)
+        # Keys decoded from API cursors come as lists
+        after = tuple(after) if after is not None else None
+        sort_key = self.get_sort_key(search, sort)
+        self.cache.validate(self.cache_version())
+        rows = self.cache.get(view, sort, sort_key, after, limit)
+        if rows is not None:
+            return rows
+        sql, params = build_list_query(search, sort, self.use_fts, status, after=after, limit=limit,
+                                       salary_range=salary_range)
+        rows = [ApplicationSummary._make(row) for row in self.db.execute(sql, params)]
+        self.cache.put(view, sort, sort_key, after, limit, rows)
+        return rows
+
+    def get_list_row(self, app_id, search="", status=None, salary_range=None):
+        """Return the list row of an application, or None if it is not in the view"""
+        sql, params = build_list_query(search, use_fts=self.use_fts, status=status, app_id=app_id,
+                                       salary_range=salary_range)
+        row = self.db.execute(sql, params).fetchone()
+        return ApplicationSummary._make(row) if row else None
+
+    def list_application_ids(self, search="", status=None, salary_range=None):
+        """Return the ids of every application in a view, for selecting them all"""
+        sql, params = build_list_query(search, use_fts=self.use_fts, status=status, salary_range=salary_range)
+        return [app_id for app_id, in self.db.execute(f"SELECT id FROM ({sql})", params)]
+
+    def read_rows(self, app_ids, columns):
+        """Return (id, columns...) tuples of the given applications that exist"""
+        rows = []
+        for start in range(0, len(app_ids), LOOKUP_CHUNK):
+            chunk = app_ids[start:start + LOOKUP_CHUNK]
+            rows.extend(self.db.execute(f"SELECT id, {', '.join(columns)} FROM applications "
+                                        f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return rows
+
+    def read_attachments(self, app_ids):
+        """Return the attachment rows of the given applications"""
+        rows = []
+        for start in range(0, len(app_ids), LOOKUP_CHUNK):
+            chunk = app_ids[start:start + LOOKUP_CHUNK]
+            rows.extend(self.db.execute(f"SELECT {ATTACHMENT_COLUMNS} FROM attachments "
+                                        f"WHERE application_id IN ({', '.join('?' * len(chunk))})", chunk))
+        return rows
+
+    def list_attachments(self, app_id):
+        """Return the attachments of an application, oldest first; their content is not read"""
+        return [Attachment._make(row) for row in self.db.execute(
+            f"SELECT {ATTACHMENT_COLUMNS} FROM attachments WHERE application_id = ? ORDER BY id", (app_id,))]
+
+    def attachment_path(self, attachment):
+        """Return the file holding an attachment's content"""
+        return self.blobs.path(attachment.sha256)
+
+    def get(self, app_id):
+        """Return a full application record, or None if it does not exist"""
+        row = self.db.execute(f"SELECT {APPLICATION_COLUMNS} FROM applications WHERE id = ?",
+                              (app_id,)).fetchone()
+        return Application._make(row) if row else None
+
+    def get_status(self, app_id):
+        """Return the status of an application, or None if it does not exist"""
+        row = self.db.execute("SELECT status FROM applications WHERE id = ?", (app_id,)).fetchone()
+        return row[0] if row else None
+
+    def status_counts(self):
+        """Return the number of applications per status from the summary table"""
+        return dict(self.db.execute("SELECT status, count FROM status_counts WHERE count > 0"))
+
+    def count_statuses(self):
+        """Count applications per status with a single pass over the status index"""
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM applications GROUP BY status"))
+
+    def verify_status_counts(self):
+        """Check the summary table against a fresh count, repairing it if needed
+
+        Returns True if the table was already exact.
+        """
+        if self.status_counts() == self.count_statuses():
+            return True
+        with self.db:
+            rebuild_status_counts(self.db)
+        return False
+
+    def stats(self):
+        """Return the total and the count of every status, for the stats bar"""
+        counts = self.status_counts()
+        stats = {"Total": sum(counts.values())}
+        for status in STATUSES:
+            stats[status] = counts.pop(status, 0)
+        # Statuses outside the standard list (e.g. from imports) are still shown
+        stats.update(sorted(counts.items()))
+        return stats
+
+    def find_url_keys(self, url_keys):
+        """Return {url_key: [id, STORED_COLUMNS values...]} for the given canonical URLs in use"""
+        found = {}
+        for start in range(0, len(url_keys), LOOKUP_CHUNK):
+            chunk = url_keys[start:start + LOOKUP_CHUNK]
+            for row in self.db.execute(f"SELECT k.url_key, a.id, {', '.join('a.' + name for name in STORED_COLUMNS)} "
+                                       f"FROM posting_keys AS k JOIN applications AS a ON a.id = k.application_id "
+                                       f"WHERE k.url_key IN ({', '.join('?' * len(chunk))})", chunk):
+                found[row[0]] = list(row[1:])
+        return found
+
+    def find_name_keys(self, name_keys):
+        """Return the set of (company_key, title_key) pairs among `name_keys` already in use"""
+        found = set()
+        for start in range(0, len(name_keys), LOOKUP_CHUNK // 2):
+            chunk = name_keys[start:start + LOOKUP_CHUNK // 2]
+            found.update(self.db.execute(
+                f"SELECT company_key, title_key FROM posting_keys WHERE (company_key, title_key) "
+                f"IN (VALUES {', '.join(['(?, ?)'] * len(chunk))})", [key for pair in chunk for key in pair]))
+        return found
+
+    def ingested_digests(self):
+        """Return the content hashes of every file ingested so far"""
+        return frozenset(digest for digest, in self.db.execute("SELECT sha256 FROM ingested_files"))
+
+    def find_ingested(self, digests):
+        """Return the set of file content hashes among `digests` already ingested"""
+        found = set()
+        for start in range(0, len(digests), LOOKUP_CHUNK):
+            chunk = digests[start:start + LOOKUP_CHUNK]
+            found.update(digest for digest, in self.db.execute(
+                f"SELECT sha256 FROM ingested_files WHERE sha256 IN ({', '.join('?' * len(chunk))})", chunk))
+        return found
+
+    def find_duplicates(self, fields, exclude_id=None):
+        """Return the applications that `fields` seem to duplicate, closest first
+
+        An application matches on the same posting URL once normalized, or
+        on the same company with a similar title. Titles are only compared
+        within the company (its newest MAX_CANDIDATES applications), so the
+        check stays an index lookup however large the table grows.
+        """
+        url_key, company, title = application_keys(fields.get("url"), fields.get("company"),
+                                                   fields.get("job_name"))
+        columns = "a.id, a.job_name, a.company, a.date_applied, a.status"
+        found = {}
+        if url_key:
+            for row in self.db.execute(f"SELECT {columns} FROM posting_keys AS k "
+                                       f"JOIN applications AS a ON a.id = k.application_id "
+                                       f"WHERE k.url_key = ?", (url_key,)):
+                found[row[0]] = Duplicate(*row, "same job posting", 1.0)
+        if company and title:
+            for row in self.db.execute(f"SELECT {columns}, k.title_key FROM posting_keys AS k "
+                                       f"JOIN applications AS a ON a.id = k.application_id "
+                                       f"WHERE k.company_key = ? ORDER BY k.application_id DESC LIMIT ?",
+                                       (company, MAX_CANDIDATES)):
+                score = 1.0 if row[5] == title else title_similarity(title, row[5] or "")
+                if row[0] not in found and score >= FUZZY_THRESHOLD:
+                    reason = "same title and company" if score == 1.0 else "similar title at the same company"
+                    found[row[0]] = Duplicate(*row[:5], reason, round(score, 2))
+        found.pop(exclude_id, None)
+        return sorted(found.values(), key=lambda duplicate: -duplicate.score)
+
+    def load_reminders(self, app_id=None):
+        """Return the reminders not yet dismissed, for every application or just one"""
+        reminders = []
+        for rule in RULES:
+            sql, params = reminder_query(rule, app_id)
+            reminders.extend(Reminder._make(row) for row in self.db.execute(sql, params))
+        return reminders
+
+    def data_version(self):
+        """Return a number that changes whenever another connection commits"""
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def cache_version(self):
+        """Return what the query cache is valid for: commits by other connections and rows changed by this one"""
+        return self.data_version(), self.db.total_changes
+
+    def funnel(self):
+        """Return the funnel report, folding in status changes since the last call"""
+        return self.analytics.update(self.db)
+
+    def iter_export_batches(self, batch_size=1000):
+        """Yield lists of applications in export column order, newest first"""
+        cursor = self.db.execute('''
+            SELECT job_name, company, date_applied, status, priority, url, salary,
+                   recruiter_dm, team_member_dm, hiring_manager_dm, created_at, interview_date
+            FROM applications ORDER BY date_applied DESC, id DESC
+        ''')
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+
+    # Writes
+
+    @retry_when_locked
+    def add(self, fields, allow_duplicates=True):
+        """Validate and insert an application, returning its id
+
+        Unless `allow_duplicates`, DuplicateError is raised instead when the
+        application looks like one already tracked (see find_duplicates).
+        """
+        cleaned = clean_fields(fields)
+        with self.db:
+            if not allow_duplicates:
+                duplicates = self.find_duplicates(cleaned)
+                if duplicates:
+                    raise DuplicateError(duplicates)
+            cursor = self.db.execute(f'''
+                INSERT INTO applications ({", ".join(STORED_COLUMNS)})
+                VALUES ({", ".join("?" * len(STORED_COLUMNS))})
+            ''', [cleaned[name] for name in STORED_COLUMNS])
+            self.save_keys([(cursor.lastrowid, cleaned["url"], cleaned["company"], cleaned["job_name"])])
+        return cursor.lastrowid
+
+    @retry_when_locked
+    def update(self, app_id, fields, expected_version=None):
+        """Validate and save every field of an existing application
+
+        With `expected_version` (the version the fields were read at), the
+        save is refused with ConflictError if the application was written
+        since, so that stale values never overwrite someone else's change.
+        """
+        cleaned = clean_fields(fields)
+        assignments = ", ".join(f"{name} = ?" for name in STORED_COLUMNS)
+        sql = f"UPDATE applications SET {assignments}, version = version + 1 WHERE id = ?"
+        params = [cleaned[name] for name in STORED_COLUMNS] + [app_id]
+        if expected_version is not None:
+            sql += " AND version = ?"
+            params.append(expected_version)
+        with self.db:
+            cursor = self.db.execute(sql, params)
+            if cursor.rowcount:
+                self.save_keys([(app_id, cleaned["url"], cleaned["company"], cleaned["job_name"])])
+        if cursor.rowcount == 0 and expected_version is not None and self.get_status(app_id) is not None:
+            raise ConflictError("This application was changed elsewhere since it was opened.")
+
+    @retry_when_locked
+    def set_status(self, app_id, status):
+        """Change the status of an application"""
+        with self.db:
+            self.db.execute("UPDATE applications SET status = ?, version = version + 1 WHERE id = ?",
+                            (status, app_id))
+
+    def save_keys(self, applications):
+        """Store the duplicate-detection keys of written (id, url, company, job_name) rows"""
+        self.db.executemany("INSERT OR REPLACE INTO posting_keys VALUES (?, ?, ?, ?)",
+                            [(app_id,) + application_keys(url, company, job_name)
+                             for app_id, url, company, job_name in applications])
+
+    @contextmanager
+    def bulk_writes(self):
+        """Run many write_batch() calls as one transaction, rolled back on error
+
+        The per-row triggers maintaining the search index and status counts
+        on insert are suspended meanwhile and caught up in one set-based pass
+        over the new rows of each batch, which more than halves the time of a
+        large import.
+        """
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.suspended = suspend_insert_triggers(self.db)
+            yield
+            restore_insert_triggers(self.db, self.suspended)
+            self.db.commit()
+        except BaseException:
+            self.db.rollback()
+            raise
+        finally:
+            self.suspended = None
+
+    def write_batch(self, rows, upsert=False):
+        """Insert validated rows (STORED_COLUMNS values, then created_at or None)
+
+        With `upsert`, a row whose URL already belongs to an application
+        (compared normalized, see dedup.canonical_url) updates it instead,
+        and only the last row for each URL in the batch is kept, as if the
+        rows were applied one by one. Returns the number of rows (inserted,
+        updated, duplicates), duplicates being the inserted rows with the
+        URL, or company and title, of an earlier application or row.
+        Call inside bulk_writes().
+        """
+        keys = [application_keys(row[URL_INDEX], row[COMPANY_INDEX], row[JOB_NAME_INDEX]) for row in rows]
+        updates = []
+        replaced = unchanged = 0
+        if upsert:
+            last = {url_key: i for i, (url_key, _, _) in enumerate(keys) if url_key}
+            existing = self.find_url_keys(list(last))
+            inserts = []
+            for i, row in enumerate(rows):
+                url_key = keys[i][0]
+                if url_key and last[url_key] != i:
+                    replaced += 1
+                elif url_key in existing:
+                    current = existing[url_key]
+                    # Re-importing an unchanged row is counted but not rewritten
+                    if row[:-1] != current[1:]:
+                        updates.append(row[:-1] + current[:1])
+                    else:
+                        unchanged += 1
+                else:
+                    inserts.append(i)
+            rows, keys = [rows[i] for i in inserts], [keys[i] for i in inserts]
+
+        if updates:
+            assignments = ", ".join(f"{name} = ?" for name in STORED_COLUMNS)
+            self.db.executemany(f"UPDATE applications SET {assignments}, version = version + 1 WHERE id = ?",
+                                updates)
+            self.save_keys([(row[-1], row[URL_INDEX], row[COMPANY_INDEX], row[JOB_NAME_INDEX])
+                            for row in updates])
+        duplicates = 0
+        if rows:
+            duplicates = self.count_duplicates(keys)
+            # Ids only grow (AUTOINCREMENT), so the new rows are those past the current last one
+            last_id = self.db.execute("SELECT COALESCE(MAX(id), 0) FROM applications").fetchone()[0]
+            self.db.executemany(f'''
+                INSERT INTO applications ({", ".join(STORED_COLUMNS)}, created_at)
+                VALUES ({", ".join("?" * len(STORED_COLUMNS))}, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', rows)
+            ids = [app_id for app_id, in self.db.execute("SELECT id FROM applications WHERE id > ? ORDER BY id",
+                                                          (last_id,))]
+            self.db.executemany("INSERT INTO posting_keys VALUES (?, ?, ?, ?)",
+                                [(app_id,) + row_keys for app_id, row_keys in zip(ids, keys)])
+            # A later batch may update these rows, which the update triggers
+            # can only do once they are indexed and counted
+            if self.suspended is not None:
+                self.suspended.catch_up(self.db)
+        return len(rows), len(updates) + replaced + unchanged, duplicates
+
+    def count_duplicates(self, keys):
+        """Count the keys of rows about to be inserted that match an application or an earlier row"""
+        url_keys = set(self.find_url_keys(list({url_key for url_key, _, _ in keys if url_key})))
+        name_keys = self.find_name_keys(list({(company, title) for _, company, title in keys if company and title}))
+        duplicates = 0
+        for url_key, company, title in keys:
+            if url_key in url_keys or (company, title) in name_keys:
+                duplicates += 1
+            if url_key:
+                url_keys.add(url_key)
+            if company and title:
+                name_keys.add((company, title))
+        return duplicates
+
+    def record_ingested(self, files):
+        """Remember ingested files, as (sha256, path) pairs. Call inside bulk_writes()"""
+        self.db.executemany("INSERT OR IGNORE INTO ingested_files (sha256, path) VALUES (?, ?)", files)
+
+    @retry_when_locked
+    def dismiss_reminders(self, reminders):
+        """Remember that reminders were seen, so that they are not shown again"""
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO dismissed_reminders (application_id, rule, due) "
+                                "VALUES (?, ?, ?)",
+                                [(reminder.app_id, reminder.rule, reminder.due) for reminder in reminders])
+
+    @retry_when_locked
+    def delete(self, app_id):
+        """Delete an application"""
+        with self.db:
+            digests = self.attachment_digests("application_id = ?", (app_id,))
+            self.db.execute("DELETE FROM applications WHERE id = ?", (app_id,))
+        self.blobs.touch(digests)
+
+    # Attachments: the files are copied into the blob store, the table only
+    # holds what the attachments list shows
+
+    def add_attachment(self, app_id, path):
+        """Attach a file to an application and return the Attachment
+
+        The content is stored once however many applications it is
+        attached to; the file itself can then be moved or deleted.
+        """
+        digest, size = self.blobs.add(path)
+        return self.save_attachment(app_id, digest, os.path.basename(path), size)
+
+    @retry_when_locked
+    def save_attachment(self, app_id, digest, name, size):
+        """Record a stored blob as an attachment of an application"""
+        with self.db:
+            cursor = self.db.execute('''
+                INSERT INTO attachments (application_id, sha256, name, size)
+                SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM applications WHERE id = ?)
+            ''', (app_id, digest, name, size, app_id))
+        if cursor.rowcount == 0:
+            # The stored blob is left for collect_garbage()
+            raise ValidationError(f"No application with id {app_id}")
+        return Attachment._make(self.db.execute(f"SELECT {ATTACHMENT_COLUMNS} FROM attachments WHERE id = ?",
+                                                (cursor.lastrowid,)).fetchone())
+
+    def attachment_digests(self, where, params):
+        """Return the blob hashes of the attachments matching a condition"""
+        return [digest for digest, in self.db.execute(f"SELECT sha256 FROM attachments WHERE {where}", params)]
+
+    @retry_when_locked
+    def remove_attachment(self, attachment_id):
+        """Detach a file; its content stays in the blob store until collect_garbage()"""
+        with self.db:
+            digests = self.attachment_digests("id = ?", (attachment_id,))
+            self.db.execute("DELETE FROM attachments WHERE id = ?", (attachment_id,))
+        # The grace period of the blob starts now, not when it was stored
+        self.blobs.touch(digests)
+
+    def collect_garbage(self, grace_seconds=GC_GRACE_SECONDS):
+        """Delete the stored files that no attachment refers to any more, returning a CollectResult"""
+        referenced = {digest for digest, in self.db.execute("SELECT DISTINCT sha256 FROM attachments")}
+        return self.blobs.collect(referenced, grace_seconds)
+
+    # Bulk actions: each runs as one transaction and returns a BulkChange for undo()
+
+    @retry_when_locked
+    def set_status_many(self, app_ids, status):
+        """Change the status of many applications"""
+        with self.db:
+            # Take the write lock before reading, so that the values kept for undo stay current
+            self.db.execute("BEGIN IMMEDIATE")
+            rows = self.read_rows(app_ids, ["status", "status_changed_at"])
+            self.db.executemany("UPDATE applications SET status = ?, version = version + 1 WHERE id = ?",
+                                [(status, row[0]) for row in rows])
+        return BulkChange("update", ["id", "status", "status_changed_at"], rows)
+
+    @retry_when_locked
+    def set_priority_many(self, app_ids, priority):
+        """Change the priority of many applications"""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            rows = self.read_rows(app_ids, ["priority"])
+            self.db.executemany("UPDATE applications SET priority = ?, version = version + 1 WHERE id = ?",
+                                [(priority, row[0]) for row in rows])
+        return BulkChange("update", ["id", "priority"], rows)
+
+    @retry_when_locked
+    def delete_many(self, app_ids):
+        """Delete many applications, keeping their rows for undo()"""
+        # Generated columns are left out, as they cannot be inserted back
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(applications)")]
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            rows = self.read_rows(app_ids, columns[1:])
+            attachments = self.read_attachments(app_ids)
+            self.db.executemany("DELETE FROM applications WHERE id = ?", [row[:1] for row in rows])
+        # Keeps the blobs through the grace period, for undo() to find them
+        self.blobs.touch({attachment[2] for attachment in attachments})
+        return BulkChange("delete", columns, rows, attachments)
+
+    @retry_when_locked
+    def undo(self, change):
+        """Revert a bulk action
+
+        Updated columns get their previous values back one at a time, so that
+        a restored status keeps the time it was entered rather than the
+        trigger's "now"; status history is append-only and records the undo
+        as a change back. Deleted applications return with their ids, and
+        the first status events their insert triggers add are dropped, since
+        their history was kept. Their attachments come back too.
+        """
+        with self.db:
+            if change.action == "delete":
+                last_event = self.db.execute("SELECT COALESCE(MAX(id), 0) FROM status_events").fetchone()[0]
+                self.db.executemany(f"INSERT INTO applications ({', '.join(change.columns)}) "
+                                    f"VALUES ({', '.join('?' * len(change.columns))})", change.rows)
+                self.db.execute("DELETE FROM status_events WHERE id > ?", (last_event,))
+                url, company, job_name = (change.columns.index(name) for name in ("url", "company", "job_name"))
+                self.save_keys([(row[0], row[url], row[company], row[job_name]) for row in change.rows])
+                self.db.executemany(f"INSERT INTO attachments ({ATTACHMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                                    change.attachments)
+                return
+            for index, column in enumerate(change.columns[1:], 1):
+                self.db.executemany(f"UPDATE applications SET {column} = ?, version = version + 1 WHERE id = ?",
+                                    [(row[index], row[0]) for row in change.rows])
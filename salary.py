@@ -0,0 +1,92 @@
+import re
+
+# Currency symbols and codes recognized in salary text; longer symbols first
+CURRENCY_SYMBOLS = [("C$", "CAD"), ("CA$", "CAD"), ("A$", "AUD"), ("AU$", "AUD"), ("US$", "USD"),
+                    ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("¥", "JPY"), ("₹", "INR")]
+CURRENCY_CODES = ["USD", "EUR", "GBP", "CAD", "AUD", "CHF", "JPY", "INR", "MXN", "BRL"]
+
+# Multipliers turning a pay rate into a yearly amount (40-hour weeks, 52 weeks)
+PERIODS = [
+    (re.compile(r"/\s*h(ou)?r|\bper\s+h(ou)?r|\bhourly\b|\ban?\s+hour\b|\bph\b", re.I), 2080),
+    (re.compile(r"/\s*day|\bper\s+day\b|\bdaily\b|\ba\s+day\b", re.I), 260),
+    (re.compile(r"/\s*w(ee)?k|\bper\s+week\b|\bweekly\b|\ba\s+week\b", re.I), 52),
+    (re.compile(r"/\s*mo(nth)?|\bper\s+month\b|\bmonthly\b|\ba\s+month\b", re.I), 12),
+]
+
+# An amount: digits with "," or "." separators, then an optional k/m suffix
+AMOUNT = re.compile(r"(\d(?:[\d,.]*\d)?)\s*([kKmM](?![a-zA-Z]))?")
+
+# Amounts below this with no suffix or pay period are read as thousands ("80-100")
+BARE_THOUSANDS_BELOW = 1000
+
+
+def parse_currency(text):
+    """Return the ISO code of the currency named in salary text, or None"""
+    upper = text.upper()
+    for code in CURRENCY_CODES:
+        if re.search(rf"\b{code}\b", upper):
+            return code
+    for symbol, code in CURRENCY_SYMBOLS:
+        if symbol in upper:
+            return code
+    return None
+
+
+def parse_number(token):
+    """Read a number written with thousands separators and/or a decimal mark
+
+    "80,000", "12,00,000", "55.000" and "80.000,50" are all understood: a
+    separator followed by exactly three digits groups thousands, while the
+    last separator followed by other digit counts is the decimal mark.
+    """
+    separators = [i for i, char in enumerate(token) if char in ",."]
+    if not separators:
+        return float(token)
+    last = separators[-1]
+    if len(token) - last - 1 == 3:
+        return float(re.sub(r"[,.]", "", token))
+    return float(re.sub(r"[,.]", "", token[:last]) + "." + token[last + 1:])
+
+
+def parse_amounts(text):
+    """Return the amounts in salary text as (value, suffix) pairs"""
+    return [(parse_number(token), (suffix or "").lower()) for token, suffix in AMOUNT.findall(text)]
+
+
+def parse_salary(text):
+    """Parse free-text salary into (yearly minimum, yearly maximum, currency)
+
+    Handles currencies ("$", "€", "GBP"...), k/m suffixes ("80k", "1.2M"),
+    ranges ("80,000 - 100,000", "80-100k") and hourly, daily, weekly or
+    monthly rates, which are converted to yearly amounts. A suffix on the
+    last amount of a range applies to the whole range, and bare amounts
+    under 1,000 without a pay period are read as thousands. Amounts are
+    whole numbers in the original currency; (None, None, None) means no
+    salary could be read.
+    """
+    if not text or not text.strip():
+        return None, None, None
+    amounts = parse_amounts(text)
+    if not amounts:
+        return None, None, None
+    amounts = amounts[:2]
+
+    multiplier = 1
+    for pattern, period_multiplier in PERIODS:
+        if pattern.search(text):
+            multiplier = period_multiplier
+            break
+
+    last_suffix = amounts[-1][1]
+    values = []
+    for value, suffix in amounts:
+        suffix = suffix or last_suffix
+        if suffix == "k":
+            value *= 1000
+        elif suffix == "m":
+            value *= 1000000
+        elif multiplier == 1 and value < BARE_THOUSANDS_BELOW:
+            value *= 1000
+        values.append(round(value * multiplier))
+
+    return min(values), max(values), parse_currency(text)
@@ -0,0 +1,446 @@
+import re
+import sqlite3
+
+from dedup import application_keys
+from salary import parse_salary
+
+# Numeric weight of each priority; higher sorts first
+PRIORITY_RANKS = {"High": 3, "Medium": 2, "Low": 1}
+
+# ORDER BY clause of each sort option. Every column sorts descending so that a
+# single index walked backwards serves the whole order, rowid included.
+ORDER_BY = {
+    "Date Applied": "date_applied DESC, id DESC",
+    "Priority": "priority_rank DESC, date_applied DESC, id DESC",
+    "Salary": "salary_rank DESC, date_applied DESC, id DESC",
+}
+
+
+def priority_rank_sql(column="priority"):
+    """Return a SQL expression mapping a priority name to its numeric rank"""
+    cases = " ".join(f"WHEN '{name}' THEN {rank}" for name, rank in PRIORITY_RANKS.items())
+    return f"CASE {column} {cases} ELSE 0 END"
+
+
+def migration_1(db):
+    """Create the applications table (and add priority to pre-priority databases)"""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_name TEXT NOT NULL,
+            url TEXT,
+            company TEXT NOT NULL,
+            date_applied TEXT NOT NULL,
+            salary TEXT,
+            status TEXT NOT NULL,
+            recruiter_dm TEXT,
+            team_member_dm TEXT,
+            hiring_manager_dm TEXT,
+            priority TEXT DEFAULT 'Medium',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # Databases created before schema versioning may lack the priority column
+    columns = [row[1] for row in db.execute("PRAGMA table_info(applications)")]
+    if 'priority' not in columns:
+        db.execute("ALTER TABLE applications ADD COLUMN priority TEXT DEFAULT 'Medium'")
+
+
+def migration_2(db):
+    """Add the numeric priority rank and the indexes behind sorting and stats"""
+    db.execute(f'''
+        ALTER TABLE applications ADD COLUMN priority_rank INTEGER
+        GENERATED ALWAYS AS ({priority_rank_sql()}) VIRTUAL
+    ''')
+    db.execute("CREATE INDEX idx_applications_date_applied ON applications(date_applied)")
+    db.execute("CREATE INDEX idx_applications_priority ON applications(priority_rank, date_applied)")
+    db.execute("CREATE INDEX idx_applications_status ON applications(status, date_applied)")
+    db.execute("CREATE INDEX idx_applications_company ON applications(company)")
+
+
+def fts5_available(db):
+    """Return True if this SQLite build includes the FTS5 extension"""
+    try:
+        db.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        db.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+# Columns indexed for full-text search
+FTS_COLUMNS = ["job_name", "company", "status", "salary",
+               "recruiter_dm", "team_member_dm", "hiring_manager_dm"]
+
+
+def migration_3(db):
+    """Add the applications_fts full-text index, kept in sync by triggers"""
+    # SQLite builds without FTS5 keep using LIKE search
+    if not fts5_available(db):
+        return
+
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"NEW.{column}" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"OLD.{column}" for column in FTS_COLUMNS)
+    db.execute(f'''
+        CREATE VIRTUAL TABLE applications_fts USING fts5(
+            {columns},
+            content='applications', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+    db.execute(f'''
+        CREATE TRIGGER applications_fts_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO applications_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END
+    ''')
+    db.execute(f'''
+        CREATE TRIGGER applications_fts_delete AFTER DELETE ON applications BEGIN
+            INSERT INTO applications_fts (applications_fts, rowid, {columns})
+            VALUES ('delete', OLD.id, {old_values});
+        END
+    ''')
+    db.execute(f'''
+        CREATE TRIGGER applications_fts_update AFTER UPDATE OF {columns} ON applications BEGIN
+            INSERT INTO applications_fts (applications_fts, rowid, {columns})
+            VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO applications_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END
+    ''')
+    db.execute("INSERT INTO applications_fts (applications_fts) VALUES ('rebuild')")
+
+
+def migration_4(db):
+    """Index the status filter combined with the priority sort"""
+    db.execute("CREATE INDEX idx_applications_status_priority "
+               "ON applications(status, priority_rank, date_applied)")
+
+
+def migration_5(db):
+    """Add the status_counts summary table, kept exact by triggers"""
+    db.execute('''
+        CREATE TABLE status_counts (
+            status TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    db.execute('''
+        CREATE TRIGGER status_counts_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    db.execute('''
+        CREATE TRIGGER status_counts_delete AFTER DELETE ON applications BEGIN
+            UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+        END
+    ''')
+    db.execute('''
+        CREATE TRIGGER status_counts_update AFTER UPDATE OF status ON applications
+        WHEN OLD.status IS NOT NEW.status BEGIN
+            UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+            INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    rebuild_status_counts(db)
+
+
+def rebuild_status_counts(db):
+    """Recompute status_counts from the applications table in a single pass"""
+    db.execute("DELETE FROM status_counts")
+    db.execute('''
+        INSERT INTO status_counts (status, count)
+        SELECT status, COUNT(*) FROM applications GROUP BY status
+    ''')
+
+
+def migration_6(db):
+    """Index job URLs, which identify applications when importing with upsert"""
+    db.execute("CREATE INDEX idx_applications_url ON applications(url)")
+
+
+def migration_7(db):
+    """Add numeric salary columns parsed from the salary text, and their indexes"""
+    db.execute("ALTER TABLE applications ADD COLUMN salary_min INTEGER")
+    db.execute("ALTER TABLE applications ADD COLUMN salary_max INTEGER")
+    db.execute("ALTER TABLE applications ADD COLUMN currency TEXT")
+    # Sort key of the Salary order: the top of the range, with unknown salaries last
+    db.execute('''
+        ALTER TABLE applications ADD COLUMN salary_rank INTEGER
+        GENERATED ALWAYS AS (COALESCE(salary_max, 0)) VIRTUAL
+    ''')
+
+    rows = db.execute("SELECT id, salary FROM applications WHERE salary != ''").fetchall()
+    db.executemany("UPDATE applications SET salary_min = ?, salary_max = ?, currency = ? WHERE id = ?",
+                   [parse_salary(salary) + (app_id,) for app_id, salary in rows])
+
+    db.execute("CREATE INDEX idx_applications_salary ON applications(salary_rank, date_applied)")
+    db.execute("CREATE INDEX idx_applications_status_salary ON applications(status, salary_rank, date_applied)")
+
+
+def migration_8(db):
+    """Add the append-only status_events history, recorded by triggers"""
+    db.execute('''
+        CREATE TABLE status_events (
+            id INTEGER PRIMARY KEY,
+            application_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    db.execute("CREATE INDEX idx_status_events_application ON status_events(application_id, at)")
+    db.execute("CREATE INDEX idx_status_events_status ON status_events(status, at)")
+    # Events outlive their application, so deleting one never rewrites history.
+    # An application's first status dates from when it was applied for.
+    db.execute('''
+        CREATE TRIGGER status_events_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO status_events (application_id, status, at)
+            VALUES (NEW.id, NEW.status, NEW.date_applied);
+        END
+    ''')
+    db.execute('''
+        CREATE TRIGGER status_events_update AFTER UPDATE OF status ON applications
+        WHEN OLD.status IS NOT NEW.status BEGIN
+            INSERT INTO status_events (application_id, status) VALUES (NEW.id, NEW.status);
+        END
+    ''')
+    # Existing applications start their history with their current status
+    db.execute('''
+        INSERT INTO status_events (application_id, status, at)
+        SELECT id, status, date_applied FROM applications ORDER BY id
+    ''')
+
+
+def migration_9(db):
+    """Track interview dates and when each status was entered, for reminders"""
+    db.execute("ALTER TABLE applications ADD COLUMN interview_date TEXT")
+    db.execute("ALTER TABLE applications ADD COLUMN status_changed_at TIMESTAMP")
+    # Julian day the current status was entered; new applications count from
+    # their date applied. Times are local, like date_applied.
+    db.execute('''
+        ALTER TABLE applications ADD COLUMN status_since REAL
+        GENERATED ALWAYS AS (julianday(COALESCE(status_changed_at, date_applied))) VIRTUAL
+    ''')
+    db.execute('''
+        CREATE TRIGGER status_changed_at_update AFTER UPDATE OF status ON applications
+        WHEN OLD.status IS NOT NEW.status BEGIN
+            UPDATE applications SET status_changed_at = datetime('now', 'localtime') WHERE id = NEW.id;
+        END
+    ''')
+    # Status changes recorded so far only exist in status_events (in UTC)
+    db.execute('''
+        UPDATE applications SET status_changed_at = (
+            SELECT datetime(MAX(at), 'localtime') FROM status_events
+            WHERE application_id = applications.id AND length(at) > 10
+        )
+    ''')
+    db.execute("CREATE INDEX idx_applications_status_since ON applications(status, status_since)")
+    db.execute("CREATE INDEX idx_applications_interview ON applications(status, interview_date)")
+
+    # Reminders the user has seen, so that they are not shown again
+    db.execute('''
+        CREATE TABLE dismissed_reminders (
+            application_id INTEGER NOT NULL,
+            rule TEXT NOT NULL,
+            due REAL NOT NULL,
+            PRIMARY KEY (application_id, rule, due)
+        ) WITHOUT ROWID
+    ''')
+
+
+def migration_10(db):
+    """Add a row version for optimistic concurrency between processes"""
+    # Every write of an application's fields increments it; an edit saved with
+    # the version it was read at fails if someone else wrote in between
+    db.execute("ALTER TABLE applications ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+def migration_11(db):
+    """Add the normalized keys duplicate postings are detected by, and their indexes"""
+    # Kept beside applications rather than in it: the keys are only read when
+    # checking for duplicates, and wider application rows make every list
+    # query read more pages
+    db.execute('''
+        CREATE TABLE posting_keys (
+            application_id INTEGER PRIMARY KEY,
+            url_key TEXT,
+            company_key TEXT,
+            title_key TEXT
+        )
+    ''')
+    db.execute("CREATE INDEX idx_posting_keys_url ON posting_keys(url_key)")
+    # A company's applications, newest (highest id) first: the block whose
+    # titles are compared with a new one
+    db.execute("CREATE INDEX idx_posting_keys_company ON posting_keys(company_key)")
+    db.execute('''
+        CREATE TRIGGER posting_keys_delete AFTER DELETE ON applications BEGIN
+            DELETE FROM posting_keys WHERE application_id = OLD.id;
+        END
+    ''')
+    # The keys are computed in Python (see dedup.py), by every write of an application
+    rows = db.execute("SELECT id, url, company, job_name FROM applications").fetchall()
+    db.executemany("INSERT INTO posting_keys VALUES (?, ?, ?, ?)",
+                   [(app_id,) + application_keys(url, company, job_name)
+                    for app_id, url, company, job_name in rows])
+
+
+def migration_12(db):
+    """Remember the saved job postings already ingested, by content hash"""
+    db.execute('''
+        CREATE TABLE ingested_files (
+            sha256 TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            ingested_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+    ''')
+
+
+def migration_13(db):
+    """Add the files attached to applications; only their metadata, the content is in the blob store"""
+    db.execute('''
+        CREATE TABLE attachments (
+            id INTEGER PRIMARY KEY,
+            application_id INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            added_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    db.execute("CREATE INDEX idx_attachments_application ON attachments(application_id)")
+    db.execute('''
+        CREATE TRIGGER attachments_delete AFTER DELETE ON applications BEGIN
+            DELETE FROM attachments WHERE application_id = OLD.id;
+        END
+    ''')
+
+
+def migration_14(db):
+    """Let bulk writes switch the per-row insert triggers off without dropping them"""
+    # Holds a row only inside a bulk_writes() transaction, so other
+    # connections never see it and their inserts keep firing the triggers.
+    # Dropping the triggers instead changed the schema at every batch, which
+    # invalidated the prepared statements of every other connection.
+    db.execute("CREATE TABLE bulk_insert (active INTEGER PRIMARY KEY)")
+    placeholders = ", ".join("?" * len(BULK_INSERT_TRIGGERS))
+    triggers = db.execute(f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                          f"AND name IN ({placeholders})", BULK_INSERT_TRIGGERS).fetchall()
+    for name, sql in triggers:
+        db.execute(f"DROP TRIGGER {name}")
+        db.execute(re.sub(r"AFTER INSERT ON applications\s+BEGIN",
+                          "AFTER INSERT ON applications WHEN NOT EXISTS (SELECT 1 FROM bulk_insert) BEGIN",
+                          sql, count=1))
+
+
+def migration_15(db):
+    """Record status changes in local time, the clock of date_applied and status_changed_at"""
+    # Durations subtract the first event, dated by date_applied, from later
+    # ones; in UTC the later ones were off by the offset from UTC
+    db.execute("DROP TRIGGER status_events_update")
+    db.execute('''
+        CREATE TRIGGER status_events_update AFTER UPDATE OF status ON applications
+        WHEN OLD.status IS NOT NEW.status BEGIN
+            INSERT INTO status_events (application_id, status, at)
+            VALUES (NEW.id, NEW.status, datetime('now', 'localtime'));
+        END
+    ''')
+    # First events are bare dates, changes so far UTC times
+    db.execute("UPDATE status_events SET at = datetime(at, 'localtime') WHERE length(at) > 10")
+
+
+# Per-row insert triggers that bulk writes switch off and replace with one set-based pass
+BULK_INSERT_TRIGGERS = ["applications_fts_insert", "status_counts_insert", "status_events_insert"]
+
+
+class SuspendedTriggers:
+    """Insert triggers switched off by suspend_insert_triggers(), and the last row they have done the work for"""
+
+    def __init__(self, names, last_id):
+        self.names = names
+        self.last_id = last_id
+
+    def catch_up(self, db):
+        """Do the work of the suspended triggers for the rows inserted since the last catch-up
+
+        Each pass only reads the new rows, so catching up after every batch
+        costs the same as once at the end. Rows must be caught up before they
+        are updated, as the update triggers expect them indexed and counted.
+        """
+        last_id = self.last_id
+        self.last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM applications").fetchone()[0]
+        if self.last_id == last_id:
+            return
+        if "applications_fts_insert" in self.names:
+            columns = ", ".join(FTS_COLUMNS)
+            db.execute(f'''
+                INSERT INTO applications_fts (rowid, {columns})
+                SELECT id, {columns} FROM applications WHERE id > ?
+            ''', (last_id,))
+        if "status_counts_insert" in self.names:
+            db.execute('''
+                INSERT INTO status_counts (status, count)
+                SELECT status, COUNT(*) FROM applications WHERE id > ? GROUP BY status
+                ON CONFLICT (status) DO UPDATE SET count = count + excluded.count
+            ''', (last_id,))
+        if "status_events_insert" in self.names:
+            db.execute('''
+                INSERT INTO status_events (application_id, status, at)
+                SELECT id, status, date_applied FROM applications WHERE id > ? ORDER BY id
+            ''', (last_id,))
+
+
+def suspend_insert_triggers(db):
+    """Switch the per-row insert triggers off, returning the SuspendedTriggers to restore
+
+    Call inside a transaction: the switch is a row of bulk_insert, which
+    other connections do not see until it is removed again.
+    """
+    placeholders = ", ".join("?" * len(BULK_INSERT_TRIGGERS))
+    names = [name for name, in db.execute(f"SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                                          f"AND name IN ({placeholders})", BULK_INSERT_TRIGGERS)]
+    db.execute("INSERT INTO bulk_insert (active) VALUES (1)")
+    last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM applications").fetchone()[0]
+    return SuspendedTriggers(names, last_id)
+
+
+def restore_insert_triggers(db, suspended):
+    """Catch up on the rows inserted meanwhile, then switch the insert triggers back on"""
+    suspended.catch_up(db)
+    db.execute("DELETE FROM bulk_insert")
+
+
+# Migrations in order; the database's user_version is the number applied so far
+MIGRATIONS = [migration_1, migration_2, migration_3, migration_4, migration_5, migration_6,
+              migration_7, migration_8, migration_9, migration_10,
+              migration_11, migration_12, migration_13, migration_14, migration_15]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(db):
+    """Return the schema version stored in the database"""
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db):
+    """Apply every pending migration, each in its own transaction
+
+    Several processes may open a new or outdated database at once: each
+    migration takes the write lock first and re-reads the version under
+    it, so one that another process applied meanwhile is skipped.
+    """
+    version = get_version(db)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if get_version(db) < number:
+                migration(db)
+                db.execute(f"PRAGMA user_version = {number}")
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+    return SCHEMA_VERSION
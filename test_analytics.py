@@ -0,0 +1,70 @@
+# test_analytics.py
+import sqlite3
+import time
+
+import pytest
+
+from repository import ApplicationRepository
+from schema import migrate
+from test_schema import query_plan
+
+
+def test_status_events_record_history(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    app_id = repo.add({"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01",
+                       "status": "Applied"})
+    report = repo.funnel()
+    repo.set_status(app_id, "Interview Scheduled")
+    repo.set_status(app_id, "Interview Scheduled")
+    repo.update(app_id, {"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01",
+                         "status": "Rejected"})
+    repo.delete(app_id)
+
+    events = repo.db.execute("SELECT status FROM status_events WHERE application_id = ? ORDER BY id",
+                             (app_id,)).fetchall()
+    assert events == [("Applied",), ("Interview Scheduled",), ("Rejected",)]
+    plan = query_plan(repo.db, "SELECT at FROM status_events WHERE status = ? AND at > ?",
+                      ("Rejected", "2024-01-01"))
+    assert "idx_status_events_status" in plan, plan
+
+    # The cached report catches up with the new events and matches a full recount
+    report = repo.funnel()
+    assert [stage.reached for stage in report.stages] == [1, 1, 0, 0]
+    assert report.median_response_days is not None
+    repo.analytics.reset()
+    assert repo.funnel() == report
+
+
+@pytest.fixture
+def pacific_time(monkeypatch):
+    """Run in a time zone behind UTC, where UTC times already fall on the next day in the evening"""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_status_changes_are_recorded_in_local_time(tmp_path, pacific_time):
+    path = str(tmp_path / "jobs.db")
+    repo = ApplicationRepository(path)
+    today = repo.db.execute("SELECT date('now', 'localtime')").fetchone()[0]
+    app_id = repo.add({"job_name": "Engineer", "company": "Acme", "date_applied": today, "status": "Applied"})
+    repo.set_status(app_id, "Rejected")
+    at = repo.db.execute("SELECT at FROM status_events WHERE status = 'Rejected'").fetchone()[0]
+    assert at[:10] == today
+    # A same-day reply takes less than a day, whatever the offset from UTC
+    assert 0 <= repo.funnel().median_response_days < 1
+    repo.close()
+
+    # Changes recorded before in UTC are moved to local time
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO status_events (application_id, status, at) "
+               "VALUES (?, 'Withdrawn', '2024-03-01 02:00:00')", (app_id,))
+    db.execute("PRAGMA user_version = 14")
+    db.commit()
+    migrate(db)
+    withdrawn = db.execute("SELECT at FROM status_events WHERE status = 'Withdrawn'").fetchone()[0]
+    assert withdrawn == "2024-02-29 18:00:00"
+    assert db.execute("SELECT at FROM status_events WHERE status = 'Applied'").fetchone()[0] == today
+    db.close()
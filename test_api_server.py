@@ -0,0 +1,126 @@
+# test_api_server.py
+import asyncio
+import gzip
+import http.client
+import json
+import threading
+
+import pytest
+
+from api_server import ApiServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Run an API server on a free port in a background event loop"""
+    api = ApiServer(str(tmp_path / "jobs.db"), readers=2)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    host, port = asyncio.run_coroutine_threadsafe(api.start("127.0.0.1", 0), loop).result()
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    yield connection
+    connection.close()
+    asyncio.run_coroutine_threadsafe(api.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    api.close()
+    loop.close()
+
+
+def call(connection, method, path, body=None, headers=None):
+    """Send a request and return (status, headers, decoded JSON or None)"""
+    connection.request(method, path, json.dumps(body) if body is not None else None, headers or {})
+    response = connection.getresponse()
+    data = response.read()
+    if response.getheader("Content-Encoding") == "gzip":
+        data = gzip.decompress(data)
+    return response.status, response, json.loads(data) if data else None
+
+
+def test_crud_and_pagination(server):
+    for i in range(5):
+        status, _, created = call(server, "POST", "/applications",
+                                  {"job_name": f"Engineer {i}", "company": "Acme",
+                                   "date_applied": f"2024-01-0{i + 1}", "status": "Applied"})
+        assert status == 201
+    assert call(server, "POST", "/applications", {"company": "Acme"})[0] == 422
+
+    status, _, page = call(server, "GET", "/applications?limit=3")
+    assert [item["job_name"] for item in page["items"]] == ["Engineer 4", "Engineer 3", "Engineer 2"]
+    _, _, page = call(server, "GET", f"/applications?limit=3&after={page['next']}")
+    assert [item["job_name"] for item in page["items"]] == ["Engineer 1", "Engineer 0"]
+    assert page["next"] is None
+    assert call(server, "GET", "/applications?after=garbage")[0] == 400
+
+    app_id = created["id"]
+    status, _, app = call(server, "PUT", f"/applications/{app_id}/status", {"status": "Rejected"})
+    assert status == 200
+    _, _, app = call(server, "GET", f"/applications/{app_id}")
+    assert app["status"] == "Rejected"
+    assert call(server, "DELETE", f"/applications/{app_id}")[0] == 204
+    assert call(server, "GET", f"/applications/{app_id}")[0] == 404
+
+    _, _, stats = call(server, "GET", "/stats")
+    assert stats["Total"] == 4 and stats["Applied"] == 4
+
+
+def test_etag_follows_data_version_and_responses_are_compressed(server):
+    for i in range(30):
+        call(server, "POST", "/applications", {"job_name": f"Data Analyst {i}", "company": "Stripe"})
+
+    status, response, _ = call(server, "GET", "/applications", headers={"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    etag = response.getheader("ETag")
+    status, _, data = call(server, "GET", "/applications", headers={"If-None-Match": etag})
+    assert (status, data) == (304, None)
+
+    # Any commit changes the data version, so the cached list is stale
+    call(server, "PUT", "/applications/1/status", {"status": "Applied"})
+    status, response, _ = call(server, "GET", "/applications", headers={"If-None-Match": etag})
+    assert status == 200 and response.getheader("ETag") != etag
+
+
+def test_bodies_of_the_wrong_shape_are_rejected(server):
+    fields = {"job_name": "Engineer", "company": "Acme"}
+    for body in [dict(fields, job_name=True), dict(fields, url=["x"]), dict(fields, salary={"min": 1}), ["Engineer"]]:
+        status, _, data = call(server, "POST", "/applications", body)
+        assert status == 422, (body, data)
+    # Numbers are text to clean_fields, as they are to the importer
+    status, _, created = call(server, "POST", "/applications", dict(fields, salary=90000))
+    assert status == 201
+    app_path = f"/applications/{created['id']}"
+    assert call(server, "GET", app_path)[2]["salary"] == "90000"
+    assert call(server, "PUT", app_path, dict(fields, date_applied=20240101))[0] == 422
+    assert call(server, "PUT", app_path, dict(fields, date_applied="2024-01-01", version="0"))[0] == 422
+    assert call(server, "PUT", f"{app_path}/status", [1, 2])[0] == 422
+    status, _, data = call(server, "PUT", f"{app_path}/status", {"status": "Ghosted"})
+    assert status == 422 and "Applied" in data["error"]
+    _, _, stats = call(server, "GET", "/stats")
+    assert stats["Total"] == 1 and "Ghosted" not in stats
+
+
+@pytest.mark.parametrize("request_bytes, status", [
+    (b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n", 400),
+    (b"GET /stats HTTP/1.1\r\nX-Big: " + b"a" * 70000 + b"\r\n\r\n", 431),
+    (b"GET /stats HTTP/1.1\r\n" + b"".join(b"X-Header-%d: 1\r\n" % i for i in range(200)) + b"\r\n", 431),
+], ids=["long request line", "long header", "too many headers"])
+def test_oversized_requests_are_answered_and_closed(server, request_bytes, status):
+    server.connect()
+    server.sock.sendall(request_bytes)
+    response = http.client.HTTPResponse(server.sock)
+    response.begin()
+    assert response.status == status
+    assert response.getheader("Connection") == "close"
+    assert json.loads(response.read())["error"]
+
+
+def test_duplicate_postings_are_refused_unless_allowed(server):
+    fields = {"job_name": "Data Engineer", "company": "Acme", "url": "https://acme.io/jobs/1"}
+    _, _, created = call(server, "POST", "/applications", fields)
+    status, _, data = call(server, "POST", "/applications", dict(fields, url="http://www.acme.io/jobs/1/"))
+    assert status == 409
+    assert [duplicate["id"] for duplicate in data["duplicates"]] == [created["id"]]
+
+    status, _, data = call(server, "POST", "/applications?allow_duplicates=true", fields)
+    assert status == 201 and data["id"] != created["id"]
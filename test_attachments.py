@@ -0,0 +1,63 @@
+# test_attachments.py
+import os
+import time
+
+from attachments import GC_GRACE_SECONDS
+from repository import ApplicationRepository
+
+
+def test_attachments_are_stored_once_and_collected_when_unused(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    ids = [repo.add({"job_name": f"Engineer {i}", "company": "Acme", "date_applied": "2024-01-01"})
+           for i in range(3)]
+    cv = tmp_path / "cv.pdf"
+    cv.write_bytes(b"%PDF-1.4 " + os.urandom(3 * 1024 * 1024))
+    letter = tmp_path / "letter.txt"
+    letter.write_text("Dear hiring manager")
+
+    attached = [repo.add_attachment(app_id, str(cv)) for app_id in ids]
+    repo.add_attachment(ids[0], str(letter))
+    assert len({attachment.sha256 for attachment in attached}) == 1
+    blobs = [name for _, _, names in os.walk(repo.blobs.root) for name in names]
+    assert len(blobs) == 2
+    assert [a.name for a in repo.list_attachments(ids[0])] == ["cv.pdf", "letter.txt"]
+    assert repo.blobs.verify(attached[0].sha256)
+    with open(repo.blobs.named_copy(attached[0].sha256, "cv.pdf", str(tmp_path / "open")), "rb") as file:
+        assert file.read() == cv.read_bytes()
+
+    # Deleting applications drops their attachments, and undo brings them back
+    change = repo.delete_many(ids[:2])
+    assert repo.list_attachments(ids[0]) == []
+    repo.undo(change)
+    assert len(repo.list_attachments(ids[0])) == 2
+
+    # Blobs are only collected once nothing refers to them
+    repo.delete(ids[0])
+    assert repo.collect_garbage(grace_seconds=0) == (1, len("Dear hiring manager"))
+    for attachment in attached[1:]:
+        repo.remove_attachment(attachment.id)
+    assert repo.collect_garbage().removed == 0
+    assert repo.collect_garbage(grace_seconds=0).removed == 1
+    assert not repo.blobs.verify(attached[0].sha256)
+    repo.close()
+
+
+def test_blobs_of_deleted_applications_outlive_the_grace_period_for_undo(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    app_id = repo.add({"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01"})
+    cv = tmp_path / "cv.pdf"
+    cv.write_bytes(b"%PDF-1.4 old CV")
+    attachment = repo.add_attachment(app_id, str(cv))
+    # Stored long ago: the grace period counts from when it was last referenced
+    stored_at = time.time() - 2 * GC_GRACE_SECONDS
+    os.utime(repo.attachment_path(attachment), (stored_at, stored_at))
+
+    change = repo.delete_many([app_id])
+    assert repo.collect_garbage().removed == 0
+    repo.undo(change)
+    assert repo.blobs.verify(attachment.sha256)
+
+    os.utime(repo.attachment_path(attachment), (stored_at, stored_at))
+    repo.remove_attachment(attachment.id)
+    assert repo.collect_garbage().removed == 0
+    repo.close()
@@ -0,0 +1,31 @@
+# test_benchmark.py
+import json
+import os
+
+from benchmark import generate_rows, get_database, main
+
+
+def test_synthetic_data_is_reproducible():
+    assert list(generate_rows(50)) == list(generate_rows(50))
+    assert list(generate_rows(50)) != list(generate_rows(50, seed=7))
+
+
+def test_benchmark_runs_and_compares(tmp_path, capsys):
+    db_dir = str(tmp_path / "dbs")
+    output = str(tmp_path / "results.json")
+    main(["--sizes", "200", "--repeat", "1", "--no-gui", "--db-dir", db_dir, "--output", output])
+
+    with open(output) as f:
+        document = json.load(f)
+    results = document["results"]["200"]
+    assert document["gui_skipped"] == "disabled"
+    for name in ["refresh/Date Applied", "scroll/middle page", "search/engineer", "cache/same view",
+                 "stats", "export/export.csv", "add", "edit"]:
+        assert results[name]["runs"] >= 1 and results[name]["median_ms"] >= 0, name
+
+    # The generated database is kept pristine and reused by later runs
+    pristine = get_database(200, db_dir)
+    modified = os.path.getmtime(pristine)
+    main(["--sizes", "200", "--repeat", "1", "--no-gui", "--db-dir", db_dir, "--compare", output])
+    assert os.path.getmtime(pristine) == modified
+    assert "refresh/Date Applied" in capsys.readouterr().out
@@ -0,0 +1,28 @@
+# test_bulk_actions.py
+from repository import ApplicationRepository
+
+
+def test_bulk_actions_run_in_one_transaction_and_undo(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    app_ids = [repo.add({"job_name": f"Engineer {i}", "company": "Acme", "date_applied": "2024-01-01",
+                         "status": "Applied", "url": f"https://acme.com/{i}"}) for i in range(5)]
+    assert repo.list_application_ids("engineer", "Applied") == sorted(app_ids, reverse=True)
+    columns = ["status", "status_since", "priority"]
+    before = repo.read_rows(app_ids, columns)
+    events = repo.db.execute("SELECT COUNT(*) FROM status_events").fetchone()[0]
+
+    changes = [repo.set_status_many(app_ids[:3], "Rejected"), repo.set_priority_many(app_ids[1:], "High")]
+    assert repo.status_counts() == {"Rejected": 3, "Applied": 2}
+    for change in reversed(changes):
+        repo.undo(change)
+    assert repo.read_rows(app_ids, columns) == before
+
+    deleted = repo.delete_many(app_ids[:2] + [999])
+    assert len(deleted.rows) == 2 and repo.status_counts() == {"Applied": 3}
+    repo.undo(deleted)
+    assert repo.read_rows(app_ids, columns) == before
+    assert repo.status_counts() == repo.count_statuses() == {"Applied": 5}
+    assert repo.list_application_ids("engineer") == sorted(app_ids, reverse=True)
+    assert repo.find_duplicates({"url": "https://acme.com/0"})[0].id == app_ids[0]
+    # History gained the status changes and their undo, but no second "first" event
+    assert repo.db.execute("SELECT COUNT(*) FROM status_events").fetchone()[0] == events + 6
@@ -0,0 +1,42 @@
+# test_cli.py
+import json
+import os
+import subprocess
+import sys
+
+from cli import main
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_commands_share_the_database(tmp_path, capsys):
+    db = str(tmp_path / "jobs.db")
+    assert main(["--db", db, "add", "--job-name", "Data Analyst", "--company", "Stripe",
+                 "--date", "2024-01-02", "--salary", "90-110k", "--status", "Applied"]) == 0
+    assert main(["--db", db, "add", "--job-name", "Engineer", "--company", "Acme",
+                 "--date", "2024-01-01"]) == 0
+    first_id, second_id = map(int, capsys.readouterr().out.split())
+
+    assert main(["--db", db, "set-status", str(second_id), "Rejected"]) == 0
+    assert main(["--db", db, "set-status", "999", "Rejected"]) == 1
+    assert main(["--db", db, "add", "--job-name", "", "--company", "Acme"]) == 1
+    capsys.readouterr()
+
+    main(["--db", db, "list", "--format", "json", "--min-salary", "100k"])
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(row["id"], row["status"]) for row in rows] == [(first_id, "Applied")]
+
+    main(["--db", db, "search", "acme", "--format", "csv"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "id,job_name,company,date_applied,status,priority,url,match"
+    assert lines[1].startswith(f"{second_id},Engineer,Acme,2024-01-01,Rejected,")
+
+    main(["--db", db, "stats", "--format", "json"])
+    stats = {row["status"]: row["count"] for row in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert stats["Total"] == 2 and stats["Rejected"] == 1
+
+
+def test_cli_does_not_import_tk():
+    code = "import sys, cli; print('tkinter' in sys.modules or 'customtkinter' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+    assert result.stdout.strip() == "False", result.stderr
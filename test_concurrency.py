@@ -0,0 +1,55 @@
+# test_concurrency.py
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+
+from repository import ApplicationRepository, ConflictError, default_db_path
+from schema import SCHEMA_VERSION, get_version
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_concurrent_writers_detect_conflicts_and_wait_for_locks(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.db")
+    monkeypatch.setenv("JOBS_TRACKER_DB", path)
+    assert default_db_path() == path
+    monkeypatch.setenv("JOBS_TRACKER_BUSY_TIMEOUT_MS", "50")
+    window, script = ApplicationRepository(), ApplicationRepository(path)
+
+    fields = {"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01", "status": "Applied"}
+    app_id = window.add(fields)
+    opened = window.get(app_id)
+    seen = window.data_version()
+    script.set_status(app_id, "Rejected")
+    assert window.data_version() != seen
+
+    # Saving the stale dialog values would undo the other process's change
+    try:
+        window.update(app_id, dict(fields, salary="100k"), expected_version=opened.version)
+    except ConflictError:
+        pass
+    else:
+        raise AssertionError("stale update was saved")
+    assert window.get(app_id).status == "Rejected"
+    window.update(app_id, dict(fields, salary="100k"), expected_version=window.get(app_id).version)
+
+    # A write finding the database locked waits, then retries until the lock is released
+    lock = sqlite3.connect(path, check_same_thread=False)
+    lock.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.15, lock.rollback).start()
+    script.set_status(app_id, "Withdrawn")
+    assert window.get_status(app_id) == "Withdrawn"
+    lock.close()
+
+
+def test_processes_opening_a_new_database_migrate_it_once(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); "
+              "from repository import ApplicationRepository; ApplicationRepository(sys.argv[2]).close()")
+    processes = [subprocess.Popen([sys.executable, "-c", script, HERE, path], stderr=subprocess.PIPE, text=True)
+                 for _ in range(4)]
+    errors = [process.communicate()[1] for process in processes]
+    assert [process.returncode for process in processes] == [0] * 4, errors
+    assert get_version(sqlite3.connect(path)) == SCHEMA_VERSION
@@ -0,0 +1,100 @@
+# test_db_worker.py
+import time
+
+from db_worker import BackgroundJob, DatabaseWorker
+from repository import ApplicationRepository
+from test_reminders import FakeRoot
+
+# Never finishes on its own, so it only ends when interrupted
+ENDLESS_QUERY = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT count(*) FROM n"
+
+
+def run_until(root, done, timeout=10):
+    """Run the scheduled after() callbacks, as the Tk mainloop would, until done() is true"""
+    deadline = time.monotonic() + timeout
+    while not done():
+        assert time.monotonic() < deadline, "timed out waiting for the worker"
+        for job in sorted(root.jobs):
+            delay, fn = root.jobs.pop(job)
+            fn()
+        time.sleep(0.005)
+
+
+def wait_running(worker, request):
+    deadline = time.monotonic() + 10
+    while worker.current is not request:
+        assert time.monotonic() < deadline, "the request never started"
+        time.sleep(0.005)
+
+
+def test_interrupted_requests_report_nothing_and_the_next_one_runs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    ApplicationRepository(path).close()
+    root = FakeRoot()
+    busy = []
+    worker = DatabaseWorker(root, path, on_busy=busy.append)
+    delivered = []
+
+    running = worker.submit(lambda repo: repo.db.execute(ENDLESS_QUERY).fetchone(),
+                            delivered.append, delivered.append, key="list")
+    wait_running(worker, running)
+    # A request with the same key supersedes the running query
+    worker.submit(lambda repo: "second page", delivered.append, delivered.append, key="list")
+    run_until(root, lambda: delivered)
+    assert delivered == ["second page"]
+
+    # So does an explicit cancel, and the worker carries on afterwards
+    running = worker.submit(lambda repo: repo.db.execute(ENDLESS_QUERY).fetchone(),
+                            delivered.append, delivered.append)
+    wait_running(worker, running)
+    worker.cancel(running)
+    worker.submit(lambda repo: repo.add({"job_name": "Engineer", "company": "Acme",
+                                         "date_applied": "2024-01-01"}),
+                  delivered.append, delivered.append)
+    run_until(root, lambda: len(delivered) == 2)
+    assert isinstance(delivered[1], int)
+    assert worker.pending == 0 and not worker.latest
+    assert busy == [True, False, True, False]
+
+    # Failures go to on_error and leave no transaction open
+    def failing(repo):
+        repo.db.execute("BEGIN")
+        repo.db.execute("DELETE FROM applications")
+        raise ValueError("stop")
+
+    worker.submit(failing, delivered.append, delivered.append)
+    worker.submit(lambda repo: repo.stats()["Total"], delivered.append, delivered.append)
+    run_until(root, lambda: len(delivered) == 4)
+    assert isinstance(delivered[2], ValueError)
+    assert delivered[3] == 1
+    worker.close()
+
+
+def test_cancelled_background_job_reports_cancellation_and_the_next_job_runs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    ApplicationRepository(path).close()
+    root = FakeRoot()
+    outcomes = []
+
+    def endless(repo, report, cancel):
+        done = 0
+        while True:
+            if cancel.is_set():
+                raise InterruptedError("cancelled")
+            done += 1
+            report(done, None)
+            time.sleep(0.001)
+
+    job = BackgroundJob(root, path, endless, on_progress=lambda done, total: outcomes.append("progress"),
+                        on_done=outcomes.append, on_error=outcomes.append,
+                        on_cancel=lambda: outcomes.append("cancelled"))
+    run_until(root, lambda: "progress" in outcomes)
+    job.cancel()
+    run_until(root, lambda: outcomes[-1] != "progress")
+    assert outcomes[-1] == "cancelled"
+
+    BackgroundJob(root, path, lambda repo, report, cancel: repo.stats()["Total"],
+                  on_done=outcomes.append, on_error=outcomes.append,
+                  on_cancel=lambda: outcomes.append("cancelled"))
+    run_until(root, lambda: outcomes[-1] not in ("progress", "cancelled"))
+    assert outcomes[-1] == 0
@@ -0,0 +1,35 @@
+# test_dedup.py
+import pytest
+
+from dedup import canonical_url, company_key, title_key, title_similarity
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.Acme.com/jobs/1/?utm_source=linkedin&gh_src=x#apply", "acme.com/jobs/1"),
+    ("acme.com/jobs/1", "acme.com/jobs/1"),
+    ("https://boards.io/job?id=7&ref=feed&b=2", "boards.io/job?b=2&id=7"),
+    ("   ", None),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_names_and_titles_compare_normalized(tmp_path):
+    from repository import ApplicationRepository
+
+    assert company_key("Acme, Inc.") == company_key("ACME") == "acme"
+    assert title_key("Sr. Data Eng") == title_key("Senior Data Engineer")
+    assert title_similarity("senior data engineer", "data engineer") == pytest.approx(2 / 3)
+
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    first = repo.add({"job_name": "Senior Data Engineer", "company": "Acme Inc", "date_applied": "2024-01-01",
+                      "url": "https://acme.com/jobs/1"})
+    repo.add({"job_name": "Analyst", "company": "Globex", "date_applied": "2024-01-01"})
+    found = repo.find_duplicates({"job_name": "Sr Data Eng", "company": "ACME", "url": "acme.com/jobs/2"})
+    assert [(duplicate.id, duplicate.reason) for duplicate in found] == [(first, "same title and company")]
+    assert [d.reason for d in repo.find_duplicates({"job_name": "Designer", "company": "Initech",
+                                                    "url": "https://www.acme.com/jobs/1/"})] == ["same job posting"]
+    assert repo.find_duplicates({"job_name": "Designer", "company": "Acme"}) == []
+
+    repo.delete(first)
+    assert repo.find_duplicates({"job_name": "Senior Data Engineer", "company": "Acme"}) == []
@@ -0,0 +1,58 @@
+# test_exporter.py
+import csv
+import gzip
+import json
+import os
+import threading
+
+import pytest
+
+from exporter import CSV_HEADER, ExportCancelled, export_applications
+from repository import ApplicationRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    for i in range(3):
+        repo.add({"job_name": f"Engineer {i}", "company": "Acme, Inc.", "date_applied": f"2024-01-0{i + 1}",
+                  "status": "Applied", "salary": "90-110k"})
+    yield repo
+    repo.close()
+
+
+def test_csv_and_json_lines_exports_with_and_without_gzip(repo, tmp_path):
+    progress = []
+    assert export_applications(repo, str(tmp_path / "jobs.csv"), progress=lambda *done: progress.append(done)) == 3
+    assert progress[-1] == (3, 3)
+    with open(tmp_path / "jobs.csv", newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == CSV_HEADER
+    assert sorted(row[0] for row in rows[1:]) == ["Engineer 0", "Engineer 1", "Engineer 2"]
+    assert {row[1] for row in rows[1:]} == {"Acme, Inc."}
+
+    export_applications(repo, str(tmp_path / "jobs.jsonl.gz"))
+    with gzip.open(tmp_path / "jobs.jsonl.gz", "rt", encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert sorted(record["job_name"] for record in records) == ["Engineer 0", "Engineer 1", "Engineer 2"]
+    assert records[0]["salary"] == "90-110k"
+
+    export_applications(repo, str(tmp_path / "jobs.csv.gz"))
+    with gzip.open(tmp_path / "jobs.csv.gz", "rt", encoding="utf-8", newline="") as file:
+        assert list(csv.reader(file)) == rows
+
+    # New exports get the permissions the umask gives any new file
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(tmp_path / "jobs.csv").st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_cancelled_export_leaves_the_existing_file_untouched(repo, tmp_path):
+    target = tmp_path / "jobs.jsonl"
+    target.write_text("previous export\n")
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(ExportCancelled):
+        export_applications(repo, str(target), cancel=cancel)
+    assert target.read_text() == "previous export\n"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
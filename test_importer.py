@@ -0,0 +1,65 @@
+# test_importer.py
+import json
+
+import importer
+from importer import import_applications
+from repository import ApplicationRepository
+
+
+def test_bad_json_lines_are_skipped_with_their_line_numbers(tmp_path):
+    source = tmp_path / "jobs.jsonl"
+    source.write_text('{"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01", "salary": 90000}\n'
+                      '{"job_name": "Analyst", "company": \n'
+                      '[1, 2]\n'
+                      '\n'
+                      '{"job_name": "Designer", "company": "Globex", "date_applied": 20240101}\n'
+                      '{"job_name": ["Architect"], "company": "Initech", "date_applied": "2024-01-03"}\n'
+                      '{"job_name": "Manager", "company": "Hooli", "date_applied": "2024-01-02"}\n')
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    result = import_applications(repo, str(source))
+    assert (result.inserted, result.skipped) == (2, 4)
+    assert [line for line, _ in result.errors] == [2, 3, 5, 6]
+    assert result.errors[1][1] == "Expected a JSON object, not list"
+    assert [app.job_name for app in repo.list_applications()] == ["Manager", "Engineer"]
+    assert repo.list_applications()[1].salary_rank == 90000
+    repo.close()
+
+
+def test_upserts_across_batches_keep_search_and_counts_exact(tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "BATCH_SIZE", 2)
+    source = tmp_path / "jobs.csv"
+    source.write_text("Job Name,Company,Date Applied,Status,URL\n"
+                      "Data Engineer,Acme,2024-01-01,Applied,https://acme.io/1\n"
+                      "Analyst,Globex,2024-01-02,Applied,https://globex.io/2\n"
+                      "Data Scientist,Acme,2024-01-01,Rejected,https://acme.io/1\n"
+                      "Designer,Initech,2024-01-03,Pending,https://initech.io/3\n")
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    result = import_applications(repo, str(source), upsert=True)
+    assert (result.inserted, result.updated) == (3, 1)
+
+    # The row updated by the second batch was inserted by the first one
+    assert repo.status_counts() == repo.count_statuses() == {"Applied": 1, "Rejected": 1, "Pending": 1}
+    search = "SELECT rowid FROM applications_fts WHERE applications_fts MATCH ?"
+    assert repo.db.execute(search, ('"scientist"',)).fetchall() == [(1,)]
+    assert repo.db.execute(search, ('"engineer"',)).fetchall() == []
+    repo.db.execute("INSERT INTO applications_fts (applications_fts, rank) VALUES ('integrity-check', 1)")
+    repo.close()
+
+
+def test_created_at_is_validated_and_normalized(tmp_path):
+    source = tmp_path / "jobs.jsonl"
+    records = [("2024-01-01 09:30:00", None), ("2024-01-02T10:00:00+02:00", None), ("", None),
+               ("last week", "YYYY-MM-DD HH:MM:SS"), (20240101, "must be text")]
+    source.write_text("".join(json.dumps({"job_name": f"Engineer {i}", "company": "Acme",
+                                          "date_applied": "2024-01-01", "created_at": created_at}) + "\n"
+                              for i, (created_at, _) in enumerate(records)))
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    result = import_applications(repo, str(source))
+    assert (result.inserted, result.skipped) == (3, 2)
+    assert [line for line, _ in result.errors] == [4, 5]
+    for (_, error), (_, expected) in zip(result.errors, records[3:]):
+        assert expected in error
+    created = [created_at for created_at, in repo.db.execute("SELECT created_at FROM applications ORDER BY id")]
+    assert created[:2] == ["2024-01-01 09:30:00", "2024-01-02 08:00:00"]
+    assert len(created[2]) == 19
+    repo.close()
@@ -0,0 +1,74 @@
+# test_ingest.py
+import json
+
+import ingest
+from repository import ApplicationRepository
+
+JOB_POSTING = {
+    "@context": "https://schema.org", "@type": "JobPosting", "title": "Data Engineer",
+    "hiringOrganization": {"@type": "Organization", "name": "Acme"}, "url": "https://acme.com/jobs/1",
+    "baseSalary": {"@type": "MonetaryAmount", "currency": "USD",
+                   "value": {"@type": "QuantitativeValue", "minValue": 90000, "maxValue": 120000,
+                             "unitText": "YEAR"}},
+}
+
+PAGE = """<html><head><title>ML Engineer | Initech Careers</title>
+<meta property="og:site_name" content="Initech">
+<link rel="canonical" href="https://initech.com/j/7"></head>
+<body><h1>ML Engineer</h1><script>var pay = "$1";</script><p>Pay: $60/hr &amp; benefits</p></body></html>"""
+
+
+def write_postings(directory):
+    directory.mkdir()
+    (directory / "acme.json").write_text(json.dumps(JOB_POSTING))
+    (directory / "initech.html").write_text(PAGE)
+    (directory / "ld.html").write_text('<script type="application/ld+json">{"@graph": [%s]}</script>'
+                                       % json.dumps(dict(JOB_POSTING, title="Analyst", url=None)))
+    (directory / "copy.htm").write_text(PAGE)
+    (directory / "broken.json").write_text("{")
+    (directory / "notes.txt").write_text("not a posting")
+
+
+def test_ingest_adds_pending_postings_once(tmp_path, monkeypatch):
+    write_postings(tmp_path / "saved")
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    reported = []
+    result = ingest.ingest_postings(repo, str(tmp_path / "saved"), workers=1,
+                                    progress=lambda done, total: reported.append((done, total)))
+    assert (result.inserted, result.already_ingested, result.failed) == (3, 1, 1)
+    assert result.errors[0][0] == "broken.json"
+    assert reported[-1] == (5, 5)
+
+    rows = repo.db.execute("SELECT job_name, company, url, salary_min, salary_max, status FROM applications "
+                           "ORDER BY job_name").fetchall()
+    assert rows == [("Analyst", "Acme", None, 90000, 120000, "Pending"),
+                    ("Data Engineer", "Acme", "https://acme.com/jobs/1", 90000, 120000, "Pending"),
+                    ("ML Engineer", "Initech", "https://initech.com/j/7", 124800, 124800, "Pending")]
+
+    # A second run only picks up new files, in batches that leave the schema
+    # alone so that other connections keep their prepared statements
+    schema_version = repo.db.execute("PRAGMA schema_version").fetchone()[0]
+    (tmp_path / "saved" / "more.json").write_text(json.dumps(dict(JOB_POSTING, title="Designer")))
+    (tmp_path / "saved" / "other.json").write_text(json.dumps(dict(JOB_POSTING, title="Architect")))
+    monkeypatch.setattr(ingest, "BATCH_SIZE", 1)
+    result = ingest.ingest_postings(repo, str(tmp_path / "saved"), workers=1)
+    assert (result.inserted, result.already_ingested) == (2, 4)
+    assert repo.db.execute("PRAGMA schema_version").fetchone()[0] == schema_version
+    assert repo.status_counts() == {"Pending": 5}
+    search = "SELECT COUNT(*) FROM applications_fts WHERE applications_fts MATCH ?"
+    assert repo.db.execute(search, ('"designer" OR "architect"',)).fetchone()[0] == 2
+
+    # The insert triggers are on again for everyone else
+    other = ApplicationRepository(str(tmp_path / "jobs.db"))
+    other.add({"job_name": "Designer", "company": "Hooli", "date_applied": "2024-01-01"})
+    other.close()
+    assert repo.db.execute(search, ('"designer"',)).fetchone()[0] == 2
+    assert repo.status_counts() == {"Pending": 6}
+
+
+def test_ingest_parses_in_a_process_pool(tmp_path, monkeypatch):
+    write_postings(tmp_path / "saved")
+    monkeypatch.setattr(ingest, "MIN_FILES_FOR_POOL", 0)
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    result = ingest.ingest_postings(repo, str(tmp_path / "saved"), workers=2)
+    assert (result.inserted, result.already_ingested, result.failed) == (3, 1, 1)
@@ -0,0 +1,69 @@
+# test_profiling.py
+import logging
+import sqlite3
+import time
+import tkinter
+
+import pytest
+
+from profiling import Profiler, connection_factory, log_file, logger, profiler
+
+
+@pytest.fixture
+def enabled_profiler(tmp_path, monkeypatch):
+    # enable() patches the Tk widget classes to count widgets; put them back afterwards
+    monkeypatch.setattr(tkinter.BaseWidget, "_setup", tkinter.BaseWidget._setup)
+    monkeypatch.setattr(tkinter.BaseWidget, "destroy", tkinter.BaseWidget.destroy)
+    handlers = list(logger.handlers)
+    profiler.enable(log_file(str(tmp_path / "jobs.db")), slow_query_ms=0)
+    yield profiler
+    for handler in logger.handlers[len(handlers):]:
+        handler.close()
+        logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    profiler.enabled = False
+    profiler.reset()
+
+
+def test_log_is_written_beside_the_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert log_file("data/jobs.db") == str(tmp_path / "data" / "jobs_profile.log")
+
+
+def test_spans_cost_nothing_until_enabled():
+    disabled = Profiler()
+    with disabled.span("refresh"):
+        pass
+    assert disabled.snapshot() == ([], [])
+    assert connection_factory() is sqlite3.Connection
+
+
+def test_spans_are_timed(enabled_profiler):
+    with enabled_profiler.span("refresh"):
+        time.sleep(0.02)
+    with enabled_profiler.span("refresh"):
+        pass
+
+    spans, _ = enabled_profiler.snapshot()
+    name, count, total_ms, max_ms, last_ms = spans[0]
+    assert (name, count) == ("refresh", 2)
+    assert max_ms >= 20 > last_ms
+    assert total_ms == pytest.approx(max_ms + last_ms)
+
+
+def test_slow_queries_are_logged_with_their_plan(enabled_profiler, tmp_path):
+    db = sqlite3.connect(str(tmp_path / "jobs.db"), factory=connection_factory())
+    db.execute("CREATE TABLE applications (id INTEGER PRIMARY KEY, company TEXT)")
+    db.execute("INSERT INTO applications (company) VALUES (?)", ("Acme",))
+    assert db.execute("SELECT company FROM applications WHERE id = ?", (1,)).fetchall() == [("Acme",)]
+    db.close()
+
+    _, slow_queries = enabled_profiler.snapshot()
+    elapsed_ms, sql, plan = slow_queries[-1]
+    assert sql == "SELECT company FROM applications WHERE id = ?"
+    assert "applications" in plan
+    for handler in logger.handlers:
+        handler.flush()
+    with open(tmp_path / "jobs_profile.log", encoding="utf-8") as log:
+        text = log.read()
+    assert "Slow query" in text and "SELECT company FROM applications" in text
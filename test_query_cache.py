@@ -0,0 +1,56 @@
+# test_query_cache.py
+from query_cache import QueryCache
+from repository import ApplicationRepository
+
+
+def add_applications(repo, count):
+    for i in range(count):
+        repo.add({"job_name": f"Engineer {i}", "company": "Acme", "date_applied": f"2024-01-{i + 1:02}",
+                  "priority": ["Low", "Medium", "High"][i % 3]})
+
+
+def test_views_and_sort_toggles_are_served_from_memory(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    repo = ApplicationRepository(path)
+    add_applications(repo, 10)
+
+    first = repo.list_applications(limit=4)
+    rest = repo.list_applications(after=repo.get_sort_key()(first[-1]), limit=20)
+    assert repo.list_applications(limit=4) == first
+    assert repo.cache.hits == 1
+
+    # Read to the end, the view is re-sorted for another sort instead of queried
+    by_priority = repo.list_applications(sort="Priority")
+    assert repo.cache.hits == 2
+    repo.cache.clear()
+    assert repo.list_applications(sort="Priority") == by_priority
+    assert [app.id for app in first + rest] == [app.id for app in repo.list_applications()]
+
+    # A local write and a commit by another connection both invalidate it
+    repo.set_status(first[0].id, "Rejected")
+    assert repo.list_applications(status="Rejected")[0].id == first[0].id
+    other = ApplicationRepository(path)
+    other.set_status(first[0].id, "Applied")
+    other.close()
+    assert repo.list_applications(status="Rejected") == []
+    repo.close()
+
+
+def test_least_recently_used_views_are_evicted_over_the_cap(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    add_applications(repo, 10)
+    rows = repo.list_applications()
+    sort_key = repo.get_sort_key()
+
+    cache = QueryCache(max_bytes=1)
+    cache.put(("", None, None), "Date Applied", sort_key, None, 200, rows)
+    assert cache.views == {}
+
+    cache = QueryCache()
+    for search in ["a", "b", "c"]:
+        cache.put((search, None, None), "Date Applied", sort_key, None, 200, rows)
+    cache.get(("a", None, None), "Date Applied", sort_key, None, 200)
+    cache.max_bytes = cache.size - 1
+    cache.put(("d", None, None), "Date Applied", sort_key, None, 200, rows)
+    assert [key[0] for key in cache.views] == ["a", "d"]
+    repo.close()
@@ -0,0 +1,82 @@
+# test_reminders.py
+from reminders import Reminder, ReminderScheduler, julian_now
+from repository import ApplicationRepository
+from test_schema import query_plan
+
+
+class FakeRoot:
+    """Stands in for Tk's after() scheduling; jobs are run by hand"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_job = 0
+
+    def after(self, delay, fn):
+        self.next_job += 1
+        self.jobs[self.next_job] = (delay, fn)
+        return self.next_job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+
+def test_reminders_follow_status_changes(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    stale = repo.add({"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01",
+                      "status": "Applied"})
+    interview = repo.add({"job_name": "Analyst", "company": "Initech", "date_applied": "2024-01-01",
+                          "status": "Interview Scheduled", "interview_date": "2024-02-10"})
+
+    reminders = {reminder.app_id: reminder for reminder in repo.load_reminders()}
+    assert reminders[stale].rule == "follow-up"
+    assert reminders[stale].due == repo.db.execute("SELECT julianday('2024-01-15')").fetchone()[0]
+    assert reminders[interview].due == repo.db.execute("SELECT julianday('2024-02-09 09:00')").fetchone()[0]
+
+    # A status change restarts the clock, and dismissed reminders stay dismissed
+    repo.set_status(stale, "Interviewed")
+    assert [reminder.rule for reminder in repo.load_reminders(stale)] == ["thank-you"]
+    repo.dismiss_reminders(repo.load_reminders(interview))
+    assert repo.load_reminders(interview) == []
+
+    plan = query_plan(repo.db, "SELECT id FROM applications WHERE status = ? AND status_since + 14 <= ?",
+                      ("Applied", 2460000))
+    assert "idx_applications_status_since" in plan, plan
+
+
+def test_reminder_scheduler_wakes_for_the_next_valid_reminder():
+    root = FakeRoot()
+    delivered = []
+    scheduler = ReminderScheduler(root, delivered.extend)
+    now = julian_now()
+    past = Reminder(now - 1, 1, "follow-up", "Engineer", "Acme", now - 15)
+    future = Reminder(now + 1, 2, "pending", "Analyst", "Initech", now - 6)
+    scheduler.load([future, past])
+    (job, (delay, fire)), = root.jobs.items()
+    assert delay == 0
+
+    # Replacing a reminder leaves its old heap entry behind, but it never fires
+    scheduler.replace(1, [])
+    (job, (delay, fire)), = root.jobs.items()
+    assert delay > 0
+    del root.jobs[job]
+    fire()
+    assert delivered == []
+    scheduler.replace(2, [future._replace(due=now - 0.5)])
+    (job, (delay, fire)), = root.jobs.items()
+    del root.jobs[job]
+    fire()
+    assert [reminder.app_id for reminder in delivered] == [2]
+
+
+def test_removed_applications_lose_their_reminders():
+    root = FakeRoot()
+    scheduler = ReminderScheduler(root, lambda reminders: None)
+    now = julian_now()
+    scheduler.load([Reminder(now + 1, 1, "follow-up", "Engineer", "Acme", now - 13),
+                    Reminder(now + 2, 2, "pending", "Analyst", "Initech", now - 5)])
+    assert scheduler.armed_for == now + 1
+
+    scheduler.remove(1)
+    assert scheduler.armed_for == now + 2 and len(root.jobs) == 1
+    scheduler.remove(2)
+    assert scheduler.armed_for is None and root.jobs == {}
@@ -0,0 +1,54 @@
+# test_repository.py
+import pytest
+
+from repository import ApplicationRepository, ConflictError, ValidationError, clean_fields
+
+
+def test_clean_fields_accepts_numbers_and_rejects_other_types():
+    fields = clean_fields({"job_name": " Engineer ", "company": "Acme", "date_applied": "2024-01-01",
+                           "salary": 90000})
+    assert (fields["job_name"], fields["salary"], fields["salary_max"]) == ("Engineer", "90000", 90000)
+    assert (fields["status"], fields["priority"], fields["interview_date"]) == ("Pending", "Medium", None)
+
+    with pytest.raises(ValidationError, match="YYYY-MM-DD"):
+        clean_fields({"job_name": "Engineer", "company": "Acme", "date_applied": 20240101})
+    for value in [["Engineer"], {"title": "Engineer"}, True]:
+        with pytest.raises(ValidationError, match="Job name must be text"):
+            clean_fields({"job_name": value, "company": "Acme", "date_applied": "2024-01-01"})
+
+
+def test_add_validates_before_writing(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    with pytest.raises(ValidationError):
+        repo.add({"job_name": 1.5, "company": ["Acme"], "date_applied": "2024-01-01"})
+    app_id = repo.add({"job_name": 1, "company": "Acme", "date_applied": "today", "salary": 90000})
+    assert repo.get(app_id).job_name == "1"
+    assert repo.stats()["Total"] == 1
+    repo.close()
+
+
+def test_applications_round_trip_without_tk(tmp_path):
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    fields = {"job_name": "Engineer", "company": "Acme", "date_applied": "2024-01-01",
+              "url": "https://acme.example/jobs/1", "status": "Applied", "priority": "High"}
+    first = repo.add(fields)
+    second = repo.add(dict(fields, job_name="Analyst", date_applied="2024-02-01", url=""))
+
+    app = repo.get(first)
+    assert (app.job_name, app.company, app.status, app.priority, app.version) == (
+        "Engineer", "Acme", "Applied", "High", 0)
+    assert [row.id for row in repo.list_applications()] == [second, first]
+
+    repo.update(first, dict(fields, company="Acme Corp"), expected_version=app.version)
+    with pytest.raises(ConflictError):
+        repo.update(first, dict(fields, company="Stale"), expected_version=app.version)
+    assert repo.get(first).company == "Acme Corp"
+
+    repo.set_status(second, "Rejected")
+    assert [row.id for row in repo.list_applications(status="Rejected")] == [second]
+    assert (repo.stats()["Applied"], repo.stats()["Rejected"]) == (1, 1)
+
+    repo.delete(second)
+    assert repo.get(second) is None
+    assert repo.stats()["Total"] == 1
+    repo.close()
@@ -0,0 +1,20 @@
+# test_salary.py
+import pytest
+
+from salary import parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$80,000 - $100,000", (80000, 100000, "USD")),
+    ("80-100k", (80000, 100000, None)),
+    ("€55.000", (55000, 55000, "EUR")),
+    ("£40k a year", (40000, 40000, "GBP")),
+    ("CAD 90,000-110,000", (90000, 110000, "CAD")),
+    ("$45/hr", (93600, 93600, "USD")),
+    ("$7,500/month", (90000, 90000, "USD")),
+    ("1.2M", (1200000, 1200000, None)),
+    ("competitive", (None, None, None)),
+    ("", (None, None, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
@@ -0,0 +1,175 @@
+# test_schema.py
+import sqlite3
+
+from schema import MIGRATIONS, ORDER_BY, SCHEMA_VERSION, get_version, migrate
+
+
+def make_db(path, rows=500):
+    """Create a migrated database with some applications"""
+    db = sqlite3.connect(path)
+    migrate(db)
+    priorities = ["High", "Medium", "Low", None]
+    statuses = ["Applied", "Pending", "Rejected", "Interviewed"]
+    db.executemany('''
+        INSERT INTO applications (job_name, company, date_applied, status, priority)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(f"Job {i}", f"Company {i % 40}", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+           statuses[i % 4], priorities[i % 4]) for i in range(rows)])
+    db.commit()
+    return db
+
+
+def query_plan(db, sql, params=()):
+    """Return the EXPLAIN QUERY PLAN details of a query as one string"""
+    return " | ".join(row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def test_migrate_sets_user_version(tmp_path):
+    db = make_db(tmp_path / "jobs.db", rows=0)
+    assert get_version(db) == SCHEMA_VERSION
+    # Running again is a no-op
+    assert migrate(db) == SCHEMA_VERSION
+
+
+def test_migrate_upgrades_legacy_database(tmp_path):
+    db = sqlite3.connect(tmp_path / "legacy.db")
+    db.execute('''
+        CREATE TABLE applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_name TEXT NOT NULL,
+            url TEXT,
+            company TEXT NOT NULL,
+            date_applied TEXT NOT NULL,
+            salary TEXT,
+            status TEXT NOT NULL,
+            recruiter_dm TEXT,
+            team_member_dm TEXT,
+            hiring_manager_dm TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    db.execute("INSERT INTO applications (job_name, company, date_applied, status) "
+               "VALUES ('Engineer', 'Acme', '2024-01-01', 'Applied')")
+    db.commit()
+
+    migrate(db)
+    assert get_version(db) == SCHEMA_VERSION
+    assert db.execute("SELECT priority, priority_rank FROM applications").fetchone() == ("Medium", 2)
+
+
+def test_priority_rank_follows_priority(tmp_path):
+    db = make_db(tmp_path / "jobs.db", rows=4)
+    ranks = dict(db.execute("SELECT priority, priority_rank FROM applications"))
+    assert ranks == {"High": 3, "Medium": 2, "Low": 1, None: 0}
+
+    db.execute("UPDATE applications SET priority = 'High' WHERE priority = 'Low'")
+    assert db.execute("SELECT COUNT(*) FROM applications WHERE priority_rank = 3").fetchone()[0] == 2
+
+
+def test_sort_orders_walk_an_index(tmp_path):
+    db = make_db(tmp_path / "jobs.db")
+    for order_by in ORDER_BY.values():
+        plan = query_plan(db, f"SELECT id, job_name FROM applications ORDER BY {order_by}")
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_status_filter_and_counts_use_status_index(tmp_path):
+    db = make_db(tmp_path / "jobs.db")
+    plan = query_plan(db, "SELECT COUNT(*) FROM applications WHERE status = ?", ("Applied",))
+    assert "COVERING INDEX idx_applications_status" in plan, plan
+
+    plan = query_plan(db, f"SELECT id FROM applications WHERE status = ? "
+                          f"ORDER BY {ORDER_BY['Date Applied']}", ("Applied",))
+    assert "idx_applications_status" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_company_lookup_uses_index(tmp_path):
+    db = make_db(tmp_path / "jobs.db")
+    plan = query_plan(db, "SELECT id FROM applications WHERE company = ?", ("Company 1",))
+    assert "idx_applications_company" in plan, plan
+
+
+def test_fts_index_follows_writes(tmp_path):
+    db = make_db(tmp_path / "jobs.db", rows=0)
+    db.execute("INSERT INTO applications (job_name, company, date_applied, status, recruiter_dm) "
+               "VALUES ('Data Engineer', 'Acme', '2024-01-01', 'Applied', 'jane@recruit.io')")
+    search = "SELECT rowid FROM applications_fts WHERE applications_fts MATCH ?"
+    assert db.execute(search, ('"recr"*',)).fetchall() == [(1,)]
+
+    db.execute("UPDATE applications SET company = 'Globex' WHERE id = 1")
+    assert db.execute(search, ('"acme"*',)).fetchall() == []
+    assert db.execute(search, ('"glob"*',)).fetchall() == [(1,)]
+
+    db.execute("DELETE FROM applications WHERE id = 1")
+    assert db.execute(search, ('"glob"*',)).fetchall() == []
+
+
+def test_status_counts_follow_writes(tmp_path):
+    db = make_db(tmp_path / "jobs.db", rows=40)
+    group_by = "SELECT status, COUNT(*) FROM applications GROUP BY status"
+    summary = "SELECT status, count FROM status_counts WHERE count > 0"
+    assert dict(db.execute(summary)) == dict(db.execute(group_by))
+
+    db.execute("UPDATE applications SET status = 'Offer Received' WHERE id % 3 = 0")
+    db.execute("UPDATE applications SET job_name = 'Renamed' WHERE id % 2 = 0")
+    db.execute("DELETE FROM applications WHERE id % 5 = 0")
+    assert dict(db.execute(summary)) == dict(db.execute(group_by))
+
+
+def test_bulk_import_keeps_search_and_counts_in_sync(tmp_path):
+    from importer import import_applications
+    from repository import ApplicationRepository
+
+    source = tmp_path / "jobs.csv"
+    source.write_text("Job Name,Company,Date Applied,Status,URL\n"
+                      "Data Engineer,Acme,2024-01-01,Applied,https://acme.io/1\n"
+                      "Analyst,Globex,not a date,Applied,https://globex.io/2\n"
+                      "ML Engineer,Initech,2024-02-01,Interviewed,https://initech.io/3\n")
+    repo = ApplicationRepository(str(tmp_path / "jobs.db"))
+    result = import_applications(repo, str(source))
+    assert (result.inserted, result.updated, result.skipped) == (2, 0, 1)
+    assert result.errors[0][0] == 3
+
+    # Upserting by URL updates in place, and the insert triggers are back
+    source.write_text("Job Name,Company,Date Applied,Status,URL\n"
+                      "Data Engineer,Acme,2024-01-01,Rejected,https://acme.io/1\n")
+    assert import_applications(repo, str(source), upsert=True)[:2] == (0, 1)
+    repo.add({"job_name": "Engineer", "company": "Hooli", "date_applied": "2024-03-01"})
+
+    search = "SELECT COUNT(*) FROM applications_fts WHERE applications_fts MATCH ?"
+    assert repo.db.execute(search, ('"engineer"*',)).fetchone()[0] == 3
+    assert repo.status_counts() == repo.count_statuses() == {"Rejected": 1, "Interviewed": 1, "Pending": 1}
+
+    # Without upsert, rows matching an application are added but counted
+    source.write_text("Job Name,Company,Date Applied,Status,URL\n"
+                      "Data Engineer,Acme,2024-01-01,Rejected,http://www.acme.io/1?utm_source=x\n"
+                      "Data Engineer,Umbrella,2024-01-02,Pending,\n"
+                      "Data Engineer,Umbrella Corp,2024-01-03,Pending,\n")
+    result = import_applications(repo, str(source))
+    assert (result.inserted, result.duplicates) == (3, 2)
+
+
+def test_salary_columns_are_backfilled_and_filtered(tmp_path):
+    from repository import ApplicationRepository
+
+    path = tmp_path / "jobs.db"
+    db = sqlite3.connect(path)
+    for migration in MIGRATIONS[:6]:
+        migration(db)
+    db.execute("PRAGMA user_version = 6")
+    db.executemany("INSERT INTO applications (job_name, company, date_applied, status, salary) "
+                   "VALUES ('Engineer', 'Acme', '2024-01-01', 'Applied', ?)",
+                   [("$80k - $100k",), ("150,000",), ("",)])
+    db.commit()
+    db.close()
+
+    repo = ApplicationRepository(str(path))
+    assert repo.db.execute("SELECT salary_min, salary_max FROM applications ORDER BY id").fetchall() == [
+        (80000, 100000), (150000, 150000), (None, None)]
+    assert [app.id for app in repo.list_applications(sort="Salary")] == [2, 1, 3]
+    assert [app.id for app in repo.list_applications(salary_range=(90000, 120000))] == [1]
+
+    plan = query_plan(repo.db, "SELECT id FROM applications AS a WHERE a.salary_rank >= ?", (90000,))
+    assert "idx_applications_salary" in plan, plan
@@ -0,0 +1,42 @@
+# test_startup.py
+import os
+import subprocess
+import sys
+
+from Jobs_tracker import FIRST_PAINT_TARGET_MS
+from test_schema import make_db
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_python(code):
+    """Run code in a fresh interpreter from the project directory and return its output"""
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True,
+                            text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_startup_does_not_import_optional_modules():
+    loaded = run_python("import sys, Jobs_tracker; "
+                        "print(sorted(name for name in ('csv', 'gzip', 'webbrowser', 'exporter', "
+                        "'importer', 'debug_panel') if name in sys.modules))")
+    assert loaded == "[]"
+
+
+def test_first_paint_within_target(display, tmp_path):
+    path = tmp_path / "jobs.db"
+    make_db(path, rows=20000).close()
+
+    first_paint_ms = float(run_python(f'''
+import time
+from Jobs_tracker import JobTracker
+app = JobTracker({str(path)!r})
+deadline = time.perf_counter() + 30
+while app.first_paint_ms is None and time.perf_counter() < deadline:
+    app.root.update()
+print(app.first_paint_ms)
+app.worker.close()
+app.root.destroy()
+'''))
+    assert first_paint_ms < FIRST_PAINT_TARGET_MS
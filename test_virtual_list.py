@@ -0,0 +1,93 @@
+# test_virtual_list.py
+import customtkinter as tk
+import pytest
+
+from queries import get_sort_key
+from repository import ApplicationSummary
+from virtual_list import ROW_HEIGHT, VirtualApplicationList
+
+VIEWPORT_HEIGHT = 400
+
+
+def make_rows(count):
+    """Return list rows sorted like the Date Applied view, newest first"""
+    rows = [ApplicationSummary(i, f"Engineer {i}", "Acme", f"2024-{i % 12 + 1:02}-{i % 28 + 1:02}",
+                               "Applied", None, "Medium") for i in range(1, count + 1)]
+    return sorted(rows, key=get_sort_key("Date Applied"), reverse=True)
+
+
+@pytest.fixture
+def app_list(display):
+    root = tk.CTk()
+    root.geometry(f"700x{VIEWPORT_HEIGHT}")
+    events = []
+    app_list = VirtualApplicationList(root, on_open=events.append, on_edit=events.append,
+                                      on_attachments=events.append,
+                                      on_selection_change=lambda: events.append("selection"),
+                                      on_need_more=lambda: events.append("more"))
+    app_list.pack(fill=tk.BOTH, expand=True)
+    app_list.events = events
+    root.update()
+    yield app_list
+    root.destroy()
+
+
+def shown(app_list):
+    """Return the ids in the visible cards, top to bottom"""
+    return [card.app_data[0] for card in app_list.cards if card.visible]
+
+
+def test_card_pool_covers_the_viewport_whatever_the_row_count(app_list):
+    rows = make_rows(5010)
+    app_list.set_rows(rows[:5000], get_sort_key("Date Applied"), has_more=True)
+    app_list.container.update()
+
+    assert 0 < len(app_list.cards) <= VIEWPORT_HEIGHT // ROW_HEIGHT + 2
+    assert shown(app_list) == [row.id for row in rows[:len(shown(app_list))]]
+
+    # Scrolling refills the same cards with another slice of the buffer
+    cards = list(app_list.cards)
+    app_list.on_scrollbar("moveto", 0.5)
+    assert app_list.cards == cards
+    assert shown(app_list)[0] == rows[2500].id
+    assert "more" not in app_list.events
+
+    # Nearing the end of the loaded rows asks for the next page, once
+    app_list.scroll_to(5000)
+    app_list.scroll_to(4999)
+    assert app_list.events == ["more"]
+    app_list.append_rows(rows[5000:], has_more=False)
+    assert app_list.rows == rows
+
+
+def test_single_rows_are_patched_in_place(app_list):
+    rows = make_rows(20)
+    app_list.set_rows(rows, get_sort_key("Date Applied"), has_more=True)
+    app_list.container.update()
+    app_list.scroll_to(8)
+    visible = shown(app_list)
+    cards = list(app_list.cards)
+
+    # An edit moving a row above the visible ones keeps the view where it is
+    moved = rows[-1]._replace(date_applied="2025-01-01")
+    app_list.upsert_row(moved)
+    assert app_list.rows[0] == moved and app_list.rows[-1] == rows[-2]
+    assert shown(app_list) == visible
+
+    # A new row is inserted at its sorted position, a status change patched in place
+    added = ApplicationSummary(21, "Analyst", "Initech", rows[5].date_applied, "Pending", None, "High")
+    app_list.upsert_row(added)
+    assert app_list.index_of(21) == 6 and app_list.rows[6] == added
+    app_list.upsert_row(added._replace(status="Rejected"))
+    assert app_list.rows[6].status == "Rejected" and len(app_list.rows) == 21
+    assert shown(app_list) == visible and app_list.cards == cards
+
+    # Rows sorting after the loaded pages wait for their page
+    app_list.upsert_row(rows[0]._replace(date_applied="2000-01-01"))
+    assert app_list.index_of(rows[0].id) is None and len(app_list.rows) == 20
+
+    # Deleting a selected row drops it from the selection
+    app_list.click(rows[10].id, "replace")
+    app_list.remove_row(rows[10].id)
+    assert app_list.index_of(rows[10].id) is None and not app_list.selected
+    assert app_list.events.count("selection") == 2
@@ -0,0 +1,395 @@
+import sys
+import customtkinter as tk
+
+from profiling import profiler
+from reminders import days_since
+
+# Height in pixels reserved for one card, including its vertical padding
+ROW_HEIGHT = 70
+CARD_PADDING = 5
+
+# Border marking the cards of selected applications
+SELECTED_BORDER_COLOR = "#1f6aa5"
+SELECTED_BORDER_WIDTH = 2
+
+# Card background colors by status (None keeps the theme color)
+STATUS_COLORS = {
+    "Applied": "#d4edda",   # Light green
+    "Rejected": "#f8d7da",  # Light red
+    "Pending": "#fff3cd",   # Light yellow
+}
+
+
+class ApplicationCard:
+    """A card widget that is created once and refilled with any application row"""
+
+    def __init__(self, master, on_open, on_edit, on_attachments, on_click):
+        self.app_data = None
+        self.selected = False
+        self.visible = False
+        self.bg_color = None
+
+        # Card frame with a fixed height so the list can be laid out by row index
+        self.frame = tk.CTkFrame(master, height=ROW_HEIGHT - 2 * CARD_PADDING)
+        self.frame.pack_propagate(False)
+        self.default_color = self.frame.cget("fg_color")
+
+        # Left side - main info
+        self.info_frame = tk.CTkFrame(self.frame)
+        self.info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.info_default_color = self.info_frame.cget("fg_color")
+
+        # Job title and company
+        self.title_label = tk.CTkLabel(self.info_frame, text="", font=("Arial", 14, "bold"))
+        self.title_label.pack(anchor="w")
+
+        # Date, status and priority
+        self.details_label = tk.CTkLabel(self.info_frame, text="", font=("Arial", 10))
+        self.details_label.pack(anchor="w")
+
+        # Right side - actions
+        self.actions_frame = tk.CTkFrame(self.frame)
+        self.actions_frame.pack(side=tk.RIGHT, padx=5, pady=5)
+        self.actions_default_color = self.actions_frame.cget("fg_color")
+
+        # Commands read the current row, so they never need to be rebound
+        # Attached files (e.g. a customized CV) are only read when opened
+        self.cv_btn = tk.CTkButton(self.actions_frame, text="CV", width=50,
+                                   command=lambda: on_attachments(self.app_data[0]))
+        self.cv_btn.pack(side=tk.LEFT, padx=2)
+
+        self.open_btn = tk.CTkButton(self.actions_frame, text="Open", width=60,
+                                     command=lambda: on_open(self.app_data[5]))
+        self.open_btn.pack(side=tk.LEFT, padx=2)
+
+        self.edit_btn = tk.CTkButton(self.actions_frame, text="Edit", width=60,
+                                     command=lambda: on_edit(self.app_data[0]))
+        self.edit_btn.pack(side=tk.LEFT, padx=2)
+
+        self.select_btn = tk.CTkButton(self.actions_frame, text="Select", width=60,
+                                       command=lambda: on_click(self.app_data[0], "replace"))
+        self.select_btn.pack(side=tk.LEFT, padx=2)
+
+        # Clicking the card selects it too; Ctrl adds or removes it, Shift selects a range
+        for widget in (self.frame, self.info_frame, self.title_label, self.details_label):
+            widget.bind("<Button-1>", lambda event: on_click(self.app_data[0], "replace"))
+            widget.bind("<Control-Button-1>", lambda event: on_click(self.app_data[0], "toggle"))
+            widget.bind("<Shift-Button-1>", lambda event: on_click(self.app_data[0], "range"))
+
+    def show(self, app_data, selected=False):
+        """Fill the card with an application row, touching only what changed"""
+        if selected != self.selected:
+            self.selected = selected
+            self.frame.configure(border_width=SELECTED_BORDER_WIDTH if selected else 0,
+                                 border_color=SELECTED_BORDER_COLOR)
+        if app_data == self.app_data:
+            return
+        app_id, job_name, company, date_applied, status, url, priority = app_data[:7]
+        previous = self.app_data
+        self.app_data = app_data
+
+        bg_color = STATUS_COLORS.get(status)
+        if previous is None or bg_color != self.bg_color:
+            self.bg_color = bg_color
+            self.frame.configure(fg_color=bg_color or self.default_color)
+            self.info_frame.configure(fg_color=bg_color or self.info_default_color)
+            self.actions_frame.configure(fg_color=bg_color or self.actions_default_color)
+
+        self.title_label.configure(text=f"{job_name} at {company}")
+        details = f"Applied: {date_applied}"
+        days = days_since(date_applied)
+        if days is not None and days >= 0:
+            details += f" ({days} days ago)"
+        details += f" | Status: {status} | Priority: {priority}"
+        # While searching, show the highlighted snippet of the best matching field
+        if len(app_data) > 7 and app_data[7]:
+            details += f" | Match: {app_data[7]}"
+        self.details_label.configure(text=details)
+
+        # Only show the Open button for applications with a URL
+        if url and (previous is None or not previous[5]):
+            self.open_btn.pack(side=tk.LEFT, padx=2, before=self.edit_btn)
+        elif not url:
+            self.open_btn.pack_forget()
+
+    def pack(self):
+        """Show the card at the end of the list"""
+        if not self.visible:
+            self.frame.pack(fill=tk.X, pady=CARD_PADDING)
+            self.visible = True
+
+    def hide(self):
+        """Remove the card from the list without destroying it"""
+        if self.visible:
+            self.frame.pack_forget()
+            self.visible = False
+
+
+class VirtualApplicationList:
+    """Scrollable list that renders a fixed pool of cards sized to the viewport
+
+    Rows are kept in a plain list buffer; scrolling only changes which slice
+    of the buffer is copied into the pooled cards, so the number of widgets
+    depends on the window height and not on the number of applications.
+    Single rows can be patched, inserted or removed by id, which only
+    refills the cards whose contents actually changed.
+
+    The buffer may hold only the first pages of a longer result; when the
+    view gets close to its end, `on_need_more` is called to fetch the next
+    page, which is added with append_rows().
+
+    Selected applications are a set of ids, which may include rows not
+    loaded yet (see select_ids()); `on_selection_change` is called whenever
+    it changes.
+    """
+
+    def __init__(self, master, on_open, on_edit, on_attachments, on_selection_change, on_need_more=None):
+        self.on_open = on_open
+        self.on_edit = on_edit
+        self.on_attachments = on_attachments
+        self.on_selection_change = on_selection_change
+        self.on_need_more = on_need_more
+        self.has_more = False
+        self.loading = False
+
+        # Keyed row model: rows sorted by descending sort key, plus an id index
+        self.rows = []
+        self.by_id = {}
+        self.sort_key = lambda row: row[0]
+        self.first = 0
+        self.cards = []
+        self.selected = set()
+        # Row a Shift-click range starts from: the last one clicked
+        self.anchor = None
+        self.viewport_height = 0
+
+        # Container with the card viewport and an explicit scrollbar
+        self.container = tk.CTkFrame(master)
+        self.scrollbar = tk.CTkScrollbar(self.container, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.viewport = tk.CTkFrame(self.container, fg_color="transparent")
+        self.viewport.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.viewport.bind("<Configure>", self.on_resize)
+
+        # Empty state label
+        self.empty_label = tk.CTkLabel(self.viewport,
+                                       text="No applications yet. Add your first application!",
+                                       font=("Arial", 14))
+        self.empty_label.pack(pady=50)
+
+        # Mouse wheel events are routed to the list while the pointer is over it
+        root = self.container.winfo_toplevel()
+        if sys.platform.startswith("linux"):
+            root.bind_all("<Button-4>", self.on_mouse_wheel, add="+")
+            root.bind_all("<Button-5>", self.on_mouse_wheel, add="+")
+        else:
+            root.bind_all("<MouseWheel>", self.on_mouse_wheel, add="+")
+
+    def pack(self, **kwargs):
+        """Pack the list container into its master"""
+        self.container.pack(**kwargs)
+
+    @property
+    def page_size(self):
+        """Number of rows that fit completely in the viewport"""
+        return max(1, self.viewport_height // ROW_HEIGHT)
+
+    def set_rows(self, rows, sort_key, has_more=False, keep_position=False):
+        """Replace the row buffer and redraw the visible cards
+
+        `sort_key` maps a row to the key the rows are sorted by, in
+        descending order; it is used to place rows patched in later.
+        `has_more` tells whether further pages exist after these rows.
+        Without `keep_position`, this is a new view and the selection is
+        cleared, so that actions never apply to rows out of sight.
+        """
+        self.rows = list(rows)
+        self.by_id = {row[0]: row for row in self.rows}
+        self.sort_key = sort_key
+        self.has_more = has_more
+        self.loading = False
+        cleared = not keep_position and self.selected
+        if not keep_position:
+            self.first = 0
+            self.selected = set()
+            self.anchor = None
+        self.render()
+        if cleared:
+            self.on_selection_change()
+
+    def append_rows(self, rows, has_more):
+        """Add the next page of rows to the end of the buffer"""
+        for row in rows:
+            if row[0] not in self.by_id:
+                self.rows.append(row)
+                self.by_id[row[0]] = row
+        self.has_more = has_more
+        self.loading = False
+        self.render()
+
+    def bisect(self, key):
+        """Return the index where a row with `key` belongs in the buffer"""
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self.sort_key(self.rows[middle]) > key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def index_of(self, app_id):
+        """Return the buffer index of an application, or None if not listed"""
+        row = self.by_id.get(app_id)
+        if row is None:
+            return None
+        return self.bisect(self.sort_key(row))
+
+    def upsert_row(self, row):
+        """Patch a listed row in place or insert a new one at its sorted position"""
+        index = self.index_of(row[0])
+        if index is not None:
+            del self.rows[index]
+            if index < self.first:
+                self.first -= 1
+        index = self.bisect(self.sort_key(row))
+        # Rows sorting after the loaded pages arrive with a later page
+        if self.has_more and index == len(self.rows):
+            self.by_id.pop(row[0], None)
+            self.render()
+            return
+        self.rows.insert(index, row)
+        self.by_id[row[0]] = row
+        # Keep the visible rows in place when something is inserted above them
+        if index < self.first:
+            self.first += 1
+        self.render()
+
+    def remove_row(self, app_id):
+        """Remove an application from the list, if it is listed"""
+        index = self.index_of(app_id)
+        if index is None:
+            return
+        del self.rows[index]
+        del self.by_id[app_id]
+        if index < self.first:
+            self.first -= 1
+        if app_id in self.selected:
+            self.selected.discard(app_id)
+            self.on_selection_change()
+        self.render()
+
+    def click(self, app_id, mode):
+        """Change the selection after a click on a card
+
+        `mode` is "replace" to select only that row, "toggle" to add or
+        remove it, or "range" to select the rows from the anchor to it.
+        """
+        anchor = self.index_of(self.anchor) if self.anchor is not None else None
+        if mode == "range" and anchor is not None:
+            index = self.index_of(app_id)
+            low, high = sorted((anchor, index))
+            self.selected = {row[0] for row in self.rows[low:high + 1]}
+        elif mode == "toggle":
+            self.selected ^= {app_id}
+            self.anchor = app_id
+        else:
+            self.selected = {app_id}
+            self.anchor = app_id
+        self.render()
+        self.on_selection_change()
+
+    def select_ids(self, app_ids):
+        """Select exactly these applications, listed or not"""
+        self.selected = set(app_ids)
+        self.anchor = None
+        self.render()
+        self.on_selection_change()
+
+    def reveal(self, app_id):
+        """Scroll the list so that an application is visible"""
+        index = self.index_of(app_id)
+        if index is not None and not self.first <= index < self.first + self.page_size:
+            self.scroll_to(index - self.page_size // 2)
+
+    def scroll_to(self, first):
+        """Make the row at index `first` the top visible row"""
+        max_first = max(0, len(self.rows) - self.page_size)
+        first = max(0, min(int(first), max_first))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def render(self):
+        """Copy the visible slice of the row buffer into the card pool"""
+        with profiler.span("ui render"):
+            self.render_rows()
+
+    def render_rows(self):
+        """Fill the cards from the rows starting at `first`"""
+        max_first = max(0, len(self.rows) - self.page_size)
+        self.first = max(0, min(self.first, max_first))
+
+        if not self.rows:
+            for card in self.cards:
+                card.hide()
+            self.empty_label.pack(pady=50)
+            self.scrollbar.set(0, 1)
+            self.request_more()
+            return
+        self.empty_label.pack_forget()
+
+        visible_rows = self.rows[self.first:self.first + len(self.cards)]
+        for card, row in zip(self.cards, visible_rows):
+            card.show(row, row[0] in self.selected)
+            card.pack()
+        for card in self.cards[len(visible_rows):]:
+            card.hide()
+
+        total = len(self.rows)
+        self.scrollbar.set(self.first / total, min(1, (self.first + self.page_size) / total))
+
+        # Prefetch the next page while more than a screenful is still buffered
+        if self.first + 2 * len(self.cards) >= total:
+            self.request_more()
+
+    def request_more(self):
+        """Ask for the next page, unless everything is loaded or a page is pending"""
+        if self.has_more and not self.loading and self.on_need_more is not None:
+            self.loading = True
+            self.on_need_more()
+
+    def on_resize(self, event):
+        """Grow the card pool so that it always covers the viewport"""
+        self.viewport_height = event.height
+        needed = self.page_size + 1
+        with profiler.span("ui create cards"):
+            while len(self.cards) < needed:
+                self.cards.append(ApplicationCard(self.viewport, self.on_open, self.on_edit,
+                                                  self.on_attachments, self.click))
+        self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        """Translate scrollbar commands into a new first visible row"""
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self.rows)))
+        elif action == "scroll":
+            step = self.page_size if unit == "pages" else 1
+            self.scroll_to(self.first + int(value) * step)
+
+    def on_mouse_wheel(self, event):
+        """Scroll by whole rows when the wheel is used over the list"""
+        widget = self.viewport.winfo_containing(event.x_root, event.y_root)
+        viewport_path = str(self.viewport)
+        if widget is None or not (str(widget) == viewport_path or
+                                  str(widget).startswith(viewport_path + ".")):
+            return
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        elif sys.platform == "darwin":
+            delta = -event.delta
+        else:
+            delta = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self.scroll_to(self.first + delta)